@@ -24,7 +24,20 @@ export class DocumentoTableComponent {
     this.deleteDocumento.emit(documento);
   }
 
+  onFilter(search: string, status: string) {
+    // A busca por nome exige ao menos 3 caracteres (índice trigram no servidor)
+    const termo = search.trim();
+    this.documentoStore.setFiltros({
+      search: termo.length >= 3 ? termo : undefined,
+      status: status || undefined,
+    });
+  }
+
   onRefresh() {
     this.documentoStore.reloadDocumentos();
   }
+
+  onLoadMore() {
+    this.documentoStore.loadMore();
+  }
 }
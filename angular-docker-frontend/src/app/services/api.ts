@@ -1,6 +1,7 @@
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpErrorResponse, HttpHeaders, HttpParams } from '@angular/common/http';
 import { inject, Injectable } from '@angular/core';
-import { Documento } from '../types/documento';
+import { retry, throwError, timer } from 'rxjs';
+import { Documento, DocumentoFiltros, Pagina } from '../types/documento';
 
 @Injectable({
   providedIn: 'root',
@@ -10,16 +11,36 @@ export class Api {
   baseUrl = (window as any)?.env?.API_URL || 'http://localhost:8001/api';
   http = inject(HttpClient);
 
-  getDocumentos() {
-    return this.http.get<Documento[]>(this.baseUrl + '/documento');
+  getDocumentos(filtros: DocumentoFiltros = {}) {
+    // Filtros aplicados no servidor; valores vazios não são enviados
+    let params = new HttpParams();
+    for (const [chave, valor] of Object.entries(filtros)) {
+      if (valor !== undefined && valor !== null && valor !== '') {
+        params = params.set(chave, String(valor));
+      }
+    }
+    return this.http.get<Pagina<Documento>>(this.baseUrl + '/documento', { params });
   }
 
-  createDocumento(documento: Documento) {
-    console.log(documento);
-    return this.http.post<Documento>(
-      this.baseUrl + '/documento/create',
-      documento
-    );
+  getPagina(url: string) {
+    // Próxima página da listagem: `next` já traz o cursor e os filtros
+    return this.http.get<Pagina<Documento>>(url);
+  }
+
+  createDocumento(documento: Documento, idempotencyKey: string = crypto.randomUUID()) {
+    // A mesma Idempotency-Key em todas as tentativas: uma repetição recebe a resposta
+    // gravada no servidor em vez de criar outro documento no ZapSign
+    const headers = new HttpHeaders({ 'Idempotency-Key': idempotencyKey });
+    return this.http
+      .post<Documento>(this.baseUrl + '/documento/create', documento, { headers })
+      .pipe(
+        retry({
+          count: 2,
+          // Repete apenas falhas de rede (status 0) e chave ainda em processamento (409)
+          delay: (error: HttpErrorResponse) =>
+            error.status === 0 || error.status === 409 ? timer(1000) : throwError(() => error),
+        })
+      );
   }
 
   updateDocumento(documento: Documento) {
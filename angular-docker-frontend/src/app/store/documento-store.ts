@@ -1,5 +1,5 @@
 import { inject, signal, Injectable } from '@angular/core';
-import { Documento } from '../types/documento';
+import { Documento, DocumentoFiltros } from '../types/documento';
 import { Api } from '../services/api';
 import { ToastrService } from 'ngx-toastr';
 
@@ -9,6 +9,10 @@ import { ToastrService } from 'ngx-toastr';
 export class DocumentoStore {
   documentos = signal<Documento[]>([]);
   loading = signal<boolean>(false);
+  // URL da próxima página da listagem (paginação por cursor no servidor)
+  proximaPagina = signal<string | null>(null);
+  loadingMore = signal<boolean>(false);
+  filtros = signal<DocumentoFiltros>({});
   toaster = inject(ToastrService);
   api = inject(Api);
 
@@ -18,9 +22,10 @@ export class DocumentoStore {
 
   loadDocumentos() {
     this.loading.set(true);
-    this.api.getDocumentos().subscribe({
-      next: (documentos) => {
-        this.documentos.set(documentos);
+    this.api.getDocumentos(this.filtros()).subscribe({
+      next: (pagina) => {
+        this.documentos.set(pagina.results);
+        this.proximaPagina.set(pagina.next);
         this.loading.set(false);
       },
       error: (error) => {
@@ -31,6 +36,33 @@ export class DocumentoStore {
     });
   }
 
+  // Acrescenta a próxima página à listagem atual
+  loadMore() {
+    const url = this.proximaPagina();
+    if (!url || this.loadingMore()) {
+      return;
+    }
+    this.loadingMore.set(true);
+    this.api.getPagina(url).subscribe({
+      next: (pagina) => {
+        this.documentos.update((documentos) => [...documentos, ...pagina.results]);
+        this.proximaPagina.set(pagina.next);
+        this.loadingMore.set(false);
+      },
+      error: (error) => {
+        console.error('Erro ao carregar mais documentos:', error);
+        this.toaster.error('Erro ao carregar mais documentos.');
+        this.loadingMore.set(false);
+      }
+    });
+  }
+
+  // Aplica novos filtros (no servidor) e recarrega a listagem
+  setFiltros(filtros: DocumentoFiltros) {
+    this.filtros.set(filtros);
+    this.loadDocumentos();
+  }
+
   // Método público para recarregar dados
   reloadDocumentos() {
     this.loadDocumentos();
@@ -17,3 +17,20 @@ export interface Documento {
   created_at: string;
   signers: Signer[];
 }
+
+export interface DocumentoFiltros {
+  status?: string;
+  company?: number;
+  created_after?: string;
+  created_before?: string;
+  updated_after?: string;
+  updated_before?: string;
+  signer_email?: string;
+  search?: string;
+}
+
+export interface Pagina<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
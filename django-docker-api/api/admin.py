@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Empresa, Documento, Signatario
+from .models import Empresa, Documento, DocumentoOutbox, Signatario
 
 admin.site.register(Empresa)
 admin.site.register(Documento)
 admin.site.register(Signatario)
+admin.site.register(DocumentoOutbox)
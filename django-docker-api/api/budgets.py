@@ -0,0 +1,132 @@
+"""
+Orçamentos de consultas SQL e de tempo por endpoint, usados nos testes
+
+Os limites ficam em api/budgets.json, por nome de rota, junto com a escala de
+dados semeada em que valem. query_budget funciona como context manager ou como
+decorador; quando o bloco passa do orçamento, falha com as consultas executadas
+agrupadas pelo ponto do código que as disparou (o N+1 aparece como uma linha
+com dezenas de consultas iguais).
+"""
+import json
+import os
+import time
+import traceback
+from collections import Counter, OrderedDict
+from contextlib import ContextDecorator
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .config import AppConfig
+
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), 'budgets.json')
+
+# Consultas longas (ex.: IN com centenas de parâmetros) são truncadas no relatório
+MAX_REPORTED_SQL_LENGTH = 300
+
+# Quadros ignorados ao procurar o ponto de origem de uma consulta
+_IGNORED_FILES = frozenset({
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metrics.py'),
+})
+
+
+class BudgetExceeded(AssertionError):
+    """Bloco passou do orçamento de consultas ou de tempo"""
+
+
+@lru_cache(maxsize=None)
+def load_budgets(path: str = BUDGETS_FILE) -> dict:
+    with open(path, encoding='utf-8') as budgets_file:
+        return json.load(budgets_file)
+
+
+def budget_seed(path: str = BUDGETS_FILE) -> Dict[str, int]:
+    """Escala de dados (empresas, documentos, signatários) em que os orçamentos valem"""
+    return load_budgets(path)['seed']
+
+
+def endpoint_budget(endpoint: str, path: str = BUDGETS_FILE) -> dict:
+    try:
+        return load_budgets(path)['endpoints'][endpoint]
+    except KeyError:
+        raise KeyError(f"Endpoint sem orçamento em {os.path.basename(path)}: {endpoint}") from None
+
+
+def _call_site() -> str:
+    """Primeiro quadro do projeto (fora do Django e das bibliotecas) na pilha atual"""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if (filename.startswith(base_dir) and filename not in _IGNORED_FILES
+                and 'site-packages' not in filename):
+            return f'{os.path.relpath(filename, base_dir)}:{frame.lineno} em {frame.name}'
+    return 'desconhecido'
+
+
+class query_budget(ContextDecorator):
+    """
+    Falha (BudgetExceeded) se o bloco executar mais consultas ou levar mais tempo
+    que o orçamento do endpoint em budgets.json, ou que queries/max_ms explícitos.
+
+    O limite de tempo é multiplicado por BUDGET_TIME_FACTOR (máquinas de CI lentas).
+    """
+
+    def __init__(self, endpoint: Optional[str] = None, *, queries: Optional[int] = None,
+                 max_ms: Optional[float] = None, using: str = DEFAULT_DB_ALIAS):
+        budget = endpoint_budget(endpoint) if endpoint else {}
+        self.endpoint = endpoint
+        self.queries = queries if queries is not None else budget.get('queries')
+        max_ms = max_ms if max_ms is not None else budget.get('max_ms')
+        self.max_ms = max_ms * AppConfig.BUDGET_TIME_FACTOR if max_ms is not None else None
+        self.using = using
+        self.executed: List[Tuple[str, str]] = []
+        self.elapsed_ms = 0.0
+
+    def _capture(self, execute, sql, params, many, context):
+        self.executed.append((_call_site(), sql))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.executed = []
+        self._wrapper = connections[self.using].execute_wrapper(self._capture)
+        self._wrapper.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self._wrapper.__exit__(exc_type, exc_value, tb)
+        if exc_type is not None:
+            return False
+
+        over_queries = self.queries is not None and len(self.executed) > self.queries
+        over_time = self.max_ms is not None and self.elapsed_ms > self.max_ms
+        if over_queries or over_time:
+            raise BudgetExceeded(self.report())
+        return False
+
+    def grouped_queries(self) -> 'OrderedDict[str, Counter]':
+        """Consultas executadas por ponto de origem, na ordem da primeira execução"""
+        groups: 'OrderedDict[str, Counter]' = OrderedDict()
+        for site, sql in self.executed:
+            groups.setdefault(site, Counter())[sql] += 1
+        return groups
+
+    def report(self) -> str:
+        queries_budget = self.queries if self.queries is not None else '-'
+        time_budget = f'{self.max_ms:.0f} ms' if self.max_ms is not None else '-'
+        lines = [
+            f"Orçamento excedido em {self.endpoint or 'bloco'}: "
+            f"{len(self.executed)} consultas (limite {queries_budget}), "
+            f"{self.elapsed_ms:.1f} ms (limite {time_budget})"
+        ]
+        for site, statements in self.grouped_queries().items():
+            lines.append(f'  {site}: {sum(statements.values())} consulta(s)')
+            for sql, count in statements.most_common():
+                if len(sql) > MAX_REPORTED_SQL_LENGTH:
+                    sql = sql[:MAX_REPORTED_SQL_LENGTH] + '...'
+                lines.append(f'    {count}x {sql}')
+        return '\n'.join(lines)
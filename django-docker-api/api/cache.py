@@ -0,0 +1,169 @@
+"""
+Cache read-through da saída serializada das leituras de documentos
+
+Usa o framework de cache do Django (CACHES em core/settings.py), então funciona
+com os backends em memória local ou em arquivo, sem Redis. Cada entrada guarda a
+versão dos dados de origem (a mesma usada no ETag, api/conditional.py) e só é
+servida enquanto essa versão for a atual; as escritas removem as entradas
+afetadas (api/signals.py e chamadas explícitas nos caminhos em lote).
+"""
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .conditional import documento_last_updated, documentos_state
+from .config import AppConfig
+from .streaming import InvalidStreamFormatException, get_stream_format
+
+_DETAIL_KEY = 'documento:{pk}'
+_DETAIL_VARIANT_KEY = 'documento:{pk}:{variant}'
+_LIST_KEY = 'documentos:{generation}:{query}'
+_LIST_GENERATION_KEY = 'documentos:generation'
+
+
+class CacheStats:
+    """Contadores de acertos e faltas do cache, por processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(kind, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {kind: dict(values) for kind, values in self._counters.items()}
+        hits = sum(values['hits'] for values in counters.values())
+        misses = sum(values['misses'] for values in counters.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'by_endpoint': counters,
+        }
+
+
+cache_stats = CacheStats()
+
+
+def _cache():
+    return caches[AppConfig.DOCUMENT_CACHE_ALIAS]
+
+
+def _get_entry(key: str, version, kind: str) -> Optional[Any]:
+    entry = _cache().get(key)
+    hit = entry is not None and entry['version'] == version
+    cache_stats.record(kind, hit)
+    return entry['data'] if hit else None
+
+
+def _documento_version(request, pk):
+    last_updated_at = documento_last_updated(request, pk)
+    return last_updated_at.isoformat() if last_updated_at else None
+
+
+def _detail_key(pk, variant: str) -> str:
+    # Variantes (?fields=) não são removidas na invalidação: deixam de ser
+    # servidas pela verificação de versão e expiram pelo TIMEOUT do cache
+    if variant:
+        return _DETAIL_VARIANT_KEY.format(pk=pk, variant=hashlib.sha256(variant.encode()).hexdigest()[:16])
+    return _DETAIL_KEY.format(pk=pk)
+
+
+def get_documento(request, pk, variant: str = '') -> Optional[Any]:
+    """Retorna o documento serializado em cache, se ainda for a versão atual"""
+    if not AppConfig.DOCUMENT_CACHE_ENABLED:
+        return None
+    version = _documento_version(request, pk)
+    if version is None:
+        return None
+    return _get_entry(_detail_key(pk, variant), version, 'documento')
+
+
+def set_documento(request, pk, data, variant: str = '') -> None:
+    if not AppConfig.DOCUMENT_CACHE_ENABLED:
+        return
+    version = _documento_version(request, pk)
+    if version is not None:
+        _cache().set(_detail_key(pk, variant), {'version': version, 'data': data})
+
+
+def _is_list_cacheable(request) -> bool:
+    # Respostas em streaming não são armazenadas
+    try:
+        return AppConfig.DOCUMENT_CACHE_ENABLED and get_stream_format(request) is None
+    except InvalidStreamFormatException:
+        return False
+
+
+def _list_version(request) -> str:
+    state = documentos_state(request)
+    last_modified = state['last_modified']
+    return f"{last_modified.isoformat() if last_modified else ''}:{state['count']}:{state['id_sum']}"
+
+
+def _list_key(request) -> str:
+    generation = _cache().get(_LIST_GENERATION_KEY, 0)
+    # Os links next/previous da página são absolutos: esquema e host fazem parte da chave
+    query = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()[:32]
+    return _LIST_KEY.format(generation=generation, query=query)
+
+
+def get_documentos(request) -> Optional[Any]:
+    """Retorna a página da listagem em cache, se ainda for a versão atual"""
+    if not _is_list_cacheable(request):
+        return None
+    return _get_entry(_list_key(request), _list_version(request), 'documentos')
+
+
+def set_documentos(request, response) -> None:
+    """Armazena a página da listagem quando a resposta for um 200 paginado"""
+    if (not _is_list_cacheable(request) or not isinstance(response, Response)
+            or response.status_code != 200):
+        return
+    _cache().set(_list_key(request), {'version': _list_version(request), 'data': response.data})
+
+
+def _invalidate(pks) -> None:
+    cache = _cache()
+    if pks:
+        cache.delete_many([_DETAIL_KEY.format(pk=pk) for pk in pks])
+    try:
+        cache.incr(_LIST_GENERATION_KEY)
+    except ValueError:
+        cache.set(_LIST_GENERATION_KEY, 1, timeout=None)
+
+
+def invalidate_documentos(*pks) -> None:
+    """
+    Remove do cache os detalhes dos documentos informados e todas as páginas da
+    listagem. Dentro de uma transação, a remoção ocorre após o commit.
+    """
+    if AppConfig.DOCUMENT_CACHE_ENABLED:
+        transaction.on_commit(lambda: _invalidate(pks))
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Retorna contadores e configuração do cache para dimensionamento"""
+    cache_settings = settings.CACHES[AppConfig.DOCUMENT_CACHE_ALIAS]
+    options = cache_settings.get('OPTIONS', {})
+    return {
+        **cache_stats.snapshot(),
+        'enabled': AppConfig.DOCUMENT_CACHE_ENABLED,
+        'backend': cache_settings['BACKEND'],
+        'timeout': cache_settings.get('TIMEOUT', 300),
+        'max_entries': options.get('MAX_ENTRIES', 300),
+        'cull_frequency': options.get('CULL_FREQUENCY', 3),
+    }
@@ -0,0 +1,190 @@
+"""
+Coalescência (single-flight) de leituras idênticas simultâneas
+
+Quando várias requisições iguais chegam juntas (ex.: um dashboard recarregando),
+apenas a primeira executa consultas e serialização; as demais aguardam e recebem
+uma nova resposta com os mesmos dados, montada a partir de um retrato tirado pela
+primeira. Vale dentro de um processo.
+
+A chave inclui caminho e query, Accept, o cliente (Authorization e cookie de
+sessão, para que clientes diferentes nunca compartilhem respostas) e a versão dos
+dados calculada pelo GET condicional (api/conditional.py): uma requisição que
+chega depois de uma escrita não recebe o resultado de uma execução anterior a ela.
+"""
+import hashlib
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .config import AppConfig
+from .constants import HTTP_METHODS
+from .metrics import COALESCED_REQUESTS
+from .streaming import InvalidStreamFormatException, get_stream_format
+
+
+class _Flight:
+    """Execução em andamento de uma chave"""
+    __slots__ = ('done', 'result', 'shared', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.shared = None
+        self.error = None
+
+
+class SingleFlight:
+    """Executa uma única vez as chamadas simultâneas com a mesma chave (seguro entre threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, kind: str, counter: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                kind, {'executed': 0, 'coalesced': 0, 'errors': 0, 'timeouts': 0}
+            )
+            counters[counter] += 1
+
+    def do(self, kind: str, key: str, fn: Callable[[], Any],
+           wait_timeout: Optional[float] = None,
+           share: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, bool]:
+        """
+        Executa fn ou aguarda a execução em andamento da mesma chave.
+
+        Retorna (resultado, compartilhado). Quem aguardava recebe share(resultado),
+        calculado uma vez pela execução antes de liberá-los (por padrão, o próprio
+        resultado). Exceções da execução são repassadas a quem aguardava; após
+        wait_timeout sem resultado, executa fn por conta própria.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(wait_timeout):
+                self._record(kind, 'coalesced')
+                COALESCED_REQUESTS.inc(kind)
+                if flight.error is not None:
+                    raise flight.error
+                return flight.shared, True
+            self._record(kind, 'timeouts')
+            return fn(), False
+
+        self._record(kind, 'executed')
+        try:
+            flight.result = fn()
+            flight.shared = flight.result if share is None else share(flight.result)
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            self._record(kind, 'errors')
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {kind: dict(values) for kind, values in self._counters.items()}
+            in_flight = len(self._flights)
+        executed = sum(values['executed'] for values in counters.values())
+        coalesced = sum(values['coalesced'] for values in counters.values())
+        return {
+            'executed': executed,
+            'coalesced': coalesced,
+            'coalesced_ratio': round(coalesced / (executed + coalesced), 4) if executed + coalesced else 0.0,
+            'in_flight': in_flight,
+            'by_endpoint': counters,
+        }
+
+
+single_flight = SingleFlight()
+
+
+def _is_coalescible(request) -> bool:
+    # Respostas em streaming são consumidas uma única vez e não podem ser compartilhadas
+    if not AppConfig.COALESCE_READS_ENABLED or request.method != HTTP_METHODS['GET']:
+        return False
+    try:
+        return get_stream_format(request) is None
+    except InvalidStreamFormatException:
+        return False
+
+
+def _flight_key(kind: str, request, version) -> str:
+    parts = (
+        kind,
+        request.build_absolute_uri(),
+        request.META.get('HTTP_ACCEPT', ''),
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ''),
+        version,
+    )
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _snapshot(response) -> tuple:
+    """
+    Retrato imutável da resposta da view (dados, status e headers definidos por ela),
+    tirado pelo líder antes de liberar quem aguardava: em seguida, os decoradores e o
+    finalize_response do líder continuam alterando o objeto original em outra thread.
+    Os dados não são copiados: depois da view, o DRF apenas os lê para renderizar.
+    """
+    if isinstance(response, Response):
+        return Response, response.data, response.status_code, tuple(response.items())
+    return HttpResponse, response.content, response.status_code, tuple(response.items())
+
+
+def _from_snapshot(snapshot: tuple):
+    """Nova resposta para quem aguardava; os decoradores da própria requisição acrescentam os seus headers"""
+    response_class, body, status_code, headers = snapshot
+    response = response_class(body, status=status_code)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def coalesced(kind: str, version: Callable[..., Any]):
+    """
+    Coalesce as requisições GET idênticas simultâneas da view.
+
+    version(request, *args, **kwargs) identifica a versão dos dados (ex.: o ETag
+    de api/conditional.py); aplicar abaixo do decorador condition, que já a calcula.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _is_coalescible(request):
+                return view(request, *args, **kwargs)
+
+            key = _flight_key(kind, request, version(request, *args, **kwargs))
+            response, shared = single_flight.do(
+                kind, key, lambda: view(request, *args, **kwargs), AppConfig.COALESCE_WAIT_TIMEOUT,
+                share=_snapshot,
+            )
+            return _from_snapshot(response) if shared else response
+        return wrapper
+    return decorator
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    """Retorna os contadores de coalescência e a configuração"""
+    return {
+        **single_flight.snapshot(),
+        'enabled': AppConfig.COALESCE_READS_ENABLED,
+        'wait_timeout': AppConfig.COALESCE_WAIT_TIMEOUT,
+    }
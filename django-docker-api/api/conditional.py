@@ -0,0 +1,78 @@
+"""
+GET condicional (ETag / Last-Modified) para as leituras de documentos
+
+Os validadores vêm de uma única consulta agregada e indexada, executada antes da
+view: quando o cliente envia If-None-Match/If-Modified-Since e nada mudou, a
+resposta 304 sai sem serializar nenhum documento.
+
+A versão de um documento é o seu last_updated_at; criar, alterar ou excluir
+signatários atualiza esse campo no documento (api/signals.py). A listagem usa
+apenas ETag: excluir um documento não altera o maior last_updated_at, então um
+Last-Modified da listagem responderia 304 com a linha excluída; o ETag inclui a
+contagem e a soma dos ids.
+"""
+import hashlib
+from typing import Optional
+
+from django.db.models import Count, Max, Sum
+from django.views.decorators.http import condition
+
+from .models import Documento
+
+_LIST_STATE_ATTR = '_documentos_conditional_state'
+_DETAIL_STATE_ATTR = '_documento_conditional_state'
+
+
+def _hash(*parts) -> str:
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+
+def _representation_key(request) -> str:
+    # Página/cursor, filtros, formato (Accept, ?stream=) e host (links absolutos) alteram o corpo
+    return f"{request.build_absolute_uri()}|{request.META.get('HTTP_ACCEPT', '')}"
+
+
+def documentos_state(request) -> dict:
+    """Agrega versão e conjunto de ids dos documentos uma vez por requisição"""
+    state = getattr(request, _LIST_STATE_ATTR, None)
+    if state is None:
+        state = Documento.objects.aggregate(
+            last_modified=Max('last_updated_at'),
+            count=Count('id'),
+            id_sum=Sum('id'),
+        )
+        setattr(request, _LIST_STATE_ATTR, state)
+    return state
+
+
+def documentos_etag(request, *args, **kwargs) -> str:
+    state = documentos_state(request)
+    return _hash(
+        'documentos', state['last_modified'], state['count'], state['id_sum'],
+        _representation_key(request)
+    )
+
+
+def documento_last_updated(request, pk):
+    """Busca apenas last_updated_at do documento, uma vez por requisição"""
+    state = getattr(request, _DETAIL_STATE_ATTR, None)
+    if state is None or state[0] != pk:
+        last_updated_at = Documento.objects.filter(pk=pk).values_list('last_updated_at', flat=True).first()
+        state = (pk, last_updated_at)
+        setattr(request, _DETAIL_STATE_ATTR, state)
+    return state[1]
+
+
+def documento_etag(request, pk, *args, **kwargs) -> Optional[str]:
+    last_updated_at = documento_last_updated(request, pk)
+    if last_updated_at is None:
+        return None
+    return _hash('documento', pk, last_updated_at, _representation_key(request))
+
+
+def documento_last_modified(request, pk, *args, **kwargs):
+    return documento_last_updated(request, pk)
+
+
+documentos_condition = condition(etag_func=documentos_etag)
+documento_condition = condition(etag_func=documento_etag, last_modified_func=documento_last_modified)
@@ -15,6 +15,67 @@ class AppConfig:
     
     # Configurações de timeout
     REQUEST_TIMEOUT = config('REQUEST_TIMEOUT', default=30, cast=int)
+    ZAPSIGN_CONNECT_TIMEOUT = config('ZAPSIGN_CONNECT_TIMEOUT', default=5, cast=float)
+    ZAPSIGN_READ_TIMEOUT = config('ZAPSIGN_READ_TIMEOUT', default=REQUEST_TIMEOUT, cast=float)
+    
+    # Configurações do pool de conexões HTTP com o ZapSign
+    ZAPSIGN_POOL_SIZE = config('ZAPSIGN_POOL_SIZE', default=10, cast=int)
+    ZAPSIGN_ASYNC_POOL_SIZE = config('ZAPSIGN_ASYNC_POOL_SIZE', default=100, cast=int)
+    
+    # Retry (apenas chamadas idempotentes: GET, PUT, DELETE) e circuit breaker
+    ZAPSIGN_MAX_RETRIES = config('ZAPSIGN_MAX_RETRIES', default=2, cast=int)
+    ZAPSIGN_BACKOFF_BASE = config('ZAPSIGN_BACKOFF_BASE', default=0.2, cast=float)
+    ZAPSIGN_BACKOFF_MAX = config('ZAPSIGN_BACKOFF_MAX', default=2.0, cast=float)
+    ZAPSIGN_CB_FAILURE_RATE = config('ZAPSIGN_CB_FAILURE_RATE', default=0.5, cast=float)
+    ZAPSIGN_CB_MIN_CALLS = config('ZAPSIGN_CB_MIN_CALLS', default=10, cast=int)
+    ZAPSIGN_CB_WINDOW_SIZE = config('ZAPSIGN_CB_WINDOW_SIZE', default=20, cast=int)
+    ZAPSIGN_CB_OPEN_SECONDS = config('ZAPSIGN_CB_OPEN_SECONDS', default=30, cast=float)
+    
+    # Usa as views assíncronas de documentos (deploy ASGI via core/asgi.py)
+    USE_ASYNC_VIEWS = config('USE_ASYNC_VIEWS', default=False, cast=bool)
+    
+    # Configurações de paginação
+    PAGE_SIZE = config('PAGE_SIZE', default=50, cast=int)
+    MAX_PAGE_SIZE = config('MAX_PAGE_SIZE', default=500, cast=int)
+    
+    # Configurações de operações em lote
+    BATCH_MAX_SIZE = config('BATCH_MAX_SIZE', default=1000, cast=int)
+    BATCH_MAX_CONCURRENCY = config('BATCH_MAX_CONCURRENCY', default=10, cast=int)
+    
+    # Cache das leituras de documentos (backend, TTL e limites em CACHES, core/settings.py)
+    DOCUMENT_CACHE_ENABLED = config('DOCUMENT_CACHE_ENABLED', default=True, cast=bool)
+    DOCUMENT_CACHE_ALIAS = config('DOCUMENT_CACHE_ALIAS', default='default')
+    
+    # Webhooks do ZapSign: segredo opcional (header X-Webhook-Secret) e buffer de eventos
+    ZAPSIGN_WEBHOOK_SECRET = config('ZAPSIGN_WEBHOOK_SECRET', default='')
+    WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=500, cast=int)
+    WEBHOOK_FLUSH_INTERVAL = config('WEBHOOK_FLUSH_INTERVAL', default=1.0, cast=float)
+    
+    # Sincronização de status com o ZapSign (comando sync_document_status)
+    SYNC_MAX_CONCURRENCY = config('SYNC_MAX_CONCURRENCY', default=20, cast=int)
+    SYNC_RATE_LIMIT = config('SYNC_RATE_LIMIT', default=50.0, cast=float)
+    SYNC_BATCH_SIZE = config('SYNC_BATCH_SIZE', default=500, cast=int)
+    
+    # Coalescência de leituras idênticas simultâneas (api/coalescing.py); após a espera,
+    # a requisição executa por conta própria
+    COALESCE_READS_ENABLED = config('COALESCE_READS_ENABLED', default=True, cast=bool)
+    COALESCE_WAIT_TIMEOUT = config('COALESCE_WAIT_TIMEOUT', default=30.0, cast=float)
+    
+    # Idempotency-Key: validade das chaves, espera por repetições simultâneas e
+    # tempo após o qual uma chave presa em processamento (processo interrompido) é liberada
+    IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=86400, cast=int)
+    IDEMPOTENCY_WAIT_TIMEOUT = config('IDEMPOTENCY_WAIT_TIMEOUT', default=10.0, cast=float)
+    IDEMPOTENCY_PROCESSING_TIMEOUT = config('IDEMPOTENCY_PROCESSING_TIMEOUT', default=120, cast=int)
+    
+    # Métricas por requisição (/metrics) e header Server-Timing
+    METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+    SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=True, cast=bool)
+    
+    # Multiplicador dos limites de tempo de api/budgets.json (máquinas de CI lentas)
+    BUDGET_TIME_FACTOR = config('BUDGET_TIME_FACTOR', default=1.0, cast=float)
+    
+    # Configurações de streaming das listagens
+    STREAM_CHUNK_SIZE = config('STREAM_CHUNK_SIZE', default=500, cast=int)
     
     @classmethod
     def get_zapsign_config(cls):
@@ -22,5 +83,65 @@ class AppConfig:
         return {
             'token': cls.ZAPSIGN_API_TOKEN,
             'base_url': cls.ZAPSIGN_API_BASE_URL,
-            'timeout': cls.REQUEST_TIMEOUT
+            'timeout': cls.REQUEST_TIMEOUT,
+            'connect_timeout': cls.ZAPSIGN_CONNECT_TIMEOUT,
+            'read_timeout': cls.ZAPSIGN_READ_TIMEOUT,
+            'pool_size': cls.ZAPSIGN_POOL_SIZE,
+            'async_pool_size': cls.ZAPSIGN_ASYNC_POOL_SIZE
+        }
+    
+    @classmethod
+    def get_pagination_config(cls):
+        """Retorna configurações de paginação das listagens"""
+        return {
+            'page_size': cls.PAGE_SIZE,
+            'max_page_size': cls.MAX_PAGE_SIZE
+        }
+    
+    @classmethod
+    def get_batch_config(cls):
+        """Retorna configurações das operações em lote"""
+        return {
+            'max_size': cls.BATCH_MAX_SIZE,
+            'max_concurrency': cls.BATCH_MAX_CONCURRENCY
+        }
+    
+    @classmethod
+    def get_idempotency_config(cls):
+        """Retorna configurações das chaves de idempotência"""
+        return {
+            'ttl': cls.IDEMPOTENCY_TTL,
+            'wait_timeout': cls.IDEMPOTENCY_WAIT_TIMEOUT,
+            'processing_timeout': cls.IDEMPOTENCY_PROCESSING_TIMEOUT
+        }
+    
+    @classmethod
+    def get_webhook_config(cls):
+        """Retorna configurações do recebimento de webhooks do ZapSign"""
+        return {
+            'secret': cls.ZAPSIGN_WEBHOOK_SECRET,
+            'batch_size': cls.WEBHOOK_BATCH_SIZE,
+            'flush_interval': cls.WEBHOOK_FLUSH_INTERVAL
+        }
+    
+    @classmethod
+    def get_sync_config(cls):
+        """Retorna configurações da sincronização de status com o ZapSign"""
+        return {
+            'max_concurrency': cls.SYNC_MAX_CONCURRENCY,
+            'rate_limit': cls.SYNC_RATE_LIMIT,
+            'batch_size': cls.SYNC_BATCH_SIZE
+        }
+    
+    @classmethod
+    def get_resilience_config(cls):
+        """Retorna configurações de retry e circuit breaker das chamadas ao ZapSign"""
+        return {
+            'max_retries': cls.ZAPSIGN_MAX_RETRIES,
+            'backoff_base': cls.ZAPSIGN_BACKOFF_BASE,
+            'backoff_max': cls.ZAPSIGN_BACKOFF_MAX,
+            'failure_rate_threshold': cls.ZAPSIGN_CB_FAILURE_RATE,
+            'minimum_calls': cls.ZAPSIGN_CB_MIN_CALLS,
+            'window_size': cls.ZAPSIGN_CB_WINDOW_SIZE,
+            'open_seconds': cls.ZAPSIGN_CB_OPEN_SECONDS
         }
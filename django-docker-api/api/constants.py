@@ -17,6 +17,48 @@ SIGNER_STATUS = {
     'DECLINED': 'declined'
 }
 
+# Status finais: eventos atrasados ou fora de ordem não os sobrescrevem
+DOCUMENT_FINAL_STATUSES = frozenset({
+    DOCUMENT_STATUS['SIGNED'],
+    DOCUMENT_STATUS['CANCELLED'],
+    DOCUMENT_STATUS['EXPIRED']
+})
+SIGNER_FINAL_STATUSES = frozenset({
+    SIGNER_STATUS['SIGNED'],
+    SIGNER_STATUS['DECLINED']
+})
+
+# Status das intenções de criação (outbox) de documentos
+OUTBOX_STATUS = {
+    'PENDING': 'pending',      # registrada, chamada ao ZapSign ainda não concluída
+    'SENT': 'sent',            # documento criado no ZapSign, falta gravar localmente
+    'COMPLETED': 'completed',
+    'FAILED': 'failed'
+}
+
+# Status das chaves de idempotência (header Idempotency-Key)
+IDEMPOTENCY_STATUS = {
+    'PROCESSING': 'processing',  # primeira requisição com a chave ainda em andamento
+    'COMPLETED': 'completed',    # resposta gravada, devolvida nas repetições
+    'FAILED': 'failed'           # erro após chamada ao ZapSign (resultado ambíguo), devolvido nas repetições
+}
+
+# Tipos das atualizações de status recebidas por webhook (tabela webhook_status_update)
+WEBHOOK_UPDATE_KIND = {
+    'DOCUMENT': 'document',
+    'SIGNER': 'signer'
+}
+
+# Campos obrigatórios para criação de documentos
+DOCUMENT_CREATE_REQUIRED_FIELDS = ['name', 'url_documento', 'nome_signatario', 'email_signatario']
+
+# Estados do circuit breaker das chamadas ao ZapSign
+CIRCUIT_STATE = {
+    'CLOSED': 'closed',
+    'OPEN': 'open',
+    'HALF_OPEN': 'half_open'
+}
+
 # Métodos HTTP permitidos
 HTTP_METHODS = {
     'GET': 'GET',
@@ -26,13 +68,23 @@ HTTP_METHODS = {
     'PATCH': 'PATCH'
 }
 
+# Formatos de streaming das listagens
+STREAM_FORMATS = {
+    'NDJSON': 'ndjson',
+    'JSON': 'json'
+}
+
 # Códigos de erro customizados
 ERROR_CODES = {
     'ZAPSIGN_API_ERROR': 'ZAPSIGN_001',
     'DOCUMENT_NOT_FOUND': 'DOC_001',
     'SIGNER_NOT_FOUND': 'SIGN_001',
     'VALIDATION_ERROR': 'VAL_001',
-    'EXTERNAL_API_ERROR': 'EXT_001'
+    'EXTERNAL_API_ERROR': 'EXT_001',
+    'ZAPSIGN_UNAVAILABLE': 'ZAPSIGN_503',
+    'WEBHOOK_UNAUTHORIZED': 'WEBHOOK_401',
+    'IDEMPOTENCY_KEY_REUSED': 'IDEMP_422',
+    'IDEMPOTENCY_IN_PROGRESS': 'IDEMP_409'
 }
 
 # Mensagens padrão
@@ -41,7 +93,9 @@ MESSAGES = {
     'DOCUMENT_UPDATED': 'Documento atualizado com sucesso',
     'DOCUMENT_DELETED': 'Documento deletado com sucesso',
     'SIGNER_ADDED': 'Signatário adicionado com sucesso',
-    'OPERATION_SUCCESS': 'Operação realizada com sucesso'
+    'OPERATION_SUCCESS': 'Operação realizada com sucesso',
+    'BATCH_PROCESSED': 'Lote processado',
+    'WEBHOOK_ACCEPTED': 'Eventos recebidos'
 }
 
 # Configurações padrão
@@ -23,11 +23,7 @@ def handle_zapsign_exceptions(operation_name: str = "operação"):
                 return view_func(*args, **kwargs)
             except ZapSignAPIException as e:
                 logger.error(f"Erro na API ZapSign durante {operation_name}: {e.message}")
-                return APIResponseHandler.error_response(
-                    error_message=e.message,
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
-                )
+                return APIResponseHandler.zapsign_error_response(e)
             except Exception as e:
                 logger.error(f"Erro inesperado durante {operation_name}: {str(e)}")
                 return APIResponseHandler.error_response(
@@ -0,0 +1,106 @@
+"""
+Seleção de campos (sparse fieldsets) nas leituras de documentos
+
+    fields   campos do documento separados por vírgula (ex.: id,name,status)
+    include  relacionamentos embutidos; hoje apenas "signers"
+
+Sem ?fields= a resposta mantém o formato completo, com todos os campos e os
+signatários. Com ?fields= a consulta carrega apenas as colunas pedidas (.only()
+no detalhe, values() na listagem) e os signatários só são buscados quando
+solicitados via ?include=signers.
+"""
+from functools import partial
+from typing import Optional, Tuple
+
+from .models import Documento
+from .serializers import DocumentoValuesSerializer, DocumentoWithSignersSerializer
+
+SIGNERS_INCLUDE = 'signers'
+
+# Colunas sempre carregadas: chave primária e ordenação da paginação por cursor
+ALWAYS_LOADED_FIELDS = ('id', 'created_at')
+
+
+class InvalidFieldsetException(Exception):
+    """Exceção para campos ou inclusões inválidos nas leituras de documentos"""
+    def __init__(self, param: str, message: str):
+        self.param = param
+        self.message = f"Parâmetro {param} inválido: {message}"
+        super().__init__(self.message)
+
+
+def _split(value: Optional[str]) -> list:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+class DocumentoFieldset:
+    """Campos e inclusões validados de uma leitura de documentos"""
+
+    FIELDS = tuple(field.name for field in Documento._meta.concrete_fields)
+
+    def __init__(self, fields: Optional[Tuple[str, ...]] = None, signers: bool = True):
+        self.fields = fields
+        self.signers = signers
+
+    @classmethod
+    def from_query_params(cls, params) -> 'DocumentoFieldset':
+        """Valida ?fields= e ?include=; levanta InvalidFieldsetException"""
+        includes = _split(params.get('include'))
+        invalid = sorted(set(includes) - {SIGNERS_INCLUDE})
+        if invalid:
+            raise InvalidFieldsetException('include', f"{', '.join(invalid)}; use: {SIGNERS_INCLUDE}")
+
+        if 'fields' not in params:
+            return cls()
+
+        fields = _split(params.get('fields'))
+        if not fields:
+            raise InvalidFieldsetException('fields', "informe ao menos um campo")
+        signers = SIGNERS_INCLUDE in includes or SIGNERS_INCLUDE in fields
+        fields = [field for field in fields if field != SIGNERS_INCLUDE]
+        invalid = sorted(set(fields) - set(cls.FIELDS))
+        if invalid:
+            raise InvalidFieldsetException('fields', f"{', '.join(invalid)}; use um de: {', '.join(cls.FIELDS)}")
+        return cls(tuple(dict.fromkeys(fields)), signers)
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.fields is not None
+
+    @property
+    def cache_variant(self) -> str:
+        """Identifica a forma da resposta nas chaves de cache do detalhe"""
+        if not self.is_sparse:
+            return ''
+        return ','.join(sorted(self.fields)) + (f'+{SIGNERS_INCLUDE}' if self.signers else '')
+
+    def apply(self, queryset):
+        """Restringe as colunas e os relacionamentos carregados pelo queryset"""
+        if not self.is_sparse:
+            return queryset.with_signers()
+        queryset = queryset.only(*dict.fromkeys(ALWAYS_LOADED_FIELDS + self.fields))
+        if self.signers:
+            queryset = queryset.prefetch_related('signatario_set')
+        return queryset
+
+    def apply_values(self, queryset):
+        """Queryset de listagem em linhas de values(), para DocumentoValuesSerializer"""
+        fields = DocumentoValuesSerializer.values_fields(self.fields)
+        return queryset.values(*dict.fromkeys(ALWAYS_LOADED_FIELDS + tuple(fields)))
+
+    @property
+    def serializer_fields(self) -> Optional[Tuple[str, ...]]:
+        if not self.is_sparse:
+            return None
+        return self.fields + ((SIGNERS_INCLUDE,) if self.signers else ())
+
+    @property
+    def serializer_class(self):
+        if not self.is_sparse:
+            return DocumentoWithSignersSerializer
+        return partial(DocumentoWithSignersSerializer, fields=self.serializer_fields)
+
+    @property
+    def list_serializer_class(self):
+        """Serializador rápido das listagens, a partir de values()"""
+        return partial(DocumentoValuesSerializer, fields=self.serializer_fields)
@@ -0,0 +1,127 @@
+"""
+Filtros e busca da listagem de documentos
+
+Cada parâmetro corresponde a um caminho indexado (ver Meta.indexes de Documento e
+Signatario e a migração do índice trigram), e os valores são validados antes da
+consulta: um valor que levaria a uma varredura completa da tabela (ex.: busca com
+menos de SEARCH_MIN_LENGTH caracteres, que o índice trigram não atende) é recusado.
+
+    status         um ou mais status separados por vírgula (DOCUMENT_STATUS)
+    company        id da empresa
+    created_after  created_at >= data/hora ISO 8601
+    created_before created_at <  data/hora ISO 8601
+    updated_after  last_updated_at >= data/hora ISO 8601
+    updated_before last_updated_at <  data/hora ISO 8601
+    signer_email   documentos com um signatário com este e-mail
+    search         trecho do nome do documento (sem diferenciar maiúsculas)
+"""
+from datetime import datetime, time
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .constants import DOCUMENT_STATUS
+from .models import Signatario
+
+SEARCH_MIN_LENGTH = 3
+SEARCH_MAX_LENGTH = 100
+
+
+class InvalidFilterException(Exception):
+    """Exceção para filtros inválidos na listagem de documentos"""
+    def __init__(self, param: str, message: str):
+        self.param = param
+        self.message = f"Filtro {param} inválido: {message}"
+        super().__init__(self.message)
+
+
+def _parse_moment(param: str, value: str) -> datetime:
+    """Aceita data/hora ISO 8601 ou apenas a data (meia-noite no fuso configurado)"""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise InvalidFilterException(param, "use data ou data/hora ISO 8601")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class DocumentoListFilters:
+    """Filtros validados da listagem de documentos"""
+
+    RANGE_FIELDS = {
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lt',
+        'updated_after': 'last_updated_at__gte',
+        'updated_before': 'last_updated_at__lt',
+    }
+
+    def __init__(self, lookups: Dict[str, Any], signer_email: Optional[str] = None,
+                 search: Optional[str] = None):
+        self.lookups = lookups
+        self.signer_email = signer_email
+        self.search = search
+
+    @classmethod
+    def from_query_params(cls, params) -> 'DocumentoListFilters':
+        """Valida os parâmetros da query string; levanta InvalidFilterException"""
+        lookups = {}
+
+        statuses = [value for value in params.get('status', '').split(',') if value]
+        if statuses:
+            invalid = sorted(set(statuses) - set(DOCUMENT_STATUS.values()))
+            if invalid:
+                raise InvalidFilterException(
+                    'status', f"{', '.join(invalid)}; use um de: {', '.join(DOCUMENT_STATUS.values())}"
+                )
+            lookups['status__in'] = sorted(set(statuses))
+
+        company = params.get('company')
+        if company:
+            if not company.isdigit():
+                raise InvalidFilterException('company', "use o id numérico da empresa")
+            lookups['company_id'] = int(company)
+
+        for param, lookup in cls.RANGE_FIELDS.items():
+            if params.get(param):
+                lookups[lookup] = _parse_moment(param, params[param])
+        for field, (start, end) in {
+            'created': ('created_at__gte', 'created_at__lt'),
+            'updated': ('last_updated_at__gte', 'last_updated_at__lt'),
+        }.items():
+            if start in lookups and end in lookups and lookups[start] >= lookups[end]:
+                raise InvalidFilterException(f'{field}_after', f"deve ser anterior a {field}_before")
+
+        signer_email = params.get('signer_email') or None
+        if signer_email:
+            try:
+                validate_email(signer_email)
+            except ValidationError:
+                raise InvalidFilterException('signer_email', "e-mail inválido")
+
+        search = (params.get('search') or '').strip() or None
+        if search and not SEARCH_MIN_LENGTH <= len(search) <= SEARCH_MAX_LENGTH:
+            raise InvalidFilterException(
+                'search', f"use entre {SEARCH_MIN_LENGTH} e {SEARCH_MAX_LENGTH} caracteres"
+            )
+
+        return cls(lookups, signer_email, search)
+
+    def apply(self, queryset):
+        """Aplica os filtros ao queryset de documentos"""
+        if self.lookups:
+            queryset = queryset.filter(**self.lookups)
+        if self.signer_email:
+            # Subconsulta pelo índice de e-mail, sem JOIN que duplicaria documentos
+            queryset = queryset.filter(
+                id__in=Signatario.objects.filter(email=self.signer_email).values('documentID')
+            )
+        if self.search:
+            # UPPER(name) LIKE UPPER('%...%'): atendido pelo índice GIN trigram em UPPER(name)
+            queryset = queryset.filter(name__icontains=self.search)
+        return queryset
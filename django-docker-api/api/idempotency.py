@@ -0,0 +1,294 @@
+"""
+Chaves de idempotência (header Idempotency-Key) para os endpoints de criação
+
+A primeira requisição com uma chave a registra como em processamento (restrição
+única por escopo + chave) e, se terminar com sucesso (2xx), grava a resposta.
+Repetições com a mesma chave e o mesmo corpo recebem a resposta gravada, com o
+header Idempotent-Replayed, sem nova chamada ao ZapSign; repetições simultâneas
+aguardam a primeira terminar (até IDEMPOTENCY_WAIT_TIMEOUT). Respostas de erro
+anteriores a qualquer chamada ao ZapSign (validação, circuito aberto) liberam a
+chave, permitindo nova tentativa; depois que uma chamada foi enviada, o resultado
+pode ser ambíguo (ex.: timeout de leitura com o documento já criado) e a resposta
+de erro também é gravada e devolvida nas repetições. As chaves expiram após
+IDEMPOTENCY_TTL segundos (remoção em lote: comando purge_idempotency_keys).
+"""
+import asyncio
+import hashlib
+import math
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import wraps
+from typing import Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from rest_framework import status
+
+from .config import AppConfig
+from .constants import ERROR_CODES, IDEMPOTENCY_STATUS
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+# Estado da requisição idempotente em andamento; o dicionário é compartilhado com
+# as cópias do contexto (sync_to_async, _fan_out) para que marcações feitas nelas valham
+_remote_attempt: ContextVar[Optional[dict]] = ContextVar('idempotency_remote_attempt', default=None)
+
+
+def mark_remote_attempt() -> None:
+    """Registra que a requisição idempotente em andamento enviou uma chamada ao ZapSign"""
+    state = _remote_attempt.get()
+    if state is not None:
+        state['attempted'] = True
+
+
+def processing_timeout(sequential_calls: int = 1) -> float:
+    """
+    Prazo após o qual uma chave em processamento pode ser assumida por outra requisição:
+    IDEMPOTENCY_PROCESSING_TIMEOUT ou, se maior, o pior caso de sequential_calls
+    chamadas ao ZapSign em sequência (timeouts de conexão e leitura).
+    """
+    zapsign_config = AppConfig.get_zapsign_config()
+    call_timeout = zapsign_config['connect_timeout'] + zapsign_config['read_timeout']
+    return max(AppConfig.get_idempotency_config()['processing_timeout'], sequential_calls * call_timeout)
+
+
+def batch_sequential_calls() -> int:
+    """Chamadas em sequência no pior caso de um lote: BATCH_MAX_SIZE em ondas de BATCH_MAX_CONCURRENCY"""
+    batch_config = AppConfig.get_batch_config()
+    return math.ceil(batch_config['max_size'] / max(1, batch_config['max_concurrency']))
+
+
+def _error_response(error_message, status_code, error_code) -> JsonResponse:
+    return JsonResponse(
+        {"success": False, "error": error_message, "error_code": error_code},
+        status=status_code
+    )
+
+
+def _request_hash(request) -> str:
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def claim(scope: str, key: str, request_hash: str,
+          timeout: Optional[float] = None) -> Tuple[bool, Optional[IdempotencyKey]]:
+    """
+    Tenta registrar a chave como em processamento.
+
+    Retorna (True, None) se a chave foi registrada, ou (False, registro existente);
+    o registro é None se a chave foi liberada entre as duas consultas. timeout é o
+    prazo de processamento do escopo (padrão: processing_timeout()).
+    """
+    now = timezone.now()
+    config = AppConfig.get_idempotency_config()
+    timeout = processing_timeout() if timeout is None else timeout
+    # Chaves expiradas, ou presas em processamento por um processo interrompido, são liberadas
+    IdempotencyKey.objects.filter(scope=scope, key=key).filter(
+        Q(expires_at__lte=now)
+        | Q(status=IDEMPOTENCY_STATUS['PROCESSING'], created_at__lte=now - timedelta(seconds=timeout))
+    ).delete()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                status=IDEMPOTENCY_STATUS['PROCESSING'],
+                expires_at=now + timedelta(seconds=config['ttl'])
+            )
+        return True, None
+    except IntegrityError:
+        return False, IdempotencyKey.objects.filter(scope=scope, key=key).first()
+
+
+def finish(scope: str, key: str, response, remote_attempted: bool = False) -> None:
+    """
+    Grava a resposta da chave. Respostas de erro sem chamada ao ZapSign liberam a
+    chave para nova tentativa; depois de uma chamada, o erro também é gravado.
+    """
+    if response.streaming or not (status.is_success(response.status_code) or remote_attempted):
+        release(scope, key)
+        return
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    IdempotencyKey.objects.filter(scope=scope, key=key).update(
+        status=IDEMPOTENCY_STATUS[
+            'COMPLETED' if status.is_success(response.status_code) else 'FAILED'
+        ],
+        response_status=response.status_code,
+        response_content_type=response.get('Content-Type'),
+        response_body=response.content
+    )
+
+
+def _unexpected_error_response() -> JsonResponse:
+    return _error_response(
+        "Erro inesperado após a chamada ao ZapSign; verifique o documento antes de repetir",
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        ERROR_CODES['EXTERNAL_API_ERROR']
+    )
+
+
+def abort(scope: str, key: str, remote_attempted: bool) -> None:
+    """Trata uma exceção da view: libera a chave ou, após chamada ao ZapSign, grava um erro"""
+    if remote_attempted:
+        finish(scope, key, _unexpected_error_response(), remote_attempted)
+    else:
+        release(scope, key)
+
+
+def release(scope: str, key: str) -> None:
+    IdempotencyKey.objects.filter(
+        scope=scope, key=key, status=IDEMPOTENCY_STATUS['PROCESSING']
+    ).delete()
+
+
+def _existing_response(record: IdempotencyKey, request_hash: str) -> Optional[HttpResponse]:
+    """Resposta para uma chave já registrada; None enquanto a primeira requisição processa"""
+    if record.request_hash != request_hash:
+        return _error_response(
+            f"{HEADER} já usada com outra requisição",
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            ERROR_CODES['IDEMPOTENCY_KEY_REUSED']
+        )
+    if record.status in (IDEMPOTENCY_STATUS['COMPLETED'], IDEMPOTENCY_STATUS['FAILED']):
+        response = HttpResponse(
+            bytes(record.response_body),
+            status=record.response_status,
+            content_type=record.response_content_type
+        )
+        response[REPLAYED_HEADER] = 'true'
+        return response
+    return None
+
+
+def _in_progress_response() -> JsonResponse:
+    response = _error_response(
+        f"Requisição com esta {HEADER} ainda em processamento",
+        status.HTTP_409_CONFLICT,
+        ERROR_CODES['IDEMPOTENCY_IN_PROGRESS']
+    )
+    response['Retry-After'] = '1'
+    return response
+
+
+def _resolve(scope: str, key: str, request_hash: str, timeout: float) -> Optional[HttpResponse]:
+    """Registra a chave (retorna None) ou devolve a resposta para a repetição"""
+    deadline = time.monotonic() + AppConfig.get_idempotency_config()['wait_timeout']
+    while True:
+        claimed, record = claim(scope, key, request_hash, timeout)
+        if claimed:
+            return None
+        if record is not None:
+            response = _existing_response(record, request_hash)
+            if response is not None:
+                return response
+            if time.monotonic() >= deadline:
+                return _in_progress_response()
+            time.sleep(POLL_INTERVAL)
+
+
+async def _aresolve(scope: str, key: str, request_hash: str, timeout: float) -> Optional[HttpResponse]:
+    """Equivalente assíncrono de _resolve"""
+    deadline = time.monotonic() + AppConfig.get_idempotency_config()['wait_timeout']
+    while True:
+        claimed, record = await sync_to_async(claim)(scope, key, request_hash, timeout)
+        if claimed:
+            return None
+        if record is not None:
+            response = _existing_response(record, request_hash)
+            if response is not None:
+                return response
+            if time.monotonic() >= deadline:
+                return _in_progress_response()
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+def _invalid_key_response(key: str) -> Optional[JsonResponse]:
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return _error_response(
+            f"{HEADER} deve ter de 1 a {MAX_KEY_LENGTH} caracteres",
+            status.HTTP_400_BAD_REQUEST,
+            ERROR_CODES['VALIDATION_ERROR']
+        )
+    return None
+
+
+def idempotent(scope: str, sequential_calls: int = 1):
+    """
+    Torna a view idempotente pelo header Idempotency-Key (opcional).
+
+    sequential_calls é o número de chamadas ao ZapSign em sequência no pior caso
+    da view: a chave não é assumida por outra requisição antes desse tempo
+    (processing_timeout). Aplicar por fora de @api_view/@csrf_exempt; aceita views
+    síncronas e assíncronas.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                key = request.headers.get(HEADER)
+                if key is None:
+                    return await view(request, *args, **kwargs)
+                error_response = _invalid_key_response(key)
+                if error_response:
+                    return error_response
+
+                response = await _aresolve(
+                    scope, key, _request_hash(request), processing_timeout(sequential_calls)
+                )
+                if response is not None:
+                    return response
+                state = {'attempted': False}
+                token = _remote_attempt.set(state)
+                try:
+                    response = await view(request, *args, **kwargs)
+                except BaseException:
+                    await sync_to_async(abort)(scope, key, state['attempted'])
+                    raise
+                finally:
+                    _remote_attempt.reset(token)
+                await sync_to_async(finish)(scope, key, response, state['attempted'])
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None:
+                return view(request, *args, **kwargs)
+            error_response = _invalid_key_response(key)
+            if error_response:
+                return error_response
+
+            response = _resolve(scope, key, _request_hash(request), processing_timeout(sequential_calls))
+            if response is not None:
+                return response
+            state = {'attempted': False}
+            token = _remote_attempt.set(state)
+            try:
+                response = view(request, *args, **kwargs)
+            except BaseException:
+                abort(scope, key, state['attempted'])
+                raise
+            finally:
+                _remote_attempt.reset(token)
+            finish(scope, key, response, state['attempted'])
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired() -> int:
+    """Remove as chaves expiradas; retorna quantas foram removidas"""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,14 @@
+"""
+Remove as chaves de idempotência expiradas
+"""
+from django.core.management.base import BaseCommand
+
+from api.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Remove as chaves de idempotência (Idempotency-Key) expiradas"
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Chaves removidas: {deleted}"))
@@ -0,0 +1,28 @@
+"""
+Reconcilia criações de documentos interrompidas entre o ZapSign e o banco local
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.services import DocumentoService
+
+
+class Command(BaseCommand):
+    help = "Conclui ou marca como falha as intenções de criação de documentos interrompidas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=600,
+            help="Idade mínima, em segundos, das intenções a reconciliar (padrão: 600)"
+        )
+
+    def handle(self, *args, **options):
+        result = DocumentoService().reconcile_outbox(timedelta(seconds=options['older_than']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Concluídas: {result['completed']}, "
+            f"falhas: {result['failed']}, "
+            f"abandonadas: {result['abandoned']}"
+        ))
@@ -0,0 +1,113 @@
+"""
+Sincroniza com o ZapSign o status dos documentos ainda não finalizados
+"""
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.config import AppConfig
+from api.resilience import RateLimiter
+from api.services import DocumentoService, ZapSignService, ZapSignUnavailableException, build_http_session
+
+DEFAULT_CHECKPOINT = os.path.join(settings.BASE_DIR, '.sync_document_status.json')
+TOTAL_KEYS = ('fetched', 'failed', 'documents_updated', 'signers_updated')
+
+
+class Command(BaseCommand):
+    help = (
+        "Consulta no ZapSign os documentos em status não final, em paralelo e com limite "
+        "de taxa, e grava em lote apenas os status alterados. Retoma do checkpoint se interrompido"
+    )
+
+    def add_arguments(self, parser):
+        sync_config = AppConfig.get_sync_config()
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=sync_config['max_concurrency'],
+            help=f"Chamadas simultâneas ao ZapSign (padrão: {sync_config['max_concurrency']})"
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=sync_config['rate_limit'],
+            help=f"Máximo de chamadas por segundo (padrão: {sync_config['rate_limit']})"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=sync_config['batch_size'],
+            help=f"Documentos por bloco gravado e por checkpoint (padrão: {sync_config['batch_size']})"
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=DEFAULT_CHECKPOINT,
+            help="Arquivo de checkpoint para retomar execuções interrompidas"
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Ignora o checkpoint existente e recomeça do primeiro documento"
+        )
+
+    @staticmethod
+    def _load_checkpoint(path):
+        try:
+            with open(path) as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _save_checkpoint(path, checkpoint):
+        # Grava em arquivo temporário e renomeia: o checkpoint nunca fica pela metade
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, path)
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = None if options['restart'] else self._load_checkpoint(checkpoint_path)
+        if checkpoint:
+            self.stdout.write(f"Retomando após o documento {checkpoint['last_id']}")
+        else:
+            checkpoint = {'last_id': 0, **{key: 0 for key in TOTAL_KEYS}}
+
+        concurrency = options['concurrency']
+        service = DocumentoService(
+            zapsign_service=ZapSignService(session=build_http_session(concurrency))
+        )
+        rate_limiter = RateLimiter(options['rate'])
+
+        while True:
+            pending = service.pending_documents(checkpoint['last_id'], options['batch_size'])
+            if not pending:
+                break
+            try:
+                result = service.sync_remote_statuses(
+                    [token for _, token in pending], concurrency, rate_limiter
+                )
+            except ZapSignUnavailableException as e:
+                raise CommandError(
+                    f"{e.message}. Progresso salvo em {checkpoint_path}; execute novamente para retomar"
+                )
+            for key in TOTAL_KEYS:
+                checkpoint[key] += result[key]
+            checkpoint['last_id'] = pending[-1][0]
+            self._save_checkpoint(checkpoint_path, checkpoint)
+            self.stdout.write(
+                f"Até o documento {checkpoint['last_id']}: consultados {checkpoint['fetched']}, "
+                f"alterados {checkpoint['documents_updated']}"
+            )
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Consultados: {checkpoint['fetched']}, "
+            f"falhas: {checkpoint['failed']}, "
+            f"documentos alterados: {checkpoint['documents_updated']}, "
+            f"signatários alterados: {checkpoint['signers_updated']}"
+        ))
@@ -0,0 +1,274 @@
+"""
+Métricas de desempenho em processo, exportadas no formato texto do Prometheus
+
+Contadores e histogramas são agregados na memória do processo, protegidos por
+lock (seguros entre threads). Com vários processos (ex.: workers do gunicorn),
+cada um expõe os próprios valores em /metrics.
+
+Por requisição, MetricsMiddleware abre um RequestStats em um contextvar; o
+wrapper de execução SQL (instalado em cada conexão, ver install_query_wrapper) e
+o ZapSignService somam nele consultas e chamadas externas, que viram os
+histogramas por view e o header Server-Timing.
+"""
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    pairs = ['%s="%s"' % (name, _escape(value)) for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Contador monotônico com rótulos"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}'
+                for key, value in values]
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos (buckets fixos, como o do Prometheus)"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # rótulos -> [contagem por bucket..., +Inf], soma
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            counts, total = self._values.setdefault(
+                label_values, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            entry = self._values.get(label_values)
+            return sum(entry[0]) if entry else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                labels = _format_labels(self.labels + ('le',), key + (le,))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exportadas em /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(Histogram(
+    'api_request_duration_seconds', 'Latência das requisições por view',
+    ('view', 'method', 'status'),
+))
+REQUEST_DB_QUERIES = registry.register(Histogram(
+    'api_request_db_queries', 'Consultas SQL por requisição, por view',
+    ('view',), buckets=QUERY_COUNT_BUCKETS,
+))
+REQUEST_DB_DURATION = registry.register(Histogram(
+    'api_request_db_duration_seconds', 'Tempo em consultas SQL por requisição, por view',
+    ('view',),
+))
+COALESCED_REQUESTS = registry.register(Counter(
+    'api_coalesced_requests_total', 'Leituras atendidas por uma execução simultânea idêntica (api/coalescing.py)',
+    ('view',),
+))
+ZAPSIGN_REQUESTS = registry.register(Counter(
+    'zapsign_requests_total', 'Chamadas HTTP ao ZapSign (cada tentativa), por resultado',
+    ('method', 'endpoint', 'status'),
+))
+ZAPSIGN_DURATION = registry.register(Histogram(
+    'zapsign_request_duration_seconds', 'Latência das chamadas HTTP ao ZapSign',
+    ('method', 'endpoint'),
+))
+
+
+class RequestStats:
+    """
+    Totais de uma requisição: consultas SQL e chamadas ao ZapSign.
+
+    As operações em lote chamam o ZapSign em paralelo (DocumentoService._fan_out),
+    em threads que compartilham este objeto pelo contextvar: os totais são somados
+    sob lock, e o tempo do ZapSign é o de relógio (união dos intervalos das
+    chamadas), não a soma das durações, que passaria do tempo total da requisição.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.zapsign_calls = 0
+        self._zapsign_intervals: List[Tuple[float, float]] = []
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds: float) -> None:
+        with self._lock:
+            self.db_queries += 1
+            self.db_seconds += seconds
+
+    def add_zapsign_call(self, seconds: float) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            self.zapsign_calls += 1
+            self._zapsign_intervals.append((finished - seconds, finished))
+
+    @property
+    def zapsign_seconds(self) -> float:
+        """Tempo de relógio com ao menos uma chamada ao ZapSign em andamento"""
+        with self._lock:
+            intervals = sorted(self._zapsign_intervals)
+        total, covered_until = 0.0, float('-inf')
+        for started, finished in intervals:
+            if finished > covered_until:
+                total += finished - max(started, covered_until)
+                covered_until = finished
+        return total
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Valor do header Server-Timing (durações em milissegundos)"""
+        zapsign_seconds = self.zapsign_seconds
+        app_seconds = max(total_seconds - self.db_seconds - zapsign_seconds, 0.0)
+        return ', '.join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+            f'zapsign;dur={zapsign_seconds * 1000:.1f};desc="{self.zapsign_calls} calls"',
+            f'app;dur={app_seconds * 1000:.1f}',
+            f'total;dur={total_seconds * 1000:.1f}',
+        ])
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('api_request_stats', default=None)
+
+
+def start_request() -> Tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request(token) -> None:
+    _request_stats.reset(token)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(time.perf_counter() - started)
+
+
+def install_query_wrapper(sender=None, connection=None, **kwargs) -> None:
+    """Receptor de connection_created: instala a medição de consultas na conexão"""
+    if connection is not None and _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+# Tokens de documento/signatário viram {token}, mantendo poucas séries por endpoint
+_ZAPSIGN_PATH_TOKEN = re.compile(r'^/docs/[^/]+/')
+
+
+def zapsign_endpoint(path: str) -> str:
+    return _ZAPSIGN_PATH_TOKEN.sub('/docs/{token}/', path)
+
+
+def record_zapsign_call(method: str, path: str, status, seconds: float) -> None:
+    """Registra uma tentativa de chamada ao ZapSign (status HTTP ou 'error')"""
+    endpoint = zapsign_endpoint(path)
+    ZAPSIGN_REQUESTS.inc(method, endpoint, str(status))
+    ZAPSIGN_DURATION.observe(seconds, method, endpoint)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add_zapsign_call(seconds)
+
+
+def record_request(view: str, method: str, status: int, stats: RequestStats, seconds: float) -> None:
+    REQUEST_DURATION.observe(seconds, view, method, str(status))
+    REQUEST_DB_QUERIES.observe(stats.db_queries, view)
+    REQUEST_DB_DURATION.observe(stats.db_seconds, view)
@@ -0,0 +1,65 @@
+"""
+Middlewares da API
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .config import AppConfig
+from .metrics import finish_request, record_request, start_request
+
+
+class MetricsMiddleware:
+    """
+    Mede a latência, as consultas SQL e as chamadas ao ZapSign de cada requisição
+    (histogramas por view em /metrics) e adiciona o header Server-Timing.
+
+    Síncrono e assíncrono: sob ASGI com views assíncronas a requisição segue no
+    event loop, sem passar por um adaptador de thread.
+    Em respostas em streaming a latência vai até o início do envio do corpo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not AppConfig.METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request(token)
+        return self._record(request, response, stats)
+
+    async def __acall__(self, request):
+        if not AppConfig.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        stats, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request(token)
+        return self._record(request, response, stats)
+
+    @staticmethod
+    def _record(request, response, stats):
+        elapsed = time.perf_counter() - stats.started
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match is not None else 'unmatched'
+        record_request(view, request.method, response.status_code, stats, elapsed)
+
+        if AppConfig.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = stats.server_timing(elapsed)
+            # Permite ao navegador (DevTools do Angular) ler o header em chamadas cross-origin
+            response['Timing-Allow-Origin'] = '*'
+        return response
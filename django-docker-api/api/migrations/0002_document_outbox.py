@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(db_column='status', max_length=50)),
+                ('payload', models.JSONField(db_column='payload')),
+                ('api_result', models.JSONField(db_column='api_result', null=True)),
+                ('error', models.TextField(db_column='error', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('last_updated_at', models.DateTimeField(auto_now=True, db_column='last_updated_at')),
+                ('documentID', models.ForeignKey(db_column='documentID', null=True, on_delete=django.db.models.deletion.SET_NULL, to='api.documento')),
+            ],
+            options={
+                'verbose_name': 'Document outbox entry',
+                'verbose_name_plural': 'Document outbox entries',
+                'db_table': 'document_outbox',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='document_outbox_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:33
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0002_document_outbox'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='documento',
+            index=models.Index(fields=['last_updated_at', 'id'], name='document_last_updated_idx'),
+        ),
+    ]
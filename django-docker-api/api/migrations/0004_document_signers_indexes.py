@@ -0,0 +1,111 @@
+"""
+Índices para os padrões de acesso de document e signers
+
+Os índices são criados com CREATE INDEX CONCURRENTLY, sem bloquear escritas na
+tabela em produção; por isso a migração não é atômica. As restrições de
+unicidade de token são criadas a partir de um índice único concorrente
+(ALTER TABLE ... ADD CONSTRAINT ... USING INDEX), que só precisa de um bloqueio
+curto.
+
+Tokens duplicados impedem a restrição: a migração para antes de criar o índice e
+lista exemplos. Remova ou corrija as linhas repetidas (ex.: mantendo a de menor
+id de cada token) e rode a migração novamente. Um índice INVALID deixado por uma
+criação concorrente interrompida é removido (DROP INDEX CONCURRENTLY) antes da
+nova tentativa, e uma restrição já existente não é recriada.
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+DUPLICATE_EXAMPLES = 5
+
+
+class DuplicateTokensError(Exception):
+    """Tokens repetidos impedem a criação da restrição de unicidade"""
+
+
+def create_unique_constraint(schema_editor, table, column, name):
+    """Cria a restrição de unicidade a partir de um índice único concorrente (idempotente)"""
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_constraint WHERE conname = %s AND conrelid = %s::regclass', [name, table]
+        )
+        if cursor.fetchone():
+            return
+
+        cursor.execute(
+            f'SELECT {quote(column)}, COUNT(*) FROM {quote(table)} GROUP BY {quote(column)} '
+            f'HAVING COUNT(*) > 1 ORDER BY COUNT(*) DESC LIMIT {DUPLICATE_EXAMPLES}'
+        )
+        duplicates = cursor.fetchall()
+        if duplicates:
+            examples = ', '.join(f'{value!r} ({count}x)' for value, count in duplicates)
+            raise DuplicateTokensError(
+                f'{table}.{column} tem valores repetidos (ex.: {examples}); remova as duplicatas '
+                f'antes de criar {name} e rode a migração novamente'
+            )
+
+        cursor.execute(
+            'SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)', [name]
+        )
+        leftover = cursor.fetchone()
+        if leftover and leftover[0]:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}')
+
+        cursor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} ON {quote(table)} ({quote(column)})'
+        )
+        cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} UNIQUE USING INDEX {quote(name)}')
+
+
+def unique_constraint_concurrently(model_name, table, field, column, name):
+    def forwards(apps, schema_editor):
+        create_unique_constraint(schema_editor, table, column, name)
+
+    def backwards(apps, schema_editor):
+        schema_editor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{name}"')
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[
+            migrations.AddConstraint(
+                model_name=model_name,
+                constraint=models.UniqueConstraint(fields=[field], name=name),
+            ),
+        ],
+        database_operations=[
+            migrations.RunPython(forwards, backwards),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0003_document_last_updated_index'),
+    ]
+
+    operations = [
+        unique_constraint_concurrently('documento', 'document', 'token', 'token', 'document_token_uniq'),
+        AddIndexConcurrently(
+            model_name='documento',
+            index=models.Index(fields=['-created_at', '-id'], name='document_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='documento',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='document_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='documento',
+            index=models.Index(
+                fields=['company_id', 'status', '-created_at', '-id'],
+                name='document_company_status_idx'
+            ),
+        ),
+        unique_constraint_concurrently('signatario', 'signers', 'token', 'token', 'signers_token_uniq'),
+        AddIndexConcurrently(
+            model_name='signatario',
+            index=models.Index(fields=['email'], name='signers_email_idx'),
+        ),
+    ]
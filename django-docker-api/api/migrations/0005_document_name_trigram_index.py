@@ -0,0 +1,43 @@
+"""
+Índice trigram para a busca por trecho do nome na listagem de documentos
+
+Requer a extensão pg_trgm (confiável a partir do PostgreSQL 13: o dono do banco
+pode criá-la sem superusuário). O índice é criado com CREATE INDEX CONCURRENTLY,
+por isso a migração não é atômica. O SQL é escrito à mão porque o Django envolve
+a expressão e a classe de operadores nos mesmos parênteses, o que o PostgreSQL
+recusa; a expressão é a mesma gerada por name__icontains (UPPER("name"::text)).
+"""
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0004_document_signers_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='documento',
+                    index=GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='document_name_trgm_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        'CREATE INDEX CONCURRENTLY IF NOT EXISTS "document_name_trgm_idx" '
+                        'ON "document" USING gin ((UPPER("name"::text)) gin_trgm_ops)'
+                    ),
+                    reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "document_name_trgm_idx"',
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_document_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(db_column='scope', max_length=100)),
+                ('key', models.CharField(db_column='key', max_length=255)),
+                ('request_hash', models.CharField(db_column='request_hash', max_length=64)),
+                ('status', models.CharField(db_column='status', max_length=50)),
+                ('response_status', models.IntegerField(db_column='response_status', null=True)),
+                ('response_content_type', models.CharField(db_column='response_content_type', max_length=255, null=True)),
+                ('response_body', models.BinaryField(db_column='response_body', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('expires_at', models.DateTimeField(db_column='expires_at')),
+            ],
+            options={
+                'verbose_name': 'Idempotency key',
+                'verbose_name_plural': 'Idempotency keys',
+                'db_table': 'idempotency_key',
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_key_expires_idx')],
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='idempotency_key_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookStatusUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(db_column='kind', max_length=20)),
+                ('token', models.CharField(db_column='token', max_length=255)),
+                ('status', models.CharField(db_column='status', max_length=50)),
+                ('event_at', models.DateTimeField(db_column='event_at')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+            ],
+            options={
+                'verbose_name': 'Webhook status update',
+                'verbose_name_plural': 'Webhook status updates',
+                'db_table': 'webhook_status_update',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_webhook_status_update'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='status_event_at',
+            field=models.DateTimeField(db_column='status_event_at', null=True),
+        ),
+        migrations.AddField(
+            model_name='signatario',
+            name='status_event_at',
+            field=models.DateTimeField(db_column='status_event_at', null=True),
+        ),
+    ]
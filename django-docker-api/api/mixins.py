@@ -5,6 +5,10 @@ from django.shortcuts import get_object_or_404
 from typing import Dict, Any, Type
 from django.db import models
 from rest_framework import serializers
+from .pagination import DocumentoCursorPagination, InvalidCursorException
+from .streaming import InvalidStreamFormatException, get_stream_format, streaming_response
+from .constants import ERROR_CODES
+from .services import ZapSignAPIException, ZapSignUnavailableException
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,10 +33,13 @@ class BaseViewMixin:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
     @staticmethod
-    def get_object_or_404_response(model: Type[models.Model], pk: Any) -> tuple:
+    def get_object_or_404_response(model: Type[models.Model], pk: Any,
+                                   queryset: models.QuerySet = None) -> tuple:
         """Busca objeto ou retorna resposta 404"""
+        if queryset is None:
+            queryset = model.objects.all()
         try:
-            obj = model.objects.get(pk=pk)
+            obj = queryset.get(pk=pk)
             return obj, None
         except model.DoesNotExist:
             error_message = f'{model.__name__} não encontrado'
@@ -45,6 +52,38 @@ class BaseViewMixin:
         serializer = serializer_class(obj, many=many)
         return Response(serializer.data, status=status_code)
     
+    @staticmethod
+    def paginate_and_respond(request, queryset, serializer_class: Type[serializers.Serializer],
+                             paginator_class=DocumentoCursorPagination) -> Response:
+        """Pagina o queryset por cursor, serializa a página e retorna resposta"""
+        paginator = paginator_class()
+        try:
+            page = paginator.paginate_queryset(queryset, request)
+        except InvalidCursorException as e:
+            return APIResponseHandler.error_response(
+                error_message=e.message,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_code=ERROR_CODES['VALIDATION_ERROR']
+            )
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    @staticmethod
+    def list_and_respond(request, queryset, serializer_class: Type[serializers.Serializer]):
+        """Responde em streaming quando solicitado, senão com a página do cursor"""
+        try:
+            stream_format = get_stream_format(request)
+        except InvalidStreamFormatException as e:
+            return APIResponseHandler.error_response(
+                error_message=e.message,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error_code=ERROR_CODES['VALIDATION_ERROR']
+            )
+        if stream_format:
+            queryset = queryset.order_by('-created_at', '-id')
+            return streaming_response(queryset, serializer_class, stream_format)
+        return BaseViewMixin.paginate_and_respond(request, queryset, serializer_class)
+    
     @staticmethod
     def validate_required_fields(data: Dict[str, Any], required_fields: list) -> Response:
         """Valida se campos obrigatórios estão presentes"""
@@ -79,6 +118,23 @@ class APIResponseHandler:
             response_data["error_code"] = error_code
         return Response(response_data, status=status_code)
     
+    @staticmethod
+    def zapsign_error_response(exception: ZapSignAPIException):
+        """Resposta para erros da API ZapSign; 503 rápido quando o circuito está aberto"""
+        if isinstance(exception, ZapSignUnavailableException):
+            response = APIResponseHandler.error_response(
+                error_message=exception.message,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                error_code=ERROR_CODES['ZAPSIGN_UNAVAILABLE']
+            )
+            response['Retry-After'] = str(max(1, round(exception.retry_after)))
+            return response
+        return APIResponseHandler.error_response(
+            error_message=exception.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
+        )
+    
     @staticmethod
     def not_found_response(resource_name="Recurso"):
         """Resposta 404 padronizada"""
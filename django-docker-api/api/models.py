@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class Empresa(models.Model):
@@ -30,6 +32,14 @@ class Empresa(models.Model):
         verbose_name_plural = 'Companies'
 
 
+class DocumentoQuerySet(models.QuerySet):
+    """QuerySet com carregamentos otimizados para documentos"""
+
+    def with_signers(self):
+        """Carrega empresa e signatários em lote, evitando N+1 consultas"""
+        return self.select_related('company_id').prefetch_related('signatario_set')
+
+
 class Documento(models.Model):
     openID = models.IntegerField(
         null=False,
@@ -73,12 +83,37 @@ class Documento(models.Model):
         null=True,
         db_column='externalID',
     )
+    # Momento do último evento de status aplicado (webhooks/sincronização com o ZapSign)
+    status_event_at = models.DateTimeField(
+        null=True,
+        db_column='status_event_at',
+    )
+
+    objects = DocumentoQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
     class Meta:
         db_table = 'document'
+        indexes = [
+            # Permite index-only scan na agregação de ETag/Last-Modified (api/conditional.py)
+            models.Index(fields=['last_updated_at', 'id'], name='document_last_updated_idx'),
+            # Paginação por cursor da listagem: ORDER BY created_at DESC, id DESC
+            models.Index(fields=['-created_at', '-id'], name='document_created_idx'),
+            # Filtros por status e empresa, mantendo a ordenação da listagem
+            models.Index(fields=['status', '-created_at', '-id'], name='document_status_created_idx'),
+            models.Index(
+                fields=['company_id', 'status', '-created_at', '-id'],
+                name='document_company_status_idx'
+            ),
+            # Busca por trecho do nome (name__icontains gera UPPER(name) LIKE ...)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='document_name_trgm_idx'),
+        ]
+        constraints = [
+            # Busca por token nos callbacks do ZapSign
+            models.UniqueConstraint(fields=['token'], name='document_token_uniq'),
+        ]
         verbose_name = 'Document'
         verbose_name_plural = 'Documents'
 
@@ -114,11 +149,162 @@ class Signatario(models.Model):
         on_delete=models.CASCADE,
         db_column='documentID',
     )
+    # Momento do último evento de status aplicado (webhooks/sincronização com o ZapSign)
+    status_event_at = models.DateTimeField(
+        null=True,
+        db_column='status_event_at',
+    )
 
     def __str__(self):
         return self.name
 
     class Meta:
         db_table = 'signers'
+        indexes = [
+            models.Index(fields=['email'], name='signers_email_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['token'], name='signers_token_uniq'),
+        ]
         verbose_name = 'Signer'
         verbose_name_plural = 'Signers'
+
+
+class DocumentoOutbox(models.Model):
+    """Intenção de criação de documento, registrada antes da chamada ao ZapSign"""
+    status = models.CharField(
+        max_length=50,
+        null=False,
+        db_column='status',
+    )
+    payload = models.JSONField(
+        null=False,
+        db_column='payload',
+    )
+    api_result = models.JSONField(
+        null=True,
+        db_column='api_result',
+    )
+    error = models.TextField(
+        null=True,
+        db_column='error',
+    )
+    documentID = models.ForeignKey(
+        Documento,
+        null=True,
+        on_delete=models.SET_NULL,
+        db_column='documentID',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_column='created_at',
+    )
+    last_updated_at = models.DateTimeField(
+        auto_now=True,
+        db_column='last_updated_at',
+    )
+
+    def __str__(self):
+        return f'{self.pk} ({self.status})'
+
+    class Meta:
+        db_table = 'document_outbox'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='document_outbox_status_idx'),
+        ]
+        verbose_name = 'Document outbox entry'
+        verbose_name_plural = 'Document outbox entries'
+
+
+class WebhookStatusUpdate(models.Model):
+    """Atualização de status recebida por webhook, gravada antes da resposta e ainda não aplicada"""
+    kind = models.CharField(
+        max_length=20,
+        null=False,
+        db_column='kind',
+    )
+    token = models.CharField(
+        max_length=255,
+        null=False,
+        db_column='token',
+    )
+    status = models.CharField(
+        max_length=50,
+        null=False,
+        db_column='status',
+    )
+    event_at = models.DateTimeField(
+        null=False,
+        db_column='event_at',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_column='created_at',
+    )
+
+    def __str__(self):
+        return f'{self.kind}:{self.token} ({self.status})'
+
+    class Meta:
+        db_table = 'webhook_status_update'
+        verbose_name = 'Webhook status update'
+        verbose_name_plural = 'Webhook status updates'
+
+
+class IdempotencyKey(models.Model):
+    """Resultado de uma requisição com Idempotency-Key, devolvido nas repetições"""
+    scope = models.CharField(
+        max_length=100,
+        null=False,
+        db_column='scope',
+    )
+    key = models.CharField(
+        max_length=255,
+        null=False,
+        db_column='key',
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        null=False,
+        db_column='request_hash',
+    )
+    status = models.CharField(
+        max_length=50,
+        null=False,
+        db_column='status',
+    )
+    response_status = models.IntegerField(
+        null=True,
+        db_column='response_status',
+    )
+    response_content_type = models.CharField(
+        max_length=255,
+        null=True,
+        db_column='response_content_type',
+    )
+    response_body = models.BinaryField(
+        null=True,
+        db_column='response_body',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_column='created_at',
+    )
+    expires_at = models.DateTimeField(
+        null=False,
+        db_column='expires_at',
+    )
+
+    def __str__(self):
+        return f'{self.scope}:{self.key} ({self.status})'
+
+    class Meta:
+        db_table = 'idempotency_key'
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_key_expires_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_key_uniq'),
+        ]
+        verbose_name = 'Idempotency key'
+        verbose_name_plural = 'Idempotency keys'
@@ -0,0 +1,140 @@
+"""
+Paginação por cursor (keyset) para listagens de documentos
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .config import AppConfig
+
+
+class InvalidCursorException(Exception):
+    """Exceção para cursores de paginação inválidos"""
+    def __init__(self, message: str = "Cursor de paginação inválido"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class DocumentoCursorPagination(BasePagination):
+    """
+    Paginação keyset ordenada por (created_at, id), do mais recente ao mais antigo.
+
+    Cada página é buscada com um filtro de faixa sobre a chave de ordenação, em vez
+    de OFFSET, então o custo por página não cresce com a profundidade da navegação.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('created_at', 'id')
+
+    def __init__(self):
+        pagination_config = AppConfig.get_pagination_config()
+        self.page_size = pagination_config['page_size']
+        self.max_page_size = pagination_config['max_page_size']
+        self.base_url = None
+        self.page = []
+        self.has_next = False
+        self.has_previous = False
+
+    def get_page_size(self, request) -> int:
+        """Retorna o tamanho de página solicitado, limitado ao máximo configurado"""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request) -> Optional[Dict[str, Any]]:
+        """Decodifica o cursor opaco recebido na query string"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(encoded + padding).decode('ascii'))
+            created_at = parse_datetime(data['c'])
+            if created_at is None:
+                raise ValueError(data['c'])
+            return {'created_at': created_at, 'id': int(data['i']), 'reverse': bool(data['r'])}
+        except (KeyError, TypeError, ValueError, UnicodeDecodeError):
+            raise InvalidCursorException()
+
+    def encode_cursor(self, item, reverse: bool) -> str:
+        """Gera a URL da página a partir da posição de um item"""
+        created_at, pk = (self._get_value(item, field) for field in self.ordering)
+        payload = json.dumps(
+            {'c': created_at.isoformat(), 'i': pk, 'r': int(reverse)},
+            separators=(',', ':')
+        )
+        encoded = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @staticmethod
+    def _get_value(item, field: str):
+        if isinstance(item, dict):
+            return item[field]
+        return getattr(item, field)
+
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        """Retorna os itens da página atual"""
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            queryset = queryset.order_by('-created_at', '-id')
+            reverse = False
+        elif cursor['reverse']:
+            # Página anterior: percorre a chave em ordem crescente e inverte o resultado
+            queryset = queryset.filter(created_at__gte=cursor['created_at']).filter(
+                Q(created_at__gt=cursor['created_at']) | Q(id__gt=cursor['id'])
+            ).order_by('created_at', 'id')
+            reverse = True
+        else:
+            queryset = queryset.filter(created_at__lte=cursor['created_at']).filter(
+                Q(created_at__lt=cursor['created_at']) | Q(id__lt=cursor['id'])
+            ).order_by('-created_at', '-id')
+            reverse = False
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,31 @@
+"""
+Parsers personalizados da API
+"""
+from io import BytesIO
+
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson, use_orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser com orjson; sem orjson (ou com JSON_BACKEND=json) usa a stdlib.
+
+    Corpos que o orjson recusa são lidos novamente pela stdlib, que mantém as
+    mensagens de erro e a semântica do parser padrão do DRF. O orjson converte
+    inteiros acima de 64 bits em float.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        # O orjson só lê UTF-8 (o DEFAULT_CHARSET do Django)
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if not use_orjson() or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
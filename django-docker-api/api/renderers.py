@@ -0,0 +1,88 @@
+"""
+Renderers personalizados da API
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+JSON_BACKENDS = ('orjson', 'json')
+
+# Datas passam pelo JSONEncoder do DRF (milissegundos e sufixo Z), como na stdlib;
+# chaves não textuais são convertidas em texto, como faz json.dumps
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+_drf_encoder = JSONEncoder()
+
+
+def use_orjson() -> bool:
+    """Indica se o orjson está instalado e selecionado em settings.JSON_BACKEND"""
+    return orjson is not None and getattr(settings, 'JSON_BACKEND', 'orjson') == 'orjson'
+
+
+def _escape_line_separators(content: bytes) -> bytes:
+    # Mesmo escape do JSONRenderer do DRF: a saída continua um subconjunto de JavaScript
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+    return content
+
+
+def dumps(data) -> bytes:
+    """
+    Serializa em JSON compacto (UTF-8, sem escapes ASCII) como o JSONRenderer do
+    DRF; usa orjson quando disponível.
+
+    Diferenças conhecidas do orjson, todas JSON válido: floats com expoente saem
+    sem sinal (1e16 em vez de 1e+16) e NaN e infinito viram null em vez de erro.
+    Inteiros acima de 64 bits, que o orjson recusa, caem na stdlib.
+    """
+    if use_orjson():
+        try:
+            return _escape_line_separators(
+                orjson.dumps(data, default=_drf_encoder.default, option=_ORJSON_OPTIONS)
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer com orjson, com a saída do renderer padrão do DRF (ver dumps).
+
+    Respostas com indentação (Accept: application/json; indent=4 ou a API
+    navegável) e ambientes sem orjson usam o renderer da stdlib.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (not use_orjson() or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Renderer para JSON delimitado por linhas (NDJSON).
+
+    Permite negociar o modo streaming via header Accept: application/x-ndjson.
+    Respostas comuns (ex.: erros) são renderizadas como uma única linha.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rendered = super().render(data, accepted_media_type, renderer_context)
+        return rendered + b'\n' if rendered else rendered
+
+
+# Renderers das listagens: os padrões do DRF mais a negociação de NDJSON
+LIST_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
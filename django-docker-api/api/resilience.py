@@ -0,0 +1,168 @@
+"""
+Padrões de resiliência para chamadas externas: retry com backoff, circuit breaker
+e limitação de taxa
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from .constants import CIRCUIT_STATE
+
+
+class CircuitOpenError(Exception):
+    """Exceção levantada quando o circuito está aberto e a chamada é recusada"""
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"Circuito aberto; nova tentativa em {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por taxa de erro em uma janela deslizante das últimas chamadas.
+
+    Fechado: chamadas passam e os resultados entram na janela. Quando a taxa de
+    falhas atinge failure_rate_threshold (com pelo menos minimum_calls na janela),
+    o circuito abre e recusa chamadas por open_seconds. Depois disso fica
+    semiaberto e libera half_open_max_calls chamadas de teste: sucesso fecha o
+    circuito, falha o abre novamente. Uma chamada de teste que termina sem
+    resultado (cancelada ou com erro inesperado) devolve a vaga com release_probe().
+    """
+
+    def __init__(self, failure_rate_threshold: float = 0.5, minimum_calls: int = 10,
+                 window_size: int = 20, open_seconds: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=window_size)
+        self._state = CIRCUIT_STATE['CLOSED']
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        if (self._state == CIRCUIT_STATE['OPEN']
+                and self._clock() - self._opened_at >= self.open_seconds):
+            self._state = CIRCUIT_STATE['HALF_OPEN']
+            self._half_open_calls = 0
+
+    def _retry_after(self) -> float:
+        return max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+
+    def _open(self) -> None:
+        self._state = CIRCUIT_STATE['OPEN']
+        self._opened_at = self._clock()
+        self._half_open_calls = 0
+
+    def _failure_rate(self) -> float:
+        if not self._window:
+            return 0.0
+        return self._window.count(False) / len(self._window)
+
+    def before_call(self) -> None:
+        """Reserva a chamada ou levanta CircuitOpenError se o circuito recusar"""
+        with self._lock:
+            self._refresh_state()
+            if self._state == CIRCUIT_STATE['OPEN']:
+                raise CircuitOpenError(self._retry_after())
+            if self._state == CIRCUIT_STATE['HALF_OPEN']:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(0.0)
+                self._half_open_calls += 1
+
+    def release_probe(self) -> None:
+        """Libera a vaga reservada por before_call sem registrar resultado"""
+        with self._lock:
+            if self._state == CIRCUIT_STATE['HALF_OPEN'] and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == CIRCUIT_STATE['HALF_OPEN']:
+                self._state = CIRCUIT_STATE['CLOSED']
+                self._window.clear()
+            self._window.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == CIRCUIT_STATE['HALF_OPEN']:
+                self._open()
+                return
+            self._window.append(False)
+            if (self._state == CIRCUIT_STATE['CLOSED']
+                    and len(self._window) >= self.minimum_calls
+                    and self._failure_rate() >= self.failure_rate_threshold):
+                self._open()
+
+    def reset(self) -> None:
+        """Fecha o circuito e limpa a janela"""
+        with self._lock:
+            self._state = CIRCUIT_STATE['CLOSED']
+            self._window.clear()
+            self._opened_at = None
+            self._half_open_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna o estado atual para exposição na API"""
+        with self._lock:
+            self._refresh_state()
+            return {
+                'state': self._state,
+                'failure_rate': round(self._failure_rate(), 4),
+                'calls_in_window': len(self._window),
+                'failure_rate_threshold': self.failure_rate_threshold,
+                'minimum_calls': self.minimum_calls,
+                'retry_after_seconds': (
+                    round(self._retry_after(), 3) if self._state == CIRCUIT_STATE['OPEN'] else 0.0
+                ),
+            }
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Backoff exponencial com jitter completo: uniforme em [0, min(máximo, base * 2^tentativa)]"""
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe: libera até `rate` chamadas por segundo, com rajadas
+    de até `burst` chamadas. acquire() bloqueia até haver uma ficha disponível.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate deve ser positivo")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
@@ -1,7 +1,20 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from rest_framework import serializers
 from .models import Empresa, Documento, Signatario
 
 
+class DynamicFieldsMixin:
+    """Permite restringir os campos serializados com o argumento fields"""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
 class EmpresaSerializer(serializers.ModelSerializer):
     class Meta:
         model = Empresa
@@ -20,7 +33,7 @@ class DocumentoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class DocumentoWithSignersSerializer(serializers.ModelSerializer):
+class DocumentoWithSignersSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     signers = serializers.SerializerMethodField()
 
     class Meta:
@@ -28,7 +41,8 @@ class DocumentoWithSignersSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_signers(self, obj):
-        signatarios = Signatario.objects.filter(documentID=obj)
+        # Usa o cache de prefetch_related quando disponível (Documento.objects.with_signers())
+        signatarios = obj.signatario_set.all()
         return SignatarioSerializer(signatarios, many=True).data
 
 
@@ -36,3 +50,82 @@ class DocumentoUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Documento
         fields = ['name']
+
+
+# Campos cuja representação é o próprio valor retornado por values()
+_PASSTHROUGH_REPRESENTATIONS = (
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+)
+
+
+@lru_cache(maxsize=128)
+def _values_converters(serializer_class, fields: Optional[Tuple[str, ...]] = None) -> tuple:
+    """
+    Resolve uma única vez (nome, conversor) dos campos de um ModelSerializer, na
+    ordem da saída. O conversor é o to_representation do próprio campo, ou None
+    quando o valor da linha já é a representação (textos, inteiros, chaves
+    estrangeiras e campos calculados preenchidos antes da conversão).
+    """
+    converters = []
+    for name, field in serializer_class().fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if (isinstance(field, (serializers.RelatedField, serializers.SerializerMethodField))
+                or type(field).to_representation in _PASSTHROUGH_REPRESENTATIONS):
+            converters.append((name, None))
+        else:
+            converters.append((name, field.to_representation))
+    return tuple(converters)
+
+
+def _represent(row, converters) -> dict:
+    item = {}
+    for name, convert in converters:
+        value = row[name]
+        item[name] = value if convert is None or value is None else convert(value)
+    return item
+
+
+class DocumentoValuesSerializer:
+    """
+    Serializador somente leitura das listagens de documentos a partir de linhas de
+    values(). Produz a mesma saída de DocumentoWithSignersSerializer sem instanciar
+    modelos nem percorrer os campos do ModelSerializer a cada item; os signatários
+    da página são buscados em uma única consulta.
+    """
+
+    def __init__(self, instance, many: bool = True, fields: Optional[Tuple[str, ...]] = None):
+        self.instance = instance
+        self.fields = tuple(fields) if fields is not None else None
+
+    @classmethod
+    def values_fields(cls, fields: Optional[Tuple[str, ...]] = None) -> list:
+        """Colunas a carregar com values() para os campos informados"""
+        return [
+            name for name, _ in _values_converters(DocumentoWithSignersSerializer, fields)
+            if name != 'signers'
+        ]
+
+    @property
+    def data(self) -> list:
+        rows = list(self.instance)
+        converters = _values_converters(DocumentoWithSignersSerializer, self.fields)
+        if any(name == 'signers' for name, _ in converters):
+            signers = self._signers_by_document([row['id'] for row in rows])
+            for row in rows:
+                row['signers'] = signers.get(row['id'], [])
+        return [_represent(row, converters) for row in rows]
+
+    @staticmethod
+    def _signers_by_document(document_ids) -> dict:
+        if not document_ids:
+            return {}
+        converters = _values_converters(SignatarioSerializer)
+        signers = {}
+        rows = Signatario.objects.filter(documentID__in=document_ids).values(
+            *(name for name, _ in converters)
+        )
+        for row in rows:
+            signers.setdefault(row['documentID'], []).append(_represent(row, converters))
+        return signers
@@ -1,9 +1,42 @@
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+import httpx
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Value, When
 from rest_framework import status
 from rest_framework.response import Response
+from .cache import invalidate_documentos
 from .config import AppConfig
-from .constants import DEFAULT_VALUES
+from .idempotency import mark_remote_attempt
+from .metrics import record_zapsign_call
+from .resilience import CircuitBreaker, CircuitOpenError, RateLimiter, backoff_delay
+from .constants import (
+    DEFAULT_VALUES,
+    DOCUMENT_CREATE_REQUIRED_FIELDS,
+    DOCUMENT_FINAL_STATUSES,
+    ERROR_CODES,
+    OUTBOX_STATUS,
+    SIGNER_FINAL_STATUSES,
+)
+from .models import Documento, DocumentoOutbox, Empresa, Signatario
+from .serializers import DocumentoSerializer, DocumentoUpdateSerializer, SignatarioSerializer
+from .webhooks import parse_events
+from datetime import timedelta
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Linhas por UPDATE ... CASE nas atualizações de status em lote
+STATUS_UPDATE_CHUNK_SIZE = 500
 
 
 class ZapSignAPIException(Exception):
@@ -15,15 +48,116 @@ class ZapSignAPIException(Exception):
         super().__init__(self.message)
 
 
-class ZapSignService:
-    """Service para interações com a API ZapSign"""
+class ZapSignUnavailableException(ZapSignAPIException):
+    """Exceção para chamadas recusadas pelo circuit breaker (ZapSign indisponível)"""
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            message="API ZapSign indisponível no momento; tente novamente mais tarde",
+            status_code=503
+        )
+
+
+# Métodos seguros para repetir automaticamente em caso de falha
+IDEMPOTENT_METHODS = {'GET', 'PUT', 'DELETE'}
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Retorna o circuit breaker das chamadas ao ZapSign, compartilhado pelo processo"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _circuit_breaker_lock:
+            if _circuit_breaker is None:
+                config_data = AppConfig.get_resilience_config()
+                _circuit_breaker = CircuitBreaker(
+                    failure_rate_threshold=config_data['failure_rate_threshold'],
+                    minimum_calls=config_data['minimum_calls'],
+                    window_size=config_data['window_size'],
+                    open_seconds=config_data['open_seconds']
+                )
+    return _circuit_breaker
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def build_http_session(pool_size: int) -> requests.Session:
+    """Cria uma sessão HTTP com pool de até pool_size conexões keep-alive por host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada pelo processo.
+
+    A sessão mantém um pool de conexões keep-alive com o ZapSign, evitando um novo
+    handshake TCP+TLS a cada chamada. O pool do urllib3 é thread-safe.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = build_http_session(AppConfig.get_zapsign_config()['pool_size'])
+    return _http_session
+
+
+def reset_http_session() -> None:
+    """Fecha a sessão HTTP compartilhada; a próxima chamada cria um novo pool"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+
+
+class BaseZapSignService:
+    """Base comum aos clientes síncrono e assíncrono da API ZapSign"""
     
-    def __init__(self):
+    def __init__(self, circuit_breaker: Optional[CircuitBreaker] = None):
         config_data = AppConfig.get_zapsign_config()
         self.api_token = config_data['token']
         self.base_url = config_data['base_url']
-        self.timeout = config_data['timeout']
         self.headers = self._get_headers()
+        self.resilience = AppConfig.get_resilience_config()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+    
+    def _max_attempts(self, method: str) -> int:
+        """POST não é repetido: poderia criar documentos ou signatários duplicados"""
+        if method in IDEMPOTENT_METHODS:
+            return 1 + self.resilience['max_retries']
+        return 1
+    
+    def _backoff(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.resilience['backoff_base'], self.resilience['backoff_max'])
+    
+    @staticmethod
+    def _is_server_failure(status_code: int) -> bool:
+        """Respostas que indicam falha do ZapSign (e não erro do pedido)"""
+        return status_code == 429 or status_code >= 500
+    
+    def _reserve_call(self) -> None:
+        try:
+            self.circuit_breaker.before_call()
+        except CircuitOpenError as e:
+            raise ZapSignUnavailableException(e.retry_after)
+        # A partir daqui a chamada pode ter efeito no ZapSign mesmo sem resposta
+        mark_remote_attempt()
+    
+    def _record_response(self, response) -> bool:
+        """Registra o resultado no circuit breaker; retorna True se a resposta é falha do servidor"""
+        if self._is_server_failure(response.status_code):
+            self.circuit_breaker.record_failure()
+            return True
+        self.circuit_breaker.record_success()
+        return False
     
     def _get_headers(self) -> Dict[str, str]:
         """Retorna os headers necessários para autenticação na API ZapSign"""
@@ -32,7 +166,7 @@ class ZapSignService:
             'Content-Type': 'application/json'
         }
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
+    def _handle_response(self, response) -> Dict[str, Any]:
         """Processa a resposta da API e levanta exceção se necessário"""
         if response.status_code != 200:
             raise ZapSignAPIException(
@@ -42,9 +176,17 @@ class ZapSignService:
             )
         return response.json()
     
-    def create_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Cria um documento na API ZapSign"""
-        payload = {
+    def _handle_delete_response(self, response) -> None:
+        """Processa a resposta da exclusão e levanta exceção se necessário"""
+        if response.status_code != 200:
+            raise ZapSignAPIException(
+                message=f"Erro ao deletar documento: {response.text}",
+                status_code=response.status_code
+            )
+    
+    @staticmethod
+    def _create_document_payload(document_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "name": document_data.get("name"),
             "url_pdf": document_data.get("url_documento"),
             "signers": [
@@ -54,67 +196,233 @@ class ZapSignService:
                 }
             ],
         }
+    
+    @staticmethod
+    def _update_document_payload(document_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": document_data.get("name"),
+        }
+    
+    @staticmethod
+    def _add_signer_payload(signer_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": signer_data.get("name"),
+            "email": signer_data.get("email"),
+        }
+
+
+class ZapSignService(BaseZapSignService):
+    """Service para interações com a API ZapSign"""
+    
+    def __init__(self, session: Optional[requests.Session] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        super().__init__(circuit_breaker)
+        config_data = AppConfig.get_zapsign_config()
+        self.timeout = (config_data['connect_timeout'], config_data['read_timeout'])
+        self.session = session or get_http_session()
+    
+    def _request(self, method: str, path: str, payload: Dict[str, Any] = None) -> requests.Response:
+        """Executa a requisição pela sessão com pool, circuit breaker e retry idempotente"""
+        max_attempts = self._max_attempts(method)
+        for attempt in range(max_attempts):
+            self._reserve_call()
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method,
+                    f'{self.base_url}{path}',
+                    json=payload,
+                    headers=self.headers,
+                    timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                record_zapsign_call(method, path, 'error', time.perf_counter() - started)
+                self.circuit_breaker.record_failure()
+                if attempt + 1 >= max_attempts:
+                    raise ZapSignAPIException(f"Falha de comunicação com a API ZapSign: {e}")
+            except BaseException:
+                # Cancelamento (cliente desconectou) ou erro inesperado: sem resultado,
+                # devolve a vaga de teste para o circuito semiaberto não ficar preso
+                self.circuit_breaker.release_probe()
+                raise
+            else:
+                record_zapsign_call(method, path, response.status_code, time.perf_counter() - started)
+                if not self._record_response(response) or attempt + 1 >= max_attempts:
+                    return response
+            time.sleep(self._backoff(attempt))
+    
+    def get_document(self, token: str) -> Dict[str, Any]:
+        """Busca o estado atual de um documento (e seus signatários) na API ZapSign"""
+        response = self._request('GET', f'/docs/{token}/')
         
-        response = requests.post(
-            f'{self.base_url}/docs/',
-            json=payload,
-            headers=self.headers,
-            timeout=self.timeout
-        )
+        return self._handle_response(response)
+    
+    def create_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria um documento na API ZapSign"""
+        payload = self._create_document_payload(document_data)
+        
+        response = self._request('POST', '/docs/', payload)
         
         return self._handle_response(response)
     
     def update_document(self, token: str, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """Atualiza um documento na API ZapSign"""
-        payload = {
-            "name": document_data.get("name"),
-        }
+        payload = self._update_document_payload(document_data)
         
-        response = requests.put(
-            f'{self.base_url}/docs/{token}/',
-            json=payload,
-            headers=self.headers,
-            timeout=self.timeout
-        )
+        response = self._request('PUT', f'/docs/{token}/', payload)
         
         return self._handle_response(response)
     
     def delete_document(self, token: str) -> None:
         """Deleta um documento na API ZapSign"""
-        response = requests.delete(
-            f'{self.base_url}/docs/{token}/',
-            headers=self.headers,
-            timeout=self.timeout
-        )
+        response = self._request('DELETE', f'/docs/{token}/')
         
-        if response.status_code != 200:
-            raise ZapSignAPIException(
-                message=f"Erro ao deletar documento: {response.text}",
-                status_code=response.status_code
-            )
+        self._handle_delete_response(response)
     
     def add_signer(self, document_token: str, signer_data: Dict[str, Any]) -> Dict[str, Any]:
         """Adiciona um signatário a um documento"""
-        payload = {
-            "name": signer_data.get("name"),
-            "email": signer_data.get("email"),
-        }
+        payload = self._add_signer_payload(signer_data)
         
-        response = requests.post(
-            f'{self.base_url}/docs/{document_token}/add-signer/',
-            json=payload,
-            headers=self.headers,
-            timeout=self.timeout
+        response = self._request('POST', f'/docs/{document_token}/add-signer/', payload)
+        
+        return self._handle_response(response)
+
+
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP assíncrono do event loop atual.
+
+    Conexões do httpx ficam presas ao loop em que foram abertas, então cada loop
+    (normalmente um por worker ASGI) mantém o seu próprio pool keep-alive.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        config_data = AppConfig.get_zapsign_config()
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config_data['read_timeout'], connect=config_data['connect_timeout']),
+            limits=httpx.Limits(
+                max_connections=config_data['async_pool_size'],
+                max_keepalive_connections=config_data['async_pool_size']
+            )
         )
+        _async_http_clients[loop] = client
+    return client
+
+
+class AsyncZapSignService(BaseZapSignService):
+    """Service assíncrono (asyncio) para interações com a API ZapSign"""
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        super().__init__(circuit_breaker)
+        self._client = client
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_async_http_client()
+    
+    async def _request(self, method: str, path: str, payload: Dict[str, Any] = None) -> httpx.Response:
+        """Executa a requisição sem bloquear o event loop, com circuit breaker e retry idempotente"""
+        max_attempts = self._max_attempts(method)
+        for attempt in range(max_attempts):
+            self._reserve_call()
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    method,
+                    f'{self.base_url}{path}',
+                    json=payload,
+                    headers=self.headers
+                )
+            except httpx.HTTPError as e:
+                record_zapsign_call(method, path, 'error', time.perf_counter() - started)
+                self.circuit_breaker.record_failure()
+                if attempt + 1 >= max_attempts:
+                    raise ZapSignAPIException(f"Falha de comunicação com a API ZapSign: {e}")
+            except BaseException:
+                # Cancelamento (cliente desconectou) ou erro inesperado: sem resultado,
+                # devolve a vaga de teste para o circuito semiaberto não ficar preso
+                self.circuit_breaker.release_probe()
+                raise
+            else:
+                record_zapsign_call(method, path, response.status_code, time.perf_counter() - started)
+                if not self._record_response(response) or attempt + 1 >= max_attempts:
+                    return response
+            await asyncio.sleep(self._backoff(attempt))
+    
+    async def get_document(self, token: str) -> Dict[str, Any]:
+        """Busca o estado atual de um documento (e seus signatários) na API ZapSign"""
+        response = await self._request('GET', f'/docs/{token}/')
+        
+        return self._handle_response(response)
+    
+    async def create_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria um documento na API ZapSign"""
+        payload = self._create_document_payload(document_data)
+        
+        response = await self._request('POST', '/docs/', payload)
+        
+        return self._handle_response(response)
+    
+    async def update_document(self, token: str, document_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Atualiza um documento na API ZapSign"""
+        payload = self._update_document_payload(document_data)
+        
+        response = await self._request('PUT', f'/docs/{token}/', payload)
         
         return self._handle_response(response)
+    
+    async def delete_document(self, token: str) -> None:
+        """Deleta um documento na API ZapSign"""
+        response = await self._request('DELETE', f'/docs/{token}/')
+        
+        self._handle_delete_response(response)
+    
+    async def add_signer(self, document_token: str, signer_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona um signatário a um documento"""
+        payload = self._add_signer_payload(signer_data)
+        
+        response = await self._request('POST', f'/docs/{document_token}/add-signer/', payload)
+        
+        return self._handle_response(response)
+
+
+_zapsign_service: Optional[ZapSignService] = None
+_zapsign_service_lock = threading.Lock()
+
+
+def get_zapsign_service() -> ZapSignService:
+    """Retorna a instância de ZapSignService reutilizada entre requisições"""
+    global _zapsign_service
+    if _zapsign_service is None:
+        with _zapsign_service_lock:
+            if _zapsign_service is None:
+                _zapsign_service = ZapSignService()
+    return _zapsign_service
+
+
+_async_zapsign_service: Optional[AsyncZapSignService] = None
+
+
+def get_async_zapsign_service() -> AsyncZapSignService:
+    """Retorna a instância de AsyncZapSignService reutilizada entre requisições"""
+    global _async_zapsign_service
+    if _async_zapsign_service is None:
+        _async_zapsign_service = AsyncZapSignService()
+    return _async_zapsign_service
 
 
 class DocumentoService:
     """Service para operações com documentos"""
     
-    def __init__(self):
-        self.zapsign_service = ZapSignService()
+    def __init__(self, zapsign_service: Optional[ZapSignService] = None):
+        self.zapsign_service = zapsign_service or get_zapsign_service()
     
     def prepare_document_data(self, api_result: Dict[str, Any], request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Prepara os dados do documento para salvamento no banco"""
@@ -128,13 +436,556 @@ class DocumentoService:
             'external_id': api_result.get('external_id', DEFAULT_VALUES['EXTERNAL_ID'])
         }
     
+    @staticmethod
+    def _created_signer_token(api_result: Dict[str, Any], email: Optional[str]) -> Optional[str]:
+        """
+        Token do signatário no ZapSign (o mesmo dos eventos de webhook e da consulta
+        do documento), e não o token do documento; escolhe pelo e-mail quando a
+        resposta traz mais de um signatário.
+        """
+        signers = [signer for signer in api_result.get('signers') or [] if isinstance(signer, dict)]
+        for signer in signers:
+            if email and signer.get('email') == email and signer.get('token'):
+                return signer['token']
+        if signers and signers[0].get('token'):
+            return signers[0]['token']
+        return api_result.get('token')
+    
     def prepare_signer_data(self, api_result: Dict[str, Any], request_data: Dict[str, Any], document_id: int) -> Dict[str, Any]:
         """Prepara os dados do signatário para salvamento no banco"""
         return {
-            'token': api_result.get('token'),
+            'token': self._created_signer_token(api_result, request_data.get("email_signatario")),
             'status': api_result.get('status', 'pending'),
             'name': request_data.get("nome_signatario"),
             'email': request_data.get("email_signatario"),
             'external_id': api_result.get('external_id', DEFAULT_VALUES['EXTERNAL_ID']),
             'documentID': document_id
         }
+    
+    def save_created_document(self, api_result: Dict[str, Any],
+                              request_data: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Salva o documento criado na API e seu signatário; retorna (dados, erros)"""
+        with transaction.atomic(savepoint=False):
+            document_data = self.prepare_document_data(api_result, request_data)
+            serializer = DocumentoSerializer(data=document_data)
+            if not serializer.is_valid():
+                logger.error(f"Erro de validação do documento: {serializer.errors}")
+                return None, serializer.errors
+            
+            documento_criado = serializer.save()
+            
+            signer_data = self.prepare_signer_data(api_result, request_data, documento_criado.id)
+            signatario_serializer = SignatarioSerializer(data=signer_data)
+            if signatario_serializer.is_valid():
+                signatario_serializer.save()
+                logger.info(f"Signatário cadastrado: {request_data.get('nome_signatario')}")
+            else:
+                logger.error(f"Erro ao cadastrar signatário: {signatario_serializer.errors}")
+            
+            return serializer.data, None
+    
+    # Fluxo de criação com outbox transacional: nenhuma transação fica aberta
+    # durante a chamada ao ZapSign
+    
+    def register_creation(self, request_data: Dict[str, Any]) -> DocumentoOutbox:
+        """Registra localmente a intenção de criar o documento (commit imediato)"""
+        payload = request_data.dict() if hasattr(request_data, 'dict') else dict(request_data)
+        return DocumentoOutbox.objects.create(status=OUTBOX_STATUS['PENDING'], payload=payload)
+    
+    def record_remote_result(self, outbox: DocumentoOutbox, api_result: Dict[str, Any]) -> None:
+        """Grava o resultado do ZapSign antes de materializar o documento localmente"""
+        outbox.status = OUTBOX_STATUS['SENT']
+        outbox.api_result = api_result
+        outbox.save(update_fields=['status', 'api_result', 'last_updated_at'])
+    
+    def record_remote_failure(self, outbox: DocumentoOutbox, error: str) -> None:
+        """Marca a intenção como falha quando o ZapSign recusa a criação"""
+        outbox.status = OUTBOX_STATUS['FAILED']
+        outbox.error = error
+        outbox.save(update_fields=['status', 'error', 'last_updated_at'])
+    
+    def complete_creation(self, outbox: DocumentoOutbox) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Grava documento e signatário e conclui a intenção em uma transação curta"""
+        with transaction.atomic():
+            # Bloqueia a intenção para não materializar o documento duas vezes
+            # (requisição em andamento x reconciliação)
+            outbox = DocumentoOutbox.objects.select_for_update().get(pk=outbox.pk)
+            if outbox.status != OUTBOX_STATUS['SENT']:
+                if outbox.status == OUTBOX_STATUS['COMPLETED'] and outbox.documentID_id:
+                    return DocumentoSerializer(outbox.documentID).data, None
+                return None, {'outbox': [f"Intenção {outbox.pk} em estado {outbox.status}"]}
+            
+            document_data, errors = self.save_created_document(outbox.api_result, outbox.payload)
+            if errors:
+                outbox.status = OUTBOX_STATUS['FAILED']
+                outbox.error = str(errors)
+            else:
+                outbox.status = OUTBOX_STATUS['COMPLETED']
+                outbox.documentID_id = document_data['id']
+            outbox.save(update_fields=['status', 'error', 'documentID', 'last_updated_at'])
+        return document_data, errors
+    
+    def create_document(self, request_data: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Cria o documento no ZapSign e no banco local; retorna (dados, erros)"""
+        outbox = self.register_creation(request_data)
+        try:
+            api_result = self.zapsign_service.create_document(request_data)
+        except ZapSignAPIException as e:
+            self.record_remote_failure(outbox, e.message)
+            raise
+        self.record_remote_result(outbox, api_result)
+        return self.complete_creation(outbox)
+    
+    def reconcile_outbox(self, older_than: timedelta) -> Dict[str, int]:
+        """
+        Reconcilia intenções interrompidas (ex.: queda do processo no meio da criação).
+
+        Intenções com resultado do ZapSign gravado são materializadas localmente.
+        Intenções ainda pendentes além do prazo nunca receberam resposta e são
+        marcadas como falha para verificação manual no ZapSign.
+        """
+        cutoff = timezone.now() - older_than
+        result = {'completed': 0, 'failed': 0, 'abandoned': 0}
+        
+        sent = DocumentoOutbox.objects.filter(
+            status=OUTBOX_STATUS['SENT'], last_updated_at__lt=cutoff
+        ).order_by('pk')
+        for outbox in sent.iterator():
+            _, errors = self.complete_creation(outbox)
+            result['failed' if errors else 'completed'] += 1
+        
+        result['abandoned'] = DocumentoOutbox.objects.filter(
+            status=OUTBOX_STATUS['PENDING'], created_at__lt=cutoff
+        ).update(
+            status=OUTBOX_STATUS['FAILED'],
+            error="Sem resposta do ZapSign registrada; verificar documento remoto",
+            last_updated_at=timezone.now()
+        )
+        return result
+    
+    # Criação em lote: chamadas ao ZapSign em paralelo e gravação com bulk_create
+    
+    @staticmethod
+    def _call_remote(call, operation: str) -> Tuple[Any, Optional[str], Optional[str]]:
+        """Executa a chamada ao ZapSign; retorna (resultado, mensagem de erro, código de erro)"""
+        try:
+            return call(), None, None
+        except ZapSignUnavailableException as e:
+            return None, e.message, ERROR_CODES['ZAPSIGN_UNAVAILABLE']
+        except ZapSignAPIException as e:
+            return None, e.message, ERROR_CODES['ZAPSIGN_API_ERROR']
+        except Exception as e:
+            logger.error(f"Erro inesperado ao {operation} no ZapSign: {str(e)}")
+            return None, str(e), ERROR_CODES['EXTERNAL_API_ERROR']
+    
+    def _call_create_document(self, request_data: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+        """Chama o ZapSign; retorna (resultado, mensagem de erro, código de erro)"""
+        return self._call_remote(lambda: self.zapsign_service.create_document(request_data), "criar documento")
+    
+    @staticmethod
+    def _fan_out(function, arguments: List[Any]) -> List[Any]:
+        """Aplica function a cada argumento em paralelo (BATCH_MAX_CONCURRENCY), mantendo a ordem"""
+        if not arguments:
+            return []
+        max_workers = min(AppConfig.get_batch_config()['max_concurrency'], len(arguments))
+        # Cada tarefa roda em uma cópia do contexto da requisição (contextvars), como no sync_to_async
+        contexts = [contextvars.copy_context() for _ in arguments]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda context, argument: context.run(function, argument),
+                                     contexts, arguments))
+    
+    @staticmethod
+    def _company_id(request_data: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(request_data.get('company_id', DEFAULT_VALUES['COMPANY_ID']))
+        except (TypeError, ValueError):
+            return None
+    
+    def _build_models(self, api_result: Dict[str, Any], request_data: Dict[str, Any],
+                      company_ids: set) -> Tuple[Documento, Optional[Signatario]]:
+        """Monta (sem gravar) documento e signatário, validando como os serializers"""
+        document_data = self.prepare_document_data(api_result, request_data)
+        company_id = self._company_id(request_data)
+        if company_id not in company_ids:
+            raise ValidationError({'company_id': [f"Empresa {document_data['company_id']} não encontrada"]})
+        documento = Documento(
+            openID=document_data['openID'],
+            token=document_data['token'],
+            name=document_data.get('name'),
+            status=document_data['status'],
+            created_by=document_data['created_by'],
+            company_id_id=company_id,
+        )
+        documento.full_clean(
+            exclude=['company_id', 'externalID', 'status_event_at'], validate_unique=False, validate_constraints=False
+        )
+        
+        signer_data = self.prepare_signer_data(api_result, request_data, None)
+        signatario = Signatario(
+            token=signer_data['token'],
+            status=signer_data['status'],
+            name=signer_data['name'],
+            email=signer_data['email'],
+        )
+        try:
+            signatario.full_clean(
+                exclude=['documentID', 'externalID', 'status_event_at'], validate_unique=False, validate_constraints=False
+            )
+        except ValidationError as e:
+            # Mesmo comportamento da criação unitária: o documento é gravado sem o signatário
+            logger.error(f"Erro ao cadastrar signatário: {e.message_dict}")
+            signatario = None
+        return documento, signatario
+    
+    def create_documents_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cria vários documentos; retorna um resultado (sucesso ou erro) por item.
+
+        As chamadas ao ZapSign rodam em paralelo (BATCH_MAX_CONCURRENCY) sem transação
+        aberta; intenções, documentos e signatários são gravados com operações em lote.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = self._batch_error(index, "Item inválido", ERROR_CODES['VALIDATION_ERROR'])
+                continue
+            missing_fields = [field for field in DOCUMENT_CREATE_REQUIRED_FIELDS if not item.get(field)]
+            if missing_fields:
+                results[index] = self._batch_error(
+                    index,
+                    f"Campos obrigatórios ausentes: {', '.join(missing_fields)}",
+                    ERROR_CODES['VALIDATION_ERROR']
+                )
+                continue
+            valid.append((index, item))
+        
+        if not valid:
+            return results
+        
+        # 1. Registra todas as intenções em um único INSERT
+        outboxes = DocumentoOutbox.objects.bulk_create([
+            DocumentoOutbox(status=OUTBOX_STATUS['PENDING'], payload=item) for _, item in valid
+        ])
+        
+        # 2. Chamadas ao ZapSign em paralelo, com concorrência limitada
+        responses = self._fan_out(self._call_create_document, [item for _, item in valid])
+        
+        now = timezone.now()
+        for outbox, (api_result, error, _) in zip(outboxes, responses):
+            outbox.last_updated_at = now
+            if error is None:
+                outbox.status, outbox.api_result = OUTBOX_STATUS['SENT'], api_result
+            else:
+                outbox.status, outbox.error = OUTBOX_STATUS['FAILED'], error
+        DocumentoOutbox.objects.bulk_update(outboxes, ['status', 'api_result', 'error', 'last_updated_at'])
+        
+        # 3. Grava documentos e signatários com bulk_create em uma transação curta
+        company_ids = set(Empresa.objects.filter(
+            pk__in={self._company_id(item) for _, item in valid} - {None}
+        ).values_list('pk', flat=True))
+        
+        to_create = []
+        for (index, item), outbox, (api_result, error, error_code) in zip(valid, outboxes, responses):
+            if error is not None:
+                results[index] = self._batch_error(index, error, error_code)
+                continue
+            try:
+                documento, signatario = self._build_models(api_result, item, company_ids)
+            except ValidationError as e:
+                logger.error(f"Erro de validação do documento em lote: {e.message_dict}")
+                outbox.status, outbox.error = OUTBOX_STATUS['FAILED'], str(e.message_dict)
+                results[index] = self._batch_error(index, "Dados inválidos", ERROR_CODES['VALIDATION_ERROR'])
+                continue
+            to_create.append((index, outbox, documento, signatario))
+        
+        with transaction.atomic():
+            documentos = Documento.objects.bulk_create([documento for _, _, documento, _ in to_create])
+            signatarios = []
+            for (_, outbox, _, signatario), documento in zip(to_create, documentos):
+                outbox.status, outbox.documentID = OUTBOX_STATUS['COMPLETED'], documento
+                if signatario is not None:
+                    signatario.documentID = documento
+                    signatarios.append(signatario)
+            Signatario.objects.bulk_create(signatarios)
+            now = timezone.now()
+            for outbox in outboxes:
+                outbox.last_updated_at = now
+            DocumentoOutbox.objects.bulk_update(outboxes, ['status', 'error', 'documentID', 'last_updated_at'])
+            # bulk_create não dispara sinais: invalida a listagem explicitamente
+            if documentos:
+                invalidate_documentos()
+        
+        documentos_data = DocumentoSerializer(documentos, many=True).data
+        for (index, _, _, _), documento_data in zip(to_create, documentos_data):
+            results[index] = {'index': index, 'success': True, 'data': documento_data}
+        return results
+    
+    @staticmethod
+    def _batch_error(index: int, error_message: str, error_code: str) -> Dict[str, Any]:
+        return {'index': index, 'success': False, 'error': error_message, 'error_code': error_code}
+    
+    @staticmethod
+    def _batch_id(value) -> Optional[int]:
+        if isinstance(value, bool):
+            return None
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            return None
+        return pk if pk > 0 else None
+    
+    def _validate_batch_ids(self, ids: List[Any], results: List[Optional[Dict[str, Any]]]) -> List[Tuple[int, int]]:
+        """Valida os ids do lote; retorna [(índice, id)] e grava os erros em results"""
+        valid, seen = [], set()
+        for index, value in enumerate(ids):
+            pk = self._batch_id(value)
+            if pk is None:
+                results[index] = self._batch_error(index, "id inválido", ERROR_CODES['VALIDATION_ERROR'])
+            elif pk in seen:
+                results[index] = self._batch_error(index, f"id {pk} repetido no lote", ERROR_CODES['VALIDATION_ERROR'])
+            else:
+                seen.add(pk)
+                valid.append((index, pk))
+        return valid
+    
+    @staticmethod
+    def _format_errors(errors: Dict[str, List[Any]]) -> str:
+        return '; '.join(f"{field}: {' '.join(str(message) for message in messages)}"
+                         for field, messages in errors.items())
+    
+    def update_documents_batch(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Atualiza vários documentos; retorna um resultado (sucesso ou erro) por item.
+
+        Carrega os documentos em uma consulta, chama o ZapSign em paralelo
+        (BATCH_MAX_CONCURRENCY) e grava as alterações confirmadas com um único bulk_update.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid, changes = [], {}
+        for index, pk in self._validate_batch_ids(
+            [item.get('id') if isinstance(item, dict) else None for item in items], results
+        ):
+            # Valida antes das chamadas ao ZapSign: um valor inválido não pode derrubar
+            # o bulk_update depois que as atualizações remotas já foram feitas
+            serializer = DocumentoUpdateSerializer(
+                data={key: value for key, value in items[index].items() if key != 'id'}
+            )
+            if not serializer.is_valid():
+                results[index] = self._batch_error(
+                    index, f"Dados inválidos: {self._format_errors(serializer.errors)}",
+                    ERROR_CODES['VALIDATION_ERROR']
+                )
+                continue
+            valid.append((index, pk))
+            changes[index] = serializer.validated_data
+        
+        documentos = Documento.objects.in_bulk([pk for _, pk in valid])
+        to_call = []
+        for index, pk in valid:
+            if pk in documentos:
+                to_call.append((index, documentos[pk]))
+            else:
+                results[index] = self._batch_error(index, "Documento não encontrado", ERROR_CODES['DOCUMENT_NOT_FOUND'])
+        
+        def update_remote(entry):
+            index, documento = entry
+            return self._call_remote(
+                lambda: self.zapsign_service.update_document(documento.token, changes[index]), "atualizar documento"
+            )
+        
+        updated = []
+        now = timezone.now()
+        for (index, documento), (_, error, error_code) in zip(to_call, self._fan_out(update_remote, to_call)):
+            if error is not None:
+                results[index] = self._batch_error(index, error, error_code)
+                continue
+            # bulk_update não aplica auto_now
+            documento.name, documento.last_updated_at = changes[index]['name'], now
+            updated.append((index, documento))
+        
+        if updated:
+            with transaction.atomic():
+                Documento.objects.bulk_update([documento for _, documento in updated], ['name', 'last_updated_at'])
+                # bulk_update não dispara sinais: invalida o cache explicitamente
+                invalidate_documentos(*[documento.pk for _, documento in updated])
+        
+        for index, documento in updated:
+            results[index] = {'index': index, 'success': True, 'data': DocumentoUpdateSerializer(documento).data}
+        return results
+    
+    def delete_documents_batch(self, ids: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Exclui vários documentos; retorna um resultado (sucesso ou erro) por id.
+
+        Busca os tokens em uma consulta, chama o ZapSign em paralelo e exclui os
+        confirmados com um único DELETE ... WHERE id IN (signatários em cascata).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+        valid = self._validate_batch_ids(ids, results)
+        
+        tokens = dict(Documento.objects.filter(pk__in=[pk for _, pk in valid]).values_list('pk', 'token'))
+        to_call = []
+        for index, pk in valid:
+            if pk in tokens:
+                to_call.append((index, pk))
+            else:
+                results[index] = self._batch_error(index, "Documento não encontrado", ERROR_CODES['DOCUMENT_NOT_FOUND'])
+        
+        def delete_remote(entry):
+            _, pk = entry
+            return self._call_remote(
+                lambda: self.zapsign_service.delete_document(tokens[pk]), "excluir documento"
+            )
+        
+        deleted = []
+        for (index, pk), (_, error, error_code) in zip(to_call, self._fan_out(delete_remote, to_call)):
+            if error is not None:
+                results[index] = self._batch_error(index, error, error_code)
+            else:
+                deleted.append((index, pk))
+        
+        if deleted:
+            Documento.objects.filter(pk__in=[pk for _, pk in deleted]).delete()
+        
+        for index, pk in deleted:
+            results[index] = {'index': index, 'success': True, 'data': {'id': pk}}
+        return results
+    
+    # Atualização de status em lote (webhooks e sincronização com o ZapSign)
+    
+    @staticmethod
+    def _locked_rows(model, tokens, *fields) -> List[tuple]:
+        if not tokens:
+            return []
+        return list(
+            model.objects.select_for_update().filter(token__in=list(tokens)).values_list(*fields)
+        )
+    
+    @staticmethod
+    def _changed_statuses(rows, statuses: Dict[str, str], event_times: Dict[str, Any],
+                          final_statuses, now) -> Dict[int, tuple]:
+        """
+        Filtra as linhas cujo status muda, com (status, momento do evento). Status finais
+        não regridem e vencem os intermediários; um status intermediário só é aplicado
+        se o evento for mais recente que o último aplicado (status_event_at), mesmo que
+        os eventos cheguem em blocos fora de ordem.
+        """
+        changed = {}
+        for pk, token, current_status, applied_at in rows:
+            new_status, event_at = statuses[token], event_times.get(token, now)
+            if new_status == current_status or current_status in final_statuses:
+                continue
+            if new_status not in final_statuses and applied_at is not None and event_at <= applied_at:
+                continue
+            changed[pk] = (new_status, event_at)
+        return changed
+    
+    @staticmethod
+    def _bulk_set_status(model, changed: Dict[int, tuple], now=None) -> None:
+        """UPDATE único com CASE por id, em blocos de STATUS_UPDATE_CHUNK_SIZE linhas"""
+        pks = list(changed)
+        extra_fields = {} if now is None else {'last_updated_at': now}
+        for start in range(0, len(pks), STATUS_UPDATE_CHUNK_SIZE):
+            chunk = pks[start:start + STATUS_UPDATE_CHUNK_SIZE]
+            model.objects.filter(pk__in=chunk).update(
+                status=Case(*[When(pk=pk, then=Value(changed[pk][0])) for pk in chunk]),
+                status_event_at=Case(*[When(pk=pk, then=Value(changed[pk][1])) for pk in chunk]),
+                **extra_fields
+            )
+    
+    def apply_status_updates(self, document_statuses: Dict[str, str],
+                             signer_statuses: Dict[str, str],
+                             document_event_times: Optional[Dict[str, Any]] = None,
+                             signer_event_times: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Aplica status de documentos e signatários, indexados por token, com poucas
+        consultas: um SELECT ... FOR UPDATE e um UPDATE com CASE por tabela, mais a
+        atualização de last_updated_at dos documentos cujos signatários mudaram.
+        Status finais não são sobrescritos, eventos mais antigos que o último aplicado
+        são descartados (tokens sem momento informado usam o instante atual) e tokens
+        desconhecidos são ignorados.
+        """
+        now = timezone.now()
+        # Sem savepoint: dentro do flush do webhook, participa da transação que retira as linhas pendentes
+        with transaction.atomic(savepoint=False):
+            documents = self._locked_rows(
+                Documento, document_statuses, 'pk', 'token', 'status', 'status_event_at'
+            )
+            changed_documents = self._changed_statuses(
+                documents, document_statuses, document_event_times or {}, DOCUMENT_FINAL_STATUSES, now
+            )
+            self._bulk_set_status(Documento, changed_documents, now)
+            
+            signers = self._locked_rows(
+                Signatario, signer_statuses, 'pk', 'token', 'status', 'status_event_at', 'documentID_id'
+            )
+            signer_documents = {row[0]: row[4] for row in signers}
+            changed_signers = self._changed_statuses(
+                [row[:4] for row in signers], signer_statuses, signer_event_times or {},
+                SIGNER_FINAL_STATUSES, now
+            )
+            self._bulk_set_status(Signatario, changed_signers)
+            
+            # Signatários alterados invalidam ETag/cache do documento
+            touched_documents = {signer_documents[pk] for pk in changed_signers} - set(changed_documents)
+            if touched_documents:
+                Documento.objects.filter(pk__in=touched_documents).update(last_updated_at=now)
+            
+            # queryset.update() não dispara sinais: invalida o cache explicitamente
+            if changed_documents or touched_documents:
+                invalidate_documentos(*changed_documents, *touched_documents)
+        
+        return {
+            'documents_updated': len(changed_documents),
+            'signers_updated': len(changed_signers),
+            'documents_unknown': len(document_statuses) - len(documents),
+            'signers_unknown': len(signer_statuses) - len(signers),
+        }
+    
+    def pending_documents(self, after_id: int, limit: int) -> List[Tuple[int, str]]:
+        """Próximo bloco (id, token) de documentos em status não final, por id crescente"""
+        return list(
+            Documento.objects.exclude(status__in=DOCUMENT_FINAL_STATUSES)
+            .filter(pk__gt=after_id).order_by('pk').values_list('pk', 'token')[:limit]
+        )
+    
+    def sync_remote_statuses(self, tokens: List[str], max_concurrency: int,
+                             rate_limiter: Optional[RateLimiter] = None) -> Dict[str, Any]:
+        """
+        Busca no ZapSign o estado dos documentos em paralelo e grava em lote apenas
+        as mudanças (apply_status_updates). ZapSignUnavailableException interrompe o
+        bloco, sem gravar nada, para que ele seja repetido.
+        """
+        def fetch(token):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return self.zapsign_service.get_document(token)
+        
+        document_statuses, signer_statuses, failed = {}, {}, 0
+        document_event_times, signer_event_times = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(tokens)))) as executor:
+            futures = [executor.submit(fetch, token) for token in tokens]
+            for token, future in zip(tokens, futures):
+                try:
+                    api_result = future.result()
+                except ZapSignUnavailableException:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                except ZapSignAPIException as e:
+                    failed += 1
+                    logger.error(f"Erro ao sincronizar documento {token}: {e.message}")
+                    continue
+                documents, signers, _ = parse_events(api_result)
+                for doc_token, doc_status, event_time in documents:
+                    document_statuses[doc_token] = doc_status
+                    document_event_times[doc_token] = event_time
+                for sig_token, sig_status, event_time in signers:
+                    signer_statuses[sig_token] = sig_status
+                    signer_event_times[sig_token] = event_time
+        
+        result = self.apply_status_updates(
+            document_statuses, signer_statuses, document_event_times, signer_event_times
+        )
+        return {**result, 'fetched': len(tokens) - failed, 'failed': failed}
@@ -0,0 +1,29 @@
+"""
+Sinais do app api
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_documentos
+from .models import Documento, Signatario
+
+
+@receiver(post_save, sender=Documento)
+@receiver(post_delete, sender=Documento)
+def invalidate_documento_cache(sender, instance, **kwargs):
+    """Remove o detalhe e as páginas da listagem do cache após criar, alterar ou excluir"""
+    invalidate_documentos(instance.pk)
+
+
+@receiver(post_save, sender=Signatario)
+@receiver(post_delete, sender=Signatario)
+def touch_documento_on_signer_change(sender, instance, origin=None, **kwargs):
+    """Atualiza last_updated_at do documento, invalidando ETag/Last-Modified das leituras"""
+    # Na exclusão em cascata o documento também é removido (e invalidado pelo próprio sinal)
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and not issubclass(origin_model, Signatario):
+        return
+    Documento.objects.filter(pk=instance.documentID_id).update(last_updated_at=timezone.now())
+    invalidate_documentos(instance.documentID_id)
@@ -0,0 +1,106 @@
+"""
+Respostas em streaming (NDJSON/JSON) para listagens grandes
+"""
+import logging
+from itertools import islice
+from typing import Iterator, Optional, Type
+
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+
+from .config import AppConfig
+from .constants import STREAM_FORMATS
+from .renderers import dumps
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    STREAM_FORMATS['NDJSON']: 'application/x-ndjson',
+    STREAM_FORMATS['JSON']: 'application/json',
+}
+
+
+class InvalidStreamFormatException(Exception):
+    """Exceção para formatos de streaming não suportados"""
+    def __init__(self, stream_format: str):
+        self.message = (
+            f"Formato de streaming inválido: {stream_format}. "
+            f"Use um de: {', '.join(CONTENT_TYPES)}"
+        )
+        super().__init__(self.message)
+
+
+def get_stream_format(request) -> Optional[str]:
+    """
+    Retorna o formato de streaming solicitado via ?stream= ou header Accept,
+    ou None quando a resposta deve ser paginada normalmente
+    """
+    stream_format = request.query_params.get('stream')
+    if stream_format:
+        if stream_format not in CONTENT_TYPES:
+            raise InvalidStreamFormatException(stream_format)
+        return stream_format
+
+    accepted_renderer = getattr(request, 'accepted_renderer', None)
+    if accepted_renderer is not None and accepted_renderer.format == STREAM_FORMATS['NDJSON']:
+        return STREAM_FORMATS['NDJSON']
+    return None
+
+
+def iter_serialized_chunks(queryset, serializer_class: Type[serializers.Serializer],
+                           chunk_size: int) -> Iterator[list]:
+    """
+    Percorre o queryset com cursor no servidor e serializa um bloco por vez.
+
+    Com prefetch_related, o Django busca os relacionamentos de cada bloco de
+    chunk_size linhas em uma única consulta.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield serializer_class(chunk, many=True).data
+
+
+def _ndjson_stream(chunks: Iterator[list]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield b''.join(dumps(item) + b'\n' for item in chunk)
+
+
+def _json_array_stream(chunks: Iterator[list]) -> Iterator[bytes]:
+    yield b'['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = b','.join(dumps(item) for item in chunk)
+        yield body if first else b',' + body
+        first = False
+    yield b']'
+
+
+def _log_stream_errors(stream: Iterator[bytes]) -> Iterator[bytes]:
+    # Após o primeiro byte o status HTTP já foi enviado; resta registrar a falha
+    try:
+        yield from stream
+    except Exception as e:
+        logger.error(f"Erro durante streaming de documentos: {str(e)}")
+        raise
+
+
+def streaming_response(queryset, serializer_class: Type[serializers.Serializer],
+                       stream_format: str, chunk_size: int = None) -> StreamingHttpResponse:
+    """Cria a resposta em streaming para o queryset no formato solicitado"""
+    chunk_size = chunk_size or AppConfig.STREAM_CHUNK_SIZE
+    chunks = iter_serialized_chunks(queryset, serializer_class, chunk_size)
+
+    if stream_format == STREAM_FORMATS['NDJSON']:
+        stream = _ndjson_stream(chunks)
+    else:
+        stream = _json_array_stream(chunks)
+
+    return StreamingHttpResponse(
+        _log_stream_errors(stream),
+        content_type=CONTENT_TYPES[stream_format]
+    )
@@ -1,13 +1,69 @@
 """
 Testes para as views refatoradas
 """
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import skipUnless
+
+import httpx
+import requests
+from asgiref.sync import iscoroutinefunction
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished, request_started
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.test import APITestCase
 from rest_framework import status
-from unittest.mock import patch, Mock
-from .models import Documento, Signatario, Empresa
-from .services import ZapSignService, ZapSignAPIException
+from unittest.mock import AsyncMock, patch, Mock
+from .config import AppConfig
+from .constants import CIRCUIT_STATE, IDEMPOTENCY_STATUS, OUTBOX_STATUS
+from .resilience import CircuitBreaker, CircuitOpenError, RateLimiter
+from .cache import cache_stats
+from .models import Documento, DocumentoOutbox, IdempotencyKey, Signatario, Empresa, WebhookStatusUpdate
+from .serializers import DocumentoValuesSerializer, DocumentoWithSignersSerializer
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .middleware import MetricsMiddleware
+from .mixins import BaseViewMixin
+from .services import (
+    AsyncZapSignService,
+    DocumentoService,
+    ZapSignService,
+    ZapSignAPIException,
+    ZapSignUnavailableException,
+    build_http_session,
+    get_circuit_breaker,
+    get_http_session,
+    get_zapsign_service,
+)
+from .filters import DocumentoListFilters, InvalidFilterException
+from .fieldsets import DocumentoFieldset, InvalidFieldsetException
+from .webhooks import StatusUpdateBuffer
+from .coalescing import SingleFlight, _flight_key, coalesced, single_flight
+from .budgets import BudgetExceeded, budget_seed, endpoint_budget, query_budget
+from . import idempotency, metrics, views_async
+from benchmarks.fake_zapsign import FakeZapSignHandler, FakeZapSignServer, LatencyDistribution
 
 
 class DocumentoViewsTest(APITestCase):
@@ -46,6 +102,50 @@ class DocumentoViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], self.documento.name)
     
+    def test_get_documentos_query_count_constant(self):
+        """Testa que a listagem não executa uma consulta por documento (N+1)"""
+        for i in range(5):
+            documento = Documento.objects.create(
+                openID=200 + i,
+                token=f"token_lote_{i}",
+                name=f"Documento Lote {i}",
+                status="pending",
+                created_by="test@test.com",
+                company_id=self.empresa,
+            )
+            Signatario.objects.create(
+                token=f"token_sig_{i}",
+                status="pending",
+                name=f"Signatário {i}",
+                email=f"sig{i}@test.com",
+                documentID=documento,
+            )
+
+        url = reverse('get_documentos')
+        # 1 agregação para ETag/Last-Modified + 1 para documentos (com empresa) + 1 para os signatários
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_documento_query_count(self):
+        """Testa que o detalhe carrega signatários com uma única consulta extra"""
+        Signatario.objects.create(
+            token="token_sig_detalhe",
+            status="pending",
+            name="Signatário Detalhe",
+            email="detalhe@test.com",
+            documentID=self.documento,
+        )
+
+        url = reverse('get_documento', kwargs={'pk': self.documento.pk})
+        # 1 consulta de last_updated_at (ETag) + documento com empresa + signatários
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['signers']), 1)
+
     def test_get_documento_not_found(self):
         """Testa a busca de um documento inexistente"""
         url = reverse('get_documento', kwargs={'pk': 99999})
@@ -117,52 +217,2331 @@ class DocumentoViewsTest(APITestCase):
         mock_delete_document.assert_called_once_with(self.documento.token)
 
 
-class ZapSignServiceTest(TestCase):
-    """Testes para o service ZapSign"""
-    
+class DocumentoEndpointBudgetTest(APITestCase):
+    """Testa os endpoints de documentos contra os orçamentos de api/budgets.json"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed = budget_seed()
+        empresas = Empresa.objects.bulk_create(
+            Empresa(name=f"Empresa {i}", apiToken=f"token_{i}") for i in range(seed['companies'])
+        )
+        cls.empresa = empresas[0]
+        documentos = Documento.objects.bulk_create(
+            Documento(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}", status="pending",
+                created_by="test@test.com", company_id=empresas[i % len(empresas)],
+            )
+            for i in range(seed['documents'])
+        )
+        Signatario.objects.bulk_create(
+            Signatario(
+                token=f"sig_{documento.openID}_{j}", status="pending", name=f"Signatário {j}",
+                email=f"sig{documento.openID}.{j}@test.com", documentID=documento,
+            )
+            for documento in documentos
+            for j in range(seed['signers'])
+        )
+        cls.documento = documentos[0]
+
+    def setUp(self):
+        cache.clear()
+
+    def _create_data(self, i=0):
+        return {
+            'name': f'Novo Documento {i}',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva',
+            'email_signatario': 'joao@test.com',
+            'company_id': self.empresa.id
+        }
+
+    @staticmethod
+    def _created(data):
+        return {'open_id': 1, 'token': f"token_{data['name']}", 'status': 'pending',
+                'created_by': {'email': 'test@test.com'}}
+
+    def test_get_documentos_budget(self):
+        """Testa o orçamento da listagem (uma página, com signatários)"""
+        with query_budget('get_documentos'):
+            response = self.client.get(reverse('get_documentos'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), AppConfig.PAGE_SIZE)
+
+    def test_get_documento_budget(self):
+        """Testa o orçamento do detalhe com signatários"""
+        with query_budget('get_documento'):
+            response = self.client.get(reverse('get_documento', kwargs={'pk': self.documento.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['signers']), budget_seed()['signers'])
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_create_documento_budget(self, mock_create_document):
+        """Testa o orçamento da criação de documento"""
+        mock_create_document.side_effect = self._created
+        with query_budget('create_documento'):
+            response = self.client.post(reverse('create_documento'), self._create_data(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_create_documentos_batch_budget(self, mock_create_document):
+        """Testa o orçamento da criação em lote de 20 documentos"""
+        mock_create_document.side_effect = self._created
+        items = [self._create_data(i) for i in range(20)]
+        with query_budget('create_documentos_batch'):
+            response = self.client.post(reverse('create_documentos_batch'), {'documents': items}, format='json')
+        self.assertEqual(response.data['data']['created'], 20)
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_update_documento_budget(self, mock_update_document):
+        """Testa o orçamento da atualização de documento"""
+        mock_update_document.return_value = {'success': True}
+        url = reverse('update_documento', kwargs={'pk': self.documento.pk})
+        with query_budget('update_documento'):
+            response = self.client.put(url, {'name': 'Documento Atualizado'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch('api.services.ZapSignService.delete_document')
+    def test_delete_documento_budget(self, mock_delete_document):
+        """Testa o orçamento da exclusão de documento"""
+        url = reverse('delete_documento', kwargs={'pk': self.documento.pk})
+        with query_budget('delete_documento'):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_update_documentos_batch_budget(self, mock_update_document):
+        """Testa o orçamento da atualização em lote de 20 documentos"""
+        mock_update_document.return_value = {'success': True}
+        documentos = Documento.objects.order_by('pk')[:20]
+        items = [{'id': documento.pk, 'name': f'Atualizado {documento.pk}'} for documento in documentos]
+        with query_budget('update_documentos_batch'):
+            response = self.client.put(reverse('update_documentos_batch'), {'documents': items}, format='json')
+        self.assertEqual(response.data['data']['updated'], 20)
+
+    @patch('api.services.ZapSignService.delete_document')
+    def test_delete_documentos_batch_budget(self, mock_delete_document):
+        """Testa o orçamento da exclusão em lote de 20 documentos (signatários em cascata)"""
+        ids = list(Documento.objects.order_by('-pk').values_list('pk', flat=True)[:20])
+        with query_budget('delete_documentos_batch'):
+            response = self.client.delete(reverse('delete_documentos_batch'), {'ids': ids}, format='json')
+        self.assertEqual(response.data['data']['deleted'], 20)
+
+    def test_zapsign_webhook_budget(self):
+        """Testa o orçamento de uma rajada de 50 eventos do webhook"""
+        events = [
+            {'token': f"doc_{i}", 'status': 'signed', 'last_update_at': '2026-01-01T10:00:02Z',
+             'signers': [{'token': f"sig_{i}_0", 'status': 'signed'}]}
+            for i in range(50)
+        ]
+        buffer = StatusUpdateBuffer(batch_size=500, flush_interval=None)
+        with patch('api.views.get_webhook_buffer', return_value=buffer), query_budget('zapsign_webhook'):
+            response = self.client.post(reverse('zapsign_webhook'), events, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+
+class QueryBudgetTest(TestCase):
+    """Testes do mecanismo de orçamentos de consultas e tempo"""
+
+    @classmethod
+    def setUpTestData(cls):
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        for i in range(3):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}", company_id=empresa,
+            )
+            Signatario.objects.create(
+                token=f"sig_{i}", status="pending", name=f"Signatário {i}",
+                email=f"sig{i}@test.com", documentID=documento,
+            )
+
+    def test_report_groups_queries_by_call_site(self):
+        """Testa que o N+1 aparece agrupado no ponto do código que o dispara"""
+        with self.assertRaises(BudgetExceeded) as context:
+            with query_budget(queries=1):
+                DocumentoWithSignersSerializer(Documento.objects.all(), many=True).data
+        report = str(context.exception)
+        self.assertIn('4 consultas (limite 1)', report)
+        self.assertRegex(report, r'api/serializers\.py:\d+ em get_signers: 3 consulta\(s\)')
+        self.assertRegex(report, r'3x SELECT .* FROM "signers"')
+        self.assertIn('api/test_refactored.py', report)
+
+        with query_budget(queries=2):
+            DocumentoWithSignersSerializer(Documento.objects.with_signers(), many=True).data
+
+    def test_decorator_and_time_budget(self):
+        """Testa o uso como decorador e o limite de tempo"""
+        @query_budget(queries=0, max_ms=10000)
+        def no_queries():
+            return 1
+
+        self.assertEqual(no_queries(), 1)
+        with self.assertRaises(BudgetExceeded) as context:
+            with query_budget(max_ms=0):
+                list(Documento.objects.all())
+        self.assertIn('limite 0 ms', str(context.exception))
+
+        with patch.object(AppConfig, 'BUDGET_TIME_FACTOR', 2):
+            self.assertEqual(query_budget('get_documento').max_ms, 2 * endpoint_budget('get_documento')['max_ms'])
+        with self.assertRaises(KeyError):
+            query_budget('endpoint_inexistente')
+
+
+class DocumentoConditionalGetTest(APITestCase):
+    """Testes para ETag / Last-Modified nas leituras de documentos"""
+
     def setUp(self):
         """Configuração inicial dos testes"""
-        self.service = ZapSignService()
-    
-    @patch('api.services.requests.post')
-    def test_create_document_success(self, mock_post):
-        """Testa a criação de documento na API ZapSign"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'open_id': 123,
-            'token': 'test_token',
-            'status': 'pending'
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.documento = Documento.objects.create(
+            openID=1, token="token_doc", name="Documento", status="pending",
+            created_by="test@test.com", company_id=self.empresa,
+        )
+        self.list_url = reverse('get_documentos')
+        self.detail_url = reverse('get_documento', kwargs={'pk': self.documento.pk})
+
+    def test_list_not_modified_costs_one_query(self):
+        """Testa 304 na listagem com uma única consulta agregada e sem corpo"""
+        etag = self.client.get(self.list_url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        """Testa que alterações e exclusões geram um novo ETag"""
+        first = self.client.get(self.list_url)['ETag']
+        self.documento.name = "Renomeado"
+        self.documento.save()
+        second = self.client.get(self.list_url)['ETag']
+        self.documento.delete()
+        third = self.client.get(self.list_url)['ETag']
+
+        self.assertEqual(len({first, second, third}), 3)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_if_modified_since_sees_deletes(self):
+        """Testa que a listagem não responde 304 a If-Modified-Since depois de uma exclusão"""
+        Documento.objects.create(
+            openID=2, token="token_doc_2", name="Documento 2", status="pending",
+            created_by="test@test.com", company_id=self.empresa,
+        )
+        first = self.client.get(self.list_url)
+        self.assertEqual(len(first.data['results']), 2)
+        self.assertNotIn('Last-Modified', first)
+
+        self.documento.delete()
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=http_date())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_list_etag_depends_on_representation(self):
+        """Testa que página e formato entram no ETag"""
+        paginated = self.client.get(self.list_url)['ETag']
+        streamed = self.client.get(self.list_url, {'stream': 'ndjson'})['ETag']
+
+        self.assertNotEqual(paginated, streamed)
+
+    def test_detail_conditional_requests(self):
+        """Testa If-None-Match e If-Modified-Since no detalhe"""
+        response = self.client.get(self.detail_url)
+        self.assertTrue(response['ETag'].startswith('"'))
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        since = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_when_signer_is_added(self):
+        """Testa que novos signatários invalidam o ETag do documento"""
+        etag = self.client.get(self.detail_url)['ETag']
+        Signatario.objects.create(
+            token="token_sig", status="pending", name="Signatário",
+            email="sig@test.com", documentID=self.documento,
+        )
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['signers']), 1)
+
+
+    def test_detail_changes_when_signer_is_deleted(self):
+        """Testa que excluir um signatário invalida o ETag e o cache do detalhe"""
+        signer = Signatario.objects.create(
+            token="token_sig", status="pending", name="Signatário",
+            email="sig@test.com", documentID=self.documento,
+        )
+        first = self.client.get(self.detail_url)
+        self.assertEqual(len(first.data['signers']), 1)
+
+        signer.delete()
+        revalidated = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        fresh = self.client.get(self.detail_url)
+
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+        self.assertEqual(revalidated.data['signers'], [])
+        self.assertEqual(fresh.data['signers'], [])
+
+
+class DocumentoCacheTest(APITestCase):
+    """Testes para o cache read-through das leituras de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        cache.clear()
+        cache_stats.reset()
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.documento = Documento.objects.create(
+            openID=1, token="token_doc", name="Documento", status="pending",
+            created_by="test@test.com", company_id=self.empresa,
+        )
+        self.list_url = reverse('get_documentos')
+        self.detail_url = reverse('get_documento', kwargs={'pk': self.documento.pk})
+
+    def test_detail_hit_skips_serialization_queries(self):
+        """Testa que o acerto no detalhe custa apenas a consulta de versão"""
+        self.client.get(self.detail_url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.data['name'], "Documento")
+        stats = self.client.get(reverse('get_cache_stats')).data['data']
+        self.assertEqual(stats['by_endpoint']['documento'], {'hits': 1, 'misses': 1})
+
+    def test_list_hit_skips_serialization_queries(self):
+        """Testa que o acerto na listagem custa apenas a agregação de versão"""
+        first = self.client.get(self.list_url)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(first.data, second.data)
+
+    def test_list_pages_are_cached_per_host_and_scheme(self):
+        """Testa que cada host e esquema recebe os próprios links absolutos de paginação"""
+        Documento.objects.create(
+            openID=2, token="token_doc_2", name="Documento 2", status="pending",
+            created_by="test@test.com", company_id=self.empresa,
+        )
+        url = f"{self.list_url}?page_size=1"
+
+        self.client.get(url, HTTP_HOST='api.example.com')
+        other_host = self.client.get(url, HTTP_HOST='interno:8000')
+        secure = self.client.get(url, HTTP_HOST='api.example.com', secure=True)
+
+        self.assertTrue(other_host.data['next'].startswith('http://interno:8000/'))
+        self.assertTrue(secure.data['next'].startswith('https://api.example.com/'))
+        self.assertEqual(cache_stats.snapshot()['by_endpoint']['documentos'], {'hits': 0, 'misses': 3})
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_update_invalidates_detail_and_list(self, mock_update_document):
+        """Testa a invalidação após update_documento"""
+        mock_update_document.return_value = {'token': 'token_doc'}
+        self.client.get(self.detail_url)
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                reverse('update_documento', kwargs={'pk': self.documento.pk}),
+                {'name': 'Renomeado'}, format='json'
+            )
+
+        self.assertIsNone(cache.get(f'documento:{self.documento.pk}'))
+        self.assertEqual(self.client.get(self.detail_url).data['name'], 'Renomeado')
+        self.assertEqual(self.client.get(self.list_url).data['results'][0]['name'], 'Renomeado')
+
+    def test_signer_change_invalidates_detail(self):
+        """Testa a invalidação após alteração de signatários"""
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Signatario.objects.create(
+                token="token_sig", status="pending", name="Signatário",
+                email="sig@test.com", documentID=self.documento,
+            )
+
+        self.assertEqual(len(self.client.get(self.detail_url).data['signers']), 1)
+
+    def test_stale_entry_is_not_served(self):
+        """Testa que entradas de versões antigas são ignoradas mesmo sem invalidação"""
+        self.client.get(self.detail_url)
+        Documento.objects.filter(pk=self.documento.pk).update(
+            name="Alterado em massa", last_updated_at=self.documento.last_updated_at + timedelta(seconds=1)
+        )
+
+        self.assertEqual(self.client.get(self.detail_url).data['name'], "Alterado em massa")
+
+
+class DocumentoFilterTest(APITestCase):
+    """Testes para os filtros e a busca da listagem de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.outra_empresa = Empresa.objects.create(name="Outra Empresa", apiToken="token_outra")
+        specs = [
+            ("Contrato de Locação", "pending", self.empresa),
+            ("Contrato de Serviço", "signed", self.empresa),
+            ("Procuração", "pending", self.outra_empresa),
+        ]
+        self.documentos = []
+        for i, (name, doc_status, empresa) in enumerate(specs):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=name, status=doc_status,
+                created_by="test@test.com", company_id=empresa,
+            )
+            Signatario.objects.create(
+                token=f"sig_{i}", status="pending", name=f"Signatário {i}",
+                email=f"sig{i}@test.com", documentID=documento,
+            )
+            self.documentos.append(documento)
+        self.url = reverse('get_documentos')
+
+    def _names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return sorted(item['name'] for item in response.data['results'])
+
+    def test_filters(self):
+        """Testa cada filtro e combinações na listagem"""
+        self.assertEqual(self._names(status='pending'), ["Contrato de Locação", "Procuração"])
+        self.assertEqual(self._names(status='pending,signed', company=self.empresa.id),
+                         ["Contrato de Locação", "Contrato de Serviço"])
+        self.assertEqual(self._names(search='contrato', status='signed'), ["Contrato de Serviço"])
+        self.assertEqual(self._names(signer_email='sig2@test.com'), ["Procuração"])
+        self.assertEqual(self._names(created_after='2000-01-01', created_before='2999-01-01'),
+                         ["Contrato de Locação", "Contrato de Serviço", "Procuração"])
+        self.assertEqual(self._names(updated_after='2999-01-01T00:00:00Z'), [])
+
+    def test_invalid_filters_are_rejected(self):
+        """Testa a validação dos valores de filtro"""
+        for params in ({'status': 'unknown'}, {'company': 'abc'}, {'search': 'ab'},
+                       {'created_after': 'ontem'}, {'signer_email': 'invalido'},
+                       {'created_after': '2025-02-01', 'created_before': '2025-01-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data['error_code'], 'VAL_001')
+
+    def test_supported_filters_use_indexes(self):
+        """Testa que cada filtro e combinação é atendido por índice, sem varredura sequencial"""
+        combinations = [
+            {'status': 'pending'},
+            {'company': str(self.empresa.id), 'status': 'pending'},
+            {'company': str(self.empresa.id)},
+            {'created_after': '2025-01-01'},
+            {'updated_after': '2025-01-01', 'updated_before': '2999-01-01'},
+            {'signer_email': 'sig1@test.com'},
+            {'search': 'contrato'},
+            {'search': 'contrato', 'status': 'signed', 'company': str(self.empresa.id)},
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for params in combinations:
+            filters = DocumentoListFilters.from_query_params(params)
+            plan = filters.apply(Documento.objects.order_by('-created_at', '-id')).explain()
+            self.assertNotIn('Seq Scan', plan, params)
+
+    def test_short_search_is_rejected(self):
+        """Testa que buscas curtas demais para o índice trigram são recusadas"""
+        with self.assertRaises(InvalidFilterException):
+            DocumentoListFilters.from_query_params({'search': 'ab'})
+
+
+class DocumentoFieldsetTest(APITestCase):
+    """Testes para ?fields= e ?include=signers nas leituras de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        for i in range(3):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}", status="pending",
+                created_by="test@test.com", company_id=self.empresa,
+            )
+            Signatario.objects.create(
+                token=f"sig_{i}", status="pending", name=f"Signatário {i}",
+                email=f"sig{i}@test.com", documentID=documento,
+            )
+        self.documento = documento
+        self.url = reverse('get_documentos')
+
+    def test_default_response_is_unchanged(self):
+        """Testa que sem ?fields= a resposta traz todos os campos e os signatários"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = response.data['results'][0]
+        self.assertIn('token', item)
+        self.assertIn('company_id', item)
+        self.assertEqual(len(item['signers']), 1)
+
+    def test_sparse_list_skips_signers_and_columns(self):
+        """Testa que ?fields= limita as colunas e dispensa a busca de signatários"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,name,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'status'})
+        page_query = [q['sql'] for q in queries.captured_queries if 'ORDER BY' in q['sql']][-1]
+        self.assertNotIn('"document"."token"', page_query)
+        self.assertNotIn('"document"."created_by"', page_query)
+        self.assertFalse(any('FROM "signers"' in q['sql'] for q in queries.captured_queries))
+
+    def test_include_signers(self):
+        """Testa que ?include=signers embute os signatários em uma única consulta extra"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,name', 'include': 'signers'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = response.data['results'][0]
+        self.assertEqual(set(item), {'id', 'name', 'signers'})
+        self.assertEqual(len(item['signers']), 1)
+        self.assertEqual(sum('FROM "signers"' in q['sql'] for q in queries.captured_queries), 1)
+
+    def test_sparse_detail(self):
+        """Testa ?fields= no detalhe e que a variante não reaproveita o cache do formato completo"""
+        url = reverse('get_documento', kwargs={'pk': self.documento.id})
+        full = self.client.get(url)
+        self.assertIn('signers', full.data)
+        response = self.client.get(url, {'fields': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'name': self.documento.name})
+
+    def test_invalid_fieldsets_are_rejected(self):
+        """Testa a validação de ?fields= e ?include="""
+        for params in ({'fields': 'id,senha'}, {'fields': ''}, {'include': 'company'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data['error_code'], 'VAL_001')
+        with self.assertRaises(InvalidFieldsetException):
+            DocumentoFieldset.from_query_params({'fields': 'signatario_set'})
+
+
+class DocumentoPaginationTest(APITestCase):
+    """Testes para a paginação por cursor da listagem de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(
+            name="Empresa Teste",
+            apiToken="token_teste"
+        )
+        self.documentos = [
+            Documento.objects.create(
+                openID=i,
+                token=f"token_doc_{i}",
+                name=f"Documento {i}",
+                status="pending",
+                created_by="test@test.com",
+                company_id=self.empresa,
+            )
+            for i in range(5)
+        ]
+        self.url = reverse('get_documentos')
+
+    def _collect_pages(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids, pages
+
+    def test_pages_cover_all_documents_newest_first(self):
+        """Testa que a navegação por cursor percorre todos os documentos sem repetição"""
+        ids, pages = self._collect_pages(f'{self.url}?page_size=2')
+
+        expected = [doc.id for doc in reversed(self.documentos)]
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_pages_with_identical_created_at(self):
+        """Testa o desempate por id quando created_at é igual"""
+        Documento.objects.update(created_at=self.documentos[0].created_at)
+
+        ids, _ = self._collect_pages(f'{self.url}?page_size=2')
+
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(ids), len(self.documentos))
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Testa que o cursor anterior retorna a página anterior"""
+        first = self.client.get(f'{self.url}?page_size=2').data
+        second = self.client.get(first['next']).data
+        previous = self.client.get(second['previous']).data
+
+        self.assertEqual(
+            [item['id'] for item in previous['results']],
+            [item['id'] for item in first['results']]
+        )
+        self.assertIsNone(previous['previous'])
+
+    @patch('api.pagination.AppConfig.get_pagination_config')
+    def test_page_size_is_capped(self, mock_config):
+        """Testa que o page_size solicitado respeita o máximo configurado"""
+        mock_config.return_value = {'page_size': 2, 'max_page_size': 3}
+
+        response = self.client.get(f'{self.url}?page_size=1000')
+
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor(self):
+        """Testa a resposta para um cursor inválido"""
+        response = self.client.get(f'{self.url}?cursor=invalido')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentoValuesSerializerTest(TestCase):
+    """Testes para o serializador rápido das listagens (values())"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        for i in range(4):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Procuração nº {i} \"ação\"", status="pending",
+                created_by="test@test.com", company_id=empresa,
+                externalID=f"ext_{i}" if i % 2 else None,
+            )
+            # Documento sem signatários, com um e com vários
+            for j in range(i % 3):
+                Signatario.objects.create(
+                    token=f"sig_{i}_{j}", status="new", name=f"Signatário {i}.{j}",
+                    email=f"sig{i}{j}@test.com", documentID=documento,
+                    externalID=None if j else f"ext_sig_{i}",
+                )
+
+    def _render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_output_matches_model_serializer_byte_for_byte(self):
+        """Testa que a saída é idêntica à de DocumentoWithSignersSerializer"""
+        queryset = Documento.objects.order_by('-created_at', '-id')
+        expected = DocumentoWithSignersSerializer(queryset.with_signers(), many=True).data
+        rows = queryset.values(*DocumentoValuesSerializer.values_fields())
+        self.assertEqual(
+            self._render(DocumentoValuesSerializer(rows, many=True).data),
+            self._render(expected)
+        )
+
+    def test_sparse_output_matches_model_serializer(self):
+        """Testa a equivalência também com campos restritos"""
+        queryset = Documento.objects.order_by('id')
+        for fields in (('id', 'name', 'status'), ('created_at', 'signers'), ('company_id',)):
+            expected = DocumentoWithSignersSerializer(queryset.with_signers(), many=True, fields=fields).data
+            rows = queryset.values('id', *DocumentoValuesSerializer.values_fields(fields))
+            actual = DocumentoValuesSerializer(rows, many=True, fields=fields).data
+            self.assertEqual(self._render(actual), self._render(expected), fields)
+
+    def test_signers_loaded_in_one_query(self):
+        """Testa que a página inteira usa uma consulta de documentos e uma de signatários"""
+        rows = Documento.objects.values(*DocumentoValuesSerializer.values_fields())
+        with self.assertNumQueries(2):
+            DocumentoValuesSerializer(rows, many=True).data
+
+
+class FastJSONTest(TestCase):
+    """Testes para o renderer e o parser JSON rápidos (orjson com fallback na stdlib)"""
+
+    def _sample(self):
+        from datetime import date, datetime, time as dt_time, timezone as dt_timezone
+        from decimal import Decimal
+        from uuid import UUID
+        from django.utils.translation import gettext_lazy
+        return {
+            'utc': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'local': timezone.localtime(datetime(2025, 6, 1, 12, 0, tzinfo=dt_timezone.utc)),
+            'naive': datetime(2025, 1, 2, 3, 4, 5, 123456),
+            'date': date(2025, 1, 2),
+            'time': dt_time(3, 4, 5, 678901),
+            'decimal': Decimal('10.50'),
+            'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Documento'),
+            'unicode': 'Procuração \u2028 \u2029 "aspas"',
+            1: [None, True, 1.5, (1, 2)],
         }
-        mock_post.return_value = mock_response
-        
-        document_data = {
-            'name': 'Test Document',
+
+    def test_renderer_matches_drf_output(self):
+        """Testa que o FastJSONRenderer gera os mesmos bytes do JSONRenderer do DRF"""
+        data = self._sample()
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        with self.settings(JSON_BACKEND='json'):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        with patch('api.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_falls_back_on_orjson_limits(self):
+        """Testa o fallback para a stdlib em inteiros acima de 64 bits e a notação de floats"""
+        data = {'big': 2 ** 70, 'name': 'Procuração'}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(json.loads(FastJSONRenderer().render({'value': 1e16})), {'value': 1e16})
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
+
+    def test_renderer_indent_uses_stdlib(self):
+        """Testa que respostas indentadas mantêm o formato do DRF"""
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser(self):
+        """Testa o parser rápido, inclusive erros e constantes não permitidas"""
+        from io import BytesIO
+        body = '{"name": "Procuração", "values": [1, 2.5, null]}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        for invalid in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(invalid))
+        with self.settings(JSON_BACKEND='json'):
+            self.assertEqual(FastJSONParser().parse(BytesIO(body))['name'], 'Procuração')
+
+    def test_api_responses_use_fast_renderer(self):
+        """Testa que a API usa o renderer e o parser configurados"""
+        from rest_framework.settings import api_settings
+        self.assertIs(api_settings.DEFAULT_RENDERER_CLASSES[0], FastJSONRenderer)
+        self.assertIs(api_settings.DEFAULT_PARSER_CLASSES[0], FastJSONParser)
+
+
+class DocumentoStreamingTest(APITestCase):
+    """Testes para o modo streaming da listagem de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(
+            name="Empresa Teste",
+            apiToken="token_teste"
+        )
+        for i in range(3):
+            documento = Documento.objects.create(
+                openID=i,
+                token=f"token_doc_{i}",
+                name=f"Documento {i}",
+                status="pending",
+                created_by="test@test.com",
+                company_id=self.empresa,
+            )
+            Signatario.objects.create(
+                token=f"token_sig_{i}",
+                status="pending",
+                name=f"Signatário {i}",
+                email=f"sig{i}@test.com",
+                documentID=documento,
+            )
+        self.url = reverse('get_documentos')
+
+    @staticmethod
+    def _read(response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_stream_ndjson(self):
+        """Testa o streaming NDJSON com signatários embutidos"""
+        response = self.client.get(f'{self.url}?stream=ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in self._read(response).splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]['name'], 'Documento 2')
+        self.assertEqual(len(lines[0]['signers']), 1)
+
+    def test_stream_ndjson_via_accept_header(self):
+        """Testa a negociação do streaming NDJSON pelo header Accept"""
+        response = self.client.get(self.url, HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(self._read(response).splitlines()), 3)
+
+    @patch('api.streaming.AppConfig.STREAM_CHUNK_SIZE', 2)
+    def test_stream_json_array(self):
+        """Testa o streaming como array JSON em blocos"""
+        response = self.client.get(f'{self.url}?stream=json')
+
+        documentos = json.loads(self._read(response))
+        self.assertEqual([doc['name'] for doc in documentos],
+                         ['Documento 2', 'Documento 1', 'Documento 0'])
+
+    def test_stream_invalid_format(self):
+        """Testa a resposta para um formato de streaming inválido"""
+        response = self.client.get(f'{self.url}?stream=xml')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentoBatchCreateTest(APITestCase):
+    """Testes para a criação de documentos em lote"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(
+            name="Empresa Teste",
+            apiToken="token_teste"
+        )
+        self.url = reverse('create_documentos_batch')
+
+    def _item(self, i):
+        return {
+            'name': f'Documento {i}',
             'url_documento': 'http://example.com/doc.pdf',
-            'nome_signatario': 'Test User',
-            'email_signatario': 'test@example.com'
+            'nome_signatario': f'Signatário {i}',
+            'email_signatario': f'sig{i}@test.com',
+            'company_id': self.empresa.id
         }
-        
-        result = self.service.create_document(document_data)
-        
-        self.assertEqual(result['token'], 'test_token')
-        mock_post.assert_called_once()
-    
-    @patch('api.services.requests.post')
-    def test_create_document_api_error(self, mock_post):
-        """Testa erro na API ZapSign durante criação"""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = 'Bad Request'
-        mock_response.content = b'{"error": "Invalid data"}'
-        mock_post.return_value = mock_response
-        
-        document_data = {
-            'name': 'Test Document',
-            'url_documento': 'http://example.com/doc.pdf',
-            'nome_signatario': 'Test User',
-            'email_signatario': 'test@example.com'
+
+    @staticmethod
+    def _fake_create_document(data):
+        if data['name'] == 'Documento falha':
+            raise ZapSignAPIException("Erro na API ZapSign: falha", status_code=500)
+        return {
+            'open_id': 1,
+            'token': f"token_{data['name']}",
+            'status': 'pending',
+            'created_by': {'email': 'test@test.com'},
         }
-        
-        with self.assertRaises(ZapSignAPIException):
-            self.service.create_document(document_data)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_batch_create_reports_per_item_results(self, mock_create_document):
+        """Testa resultados individuais para itens válidos, inválidos e com erro no ZapSign"""
+        mock_create_document.side_effect = self._fake_create_document
+        items = [self._item(0), {'name': 'Sem campos'}, {**self._item(2), 'name': 'Documento falha'}, self._item(3)]
+
+        response = self.client.post(self.url, {'documents': items}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['created'], data['failed']), (2, 2))
+        self.assertEqual([result['success'] for result in data['results']], [True, False, False, True])
+        self.assertEqual(data['results'][1]['error_code'], 'VAL_001')
+        self.assertEqual(data['results'][2]['error_code'], 'ZAPSIGN_001')
+        self.assertEqual(data['results'][3]['data']['token'], 'token_Documento 3')
+        self.assertEqual(mock_create_document.call_count, 3)
+        self.assertEqual(Signatario.objects.filter(documentID__name='Documento 0').count(), 1)
+        self.assertEqual(
+            sorted(DocumentoOutbox.objects.values_list('status', flat=True)),
+            [OUTBOX_STATUS['COMPLETED'], OUTBOX_STATUS['COMPLETED'], OUTBOX_STATUS['FAILED']]
+        )
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_batch_create_query_count_is_constant(self, mock_create_document):
+        """Testa que o número de consultas não cresce com o tamanho do lote"""
+        mock_create_document.side_effect = self._fake_create_document
+
+        with CaptureQueriesContext(connection) as small_batch:
+            self.client.post(self.url, {'documents': [self._item(i) for i in range(2)]}, format='json')
+        with CaptureQueriesContext(connection) as large_batch:
+            self.client.post(self.url, {'documents': [self._item(i) for i in range(2, 22)]}, format='json')
+
+        self.assertEqual(len(small_batch), len(large_batch))
+        self.assertEqual(Documento.objects.count(), 22)
+
+    def test_batch_create_rejects_invalid_payload(self):
+        """Testa a validação do corpo da requisição em lote"""
+        response = self.client.post(self.url, {'documents': []}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentoBatchUpdateDeleteTest(APITestCase):
+    """Testes para a atualização e a exclusão de documentos em lote"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.documentos = []
+        for i in range(25):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}", status="pending",
+                created_by="test@test.com", company_id=self.empresa,
+            )
+            Signatario.objects.create(
+                token=f"sig_{i}", status="pending", name=f"Signatário {i}",
+                email=f"sig{i}@test.com", documentID=documento,
+            )
+            self.documentos.append(documento)
+
+    @staticmethod
+    def _fail_doc_1(token, *args):
+        if token == 'doc_1':
+            raise ZapSignAPIException("Erro na API ZapSign: falha", status_code=500)
+        return {'success': True}
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_batch_update_reports_per_item_results(self, mock_update_document):
+        """Testa resultados individuais para itens válidos, inválidos, inexistentes e com erro no ZapSign"""
+        mock_update_document.side_effect = self._fail_doc_1
+        doc_0, doc_1, doc_2 = self.documentos[:3]
+        last_updated_at = doc_0.last_updated_at
+        items = [
+            {'id': doc_0.pk, 'name': 'Novo 0'},
+            {'id': 99999, 'name': 'Inexistente'},
+            {'id': 'x', 'name': 'Inválido'},
+            {'id': doc_0.pk, 'name': 'Repetido'},
+            {'id': doc_1.pk, 'name': 'Novo 1'},
+            {'id': doc_2.pk},
+        ]
+
+        response = self.client.put(reverse('update_documentos_batch'), {'documents': items}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['updated'], data['failed']), (1, 5))
+        self.assertEqual(data['results'][0], {'index': 0, 'success': True, 'data': {'name': 'Novo 0'}})
+        self.assertEqual([result.get('error_code') for result in data['results'][1:]],
+                         ['DOC_001', 'VAL_001', 'VAL_001', 'ZAPSIGN_001', 'VAL_001'])
+        self.assertEqual(mock_update_document.call_count, 2)
+        mock_update_document.assert_any_call('doc_0', {'name': 'Novo 0'})
+        self.assertEqual(
+            list(Documento.objects.filter(pk__in=[doc_0.pk, doc_1.pk]).order_by('pk').values_list('name', flat=True)),
+            ['Novo 0', 'Documento 1']
+        )
+        doc_0.refresh_from_db()
+        self.assertGreater(doc_0.last_updated_at, last_updated_at)
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_batch_update_validates_items_before_remote_calls(self, mock_update_document):
+        """Testa que nomes inválidos são recusados por item, sem chamada ao ZapSign nem erro 500"""
+        doc_0, doc_1, doc_2 = self.documentos[:3]
+        items = [
+            {'id': doc_0.pk, 'name': 'x' * 256},
+            {'id': doc_1.pk, 'name': ['lista']},
+            {'id': doc_2.pk, 'name': 'Válido'},
+        ]
+
+        response = self.client.put(reverse('update_documentos_batch'), {'documents': items}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['updated'], data['failed']), (1, 2))
+        self.assertEqual([result.get('error_code') for result in data['results'][:2]], ['VAL_001', 'VAL_001'])
+        mock_update_document.assert_called_once_with('doc_2', {'name': 'Válido'})
+        self.assertEqual(
+            list(Documento.objects.filter(pk__in=[doc_0.pk, doc_1.pk, doc_2.pk]).order_by('pk')
+                 .values_list('name', flat=True)),
+            ['Documento 0', 'Documento 1', 'Válido']
+        )
+
+    @patch('api.services.ZapSignService.update_document')
+    def test_batch_update_query_count_is_constant(self, mock_update_document):
+        """Testa que o número de consultas não cresce com o tamanho do lote"""
+        def update(documentos):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.put(reverse('update_documentos_batch'), {'documents': [
+                    {'id': documento.pk, 'name': 'Atualizado'} for documento in documentos
+                ]}, format='json')
+            return len(queries)
+
+        self.assertEqual(update(self.documentos[:2]), update(self.documentos[2:22]))
+        self.assertEqual(Documento.objects.filter(name='Atualizado').count(), 22)
+
+    @patch('api.services.ZapSignService.delete_document')
+    def test_batch_delete_reports_per_item_results(self, mock_delete_document):
+        """Testa que só os documentos confirmados pelo ZapSign são excluídos"""
+        mock_delete_document.side_effect = self._fail_doc_1
+        doc_0, doc_1 = self.documentos[:2]
+
+        response = self.client.delete(
+            reverse('delete_documentos_batch'), {'ids': [doc_0.pk, doc_1.pk, 99999, None]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['deleted'], data['failed']), (1, 3))
+        self.assertEqual(data['results'][0], {'index': 0, 'success': True, 'data': {'id': doc_0.pk}})
+        self.assertEqual([result.get('error_code') for result in data['results'][1:]],
+                         ['ZAPSIGN_001', 'DOC_001', 'VAL_001'])
+        self.assertFalse(Documento.objects.filter(pk=doc_0.pk).exists())
+        self.assertFalse(Signatario.objects.filter(token='sig_0').exists())
+        self.assertTrue(Documento.objects.filter(pk=doc_1.pk).exists())
+
+    @patch('api.services.ZapSignService.delete_document')
+    def test_batch_delete_query_count_is_constant(self, mock_delete_document):
+        """Testa que a exclusão usa um número fixo de consultas"""
+        def delete(documentos):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.delete(reverse('delete_documentos_batch'),
+                                   {'ids': [documento.pk for documento in documentos]}, format='json')
+            return len(queries)
+
+        self.assertEqual(delete(self.documentos[:2]), delete(self.documentos[2:22]))
+        self.assertEqual(Documento.objects.count(), 3)
+        self.assertEqual(mock_delete_document.call_count, 22)
+
+    def test_invalid_payload(self):
+        """Testa a validação da lista do lote"""
+        response = self.client.delete(reverse('delete_documentos_batch'), {'ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.put(reverse('update_documentos_batch'), {'documents': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentoIndexesTest(TestCase):
+    """Testes para os índices e restrições de document e signers"""
+
+    def test_token_is_unique(self):
+        """Testa a unicidade do token do documento"""
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        fields = dict(openID=1, name="Documento", status="pending", created_by="test@test.com",
+                      company_id=empresa)
+        Documento.objects.create(token="token_unico", **fields)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Documento.objects.create(token="token_unico", **fields)
+
+    def test_indexes_exist(self):
+        """Testa que a migração concorrente criou os índices esperados"""
+        with connection.cursor() as cursor:
+            document = connection.introspection.get_constraints(cursor, 'document')
+            signers = connection.introspection.get_constraints(cursor, 'signers')
+
+        self.assertTrue(document['document_token_uniq']['unique'])
+        self.assertTrue(signers['signers_token_uniq']['unique'])
+        self.assertEqual(
+            document['document_company_status_idx']['columns'],
+            ['company_id', 'status', 'created_at', 'id']
+        )
+        self.assertIn('signers_email_idx', signers)
+
+
+class UniqueTokenMigrationTest(TransactionTestCase):
+    """Testes da criação concorrente das restrições de unicidade de token (migração 0004)"""
+
+    table = 'migration_token_test'
+    name = 'migration_token_test_uniq'
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.migration = importlib.import_module('api.migrations.0004_document_signers_indexes')
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE {self.table} (id serial PRIMARY KEY, token varchar(255))')
+            cursor.execute(f"INSERT INTO {self.table} (token) VALUES ('a'), ('b'), ('b')")
+        self.addCleanup(self._drop_table)
+
+    def _drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def _create_constraint(self):
+        with connection.schema_editor(atomic=False) as editor:
+            self.migration.create_unique_constraint(editor, self.table, 'token', self.name)
+
+    def test_duplicates_stop_before_creating_the_index(self):
+        """Testa o erro claro com tokens repetidos, sem deixar índice para trás"""
+        with self.assertRaisesMessage(self.migration.DuplicateTokensError, "'b' (2x)"):
+            self._create_constraint()
+
+        with connection.cursor() as cursor:
+            self.assertNotIn(self.name, connection.introspection.get_constraints(cursor, self.table))
+
+    def test_invalid_leftover_index_is_replaced(self):
+        """Testa a nova tentativa após uma criação concorrente que deixou o índice INVALID"""
+        with connection.cursor() as cursor:
+            with self.assertRaises(IntegrityError):
+                cursor.execute(f'CREATE UNIQUE INDEX CONCURRENTLY {self.name} ON {self.table} (token)')
+            cursor.execute(f"DELETE FROM {self.table} WHERE id = 3")
+
+        self._create_constraint()
+        self._create_constraint()
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, self.table)
+            cursor.execute('SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)', [self.name])
+            self.assertEqual(cursor.fetchone(), (True,))
+        self.assertTrue(constraints[self.name]['unique'])
+
+
+@skipUnless(settings.DB_POOL, "pool do psycopg 3 desligado (DB_POOL=0 ou psycopg_pool ausente)")
+class DatabasePoolTest(TestCase):
+    """Testes do pool de conexões com o Postgres"""
+
+    def test_connections_are_shared_between_threads(self):
+        """Testa que requisições em várias threads reaproveitam as conexões do pool"""
+        max_size = settings.DATABASES['default']['OPTIONS']['pool']['max_size']
+
+        def simulate_requests(count):
+            pids = set()
+            for _ in range(count):
+                request_started.send(sender=None)
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT pg_backend_pid()')
+                        pids.add(cursor.fetchone()[0])
+                finally:
+                    request_finished.send(sender=None)
+                # Ao fim da requisição a conexão volta ao pool
+                self.assertIsNone(connection.connection)
+            return pids
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pids = set().union(*executor.map(simulate_requests, [10] * 4))
+
+        self.assertLessEqual(len(pids), max_size)
+        self.assertGreaterEqual(connection.pool.get_stats()['requests_num'], 40)
+
+    def _request_backend_pid(self):
+        request_started.send(sender=None)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                return cursor.fetchone()[0]
+        finally:
+            request_finished.send(sender=None)
+
+    @skipUnless(settings.DATABASES['default']['CONN_HEALTH_CHECKS'], "DB_CONN_HEALTH_CHECKS desligado")
+    def test_broken_pooled_connections_are_replaced(self):
+        """Testa que conexões do pool encerradas pelo servidor são descartadas antes do uso"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(self._request_backend_pid).result()
+            with connection.cursor() as cursor:
+                # Derruba as conexões ociosas do pool, como um restart do Postgres ou um proxy
+                cursor.execute(
+                    'SELECT pg_terminate_backend(pid) FROM pg_stat_activity '
+                    'WHERE datname = current_database() AND pid <> pg_backend_pid()'
+                )
+            pids = [executor.submit(self._request_backend_pid).result() for _ in range(3)]
+
+        self.assertEqual(len(pids), 3)
+
+
+class ZapSignWebhookTest(APITestCase):
+    """Testes para o webhook do ZapSign e a atualização de status em lote"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.documentos = []
+        for i in range(10):
+            documento = Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}", status="pending",
+                created_by="test@test.com", company_id=empresa,
+            )
+            Signatario.objects.create(
+                token=f"sig_{i}", status="pending", name=f"Signatário {i}",
+                email=f"sig{i}@test.com", documentID=documento,
+            )
+            self.documentos.append(documento)
+        self.url = reverse('zapsign_webhook')
+        self.buffer = StatusUpdateBuffer(batch_size=500, flush_interval=None)
+        patcher = patch('api.views.get_webhook_buffer', return_value=self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_is_collapsed_into_few_queries(self):
+        """Testa que uma rajada de eventos custa poucas consultas"""
+        events = []
+        for i in range(10):
+            events += [
+                {'token': f"doc_{i}", 'status': 'signed', 'last_update_at': '2026-01-01T10:00:02Z',
+                 'signers': [{'token': f"sig_{i}", 'status': 'signed'}]},
+                # Atrasado e fora de ordem: não pode desfazer o status final
+                {'token': f"doc_{i}", 'status': 'pending', 'last_update_at': '2026-01-01T10:00:05Z'},
+                {'token': f"doc_{i}", 'status': 'signed', 'last_update_at': '2026-01-01T10:00:02Z'},
+            ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, events, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        # Inclui a gravação dos eventos na fila, a retirada do bloco e a remoção das linhas aplicadas
+        self.assertLessEqual(len(queries), 10)
+        self.assertEqual(Documento.objects.filter(status='signed').count(), 10)
+        self.assertEqual(Signatario.objects.filter(status='signed').count(), 10)
+
+    def test_final_status_is_not_regressed(self):
+        """Testa que eventos posteriores não sobrescrevem status finais"""
+        Documento.objects.filter(token="doc_0").update(status='expired')
+
+        result = DocumentoService().apply_status_updates({'doc_0': 'pending', 'doc_1': 'cancelled',
+                                                          'desconhecido': 'signed'}, {})
+
+        self.assertEqual(result['documents_updated'], 1)
+        self.assertEqual(result['documents_unknown'], 1)
+        self.assertEqual(Documento.objects.get(token="doc_0").status, 'expired')
+        self.assertEqual(Documento.objects.get(token="doc_1").status, 'cancelled')
+
+    def test_signer_change_touches_document(self):
+        """Testa que a mudança de um signatário atualiza last_updated_at do documento"""
+        before = Documento.objects.get(token="doc_3").last_updated_at
+
+        response = self.client.post(self.url, {
+            'event_type': 'doc_signed',
+            'signer_who_signed': {'token': 'sig_3', 'status': 'signed'},
+        }, format='json')
+
+        self.assertEqual(response.data['data'], {'documents': 0, 'signers': 1, 'ignored': 0})
+        self.assertEqual(Signatario.objects.get(token="sig_3").status, 'signed')
+        self.assertGreater(Documento.objects.get(token="doc_3").last_updated_at, before)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_signer_event_applies_to_document_created_by_api(self, mock_create_document):
+        """Testa que eventos de signatário se aplicam a documentos criados pela API (token do signatário)"""
+        empresa = Empresa.objects.get()
+        api_results = [
+            FakeZapSignHandler._route('POST', None, None, {'name': f'Contrato {i}'}) for i in range(2)
+        ]
+        mock_create_document.side_effect = api_results
+        self.client.post(reverse('create_documento'), {
+            'name': 'Contrato 0', 'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva', 'email_signatario': 'joao@test.com', 'company_id': empresa.id,
+        }, format='json')
+        self.client.post(reverse('create_documentos_batch'), {'documents': [{
+            'name': 'Contrato 1', 'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'Maria Souza', 'email_signatario': 'maria@test.com', 'company_id': empresa.id,
+        }]}, format='json')
+        signer_tokens = [api_result['signers'][0]['token'] for api_result in api_results]
+
+        response = self.client.post(self.url, [
+            {'token': api_result['token'], 'status': 'pending',
+             'signers': [{'token': signer_token, 'status': 'signed'}]}
+            for api_result, signer_token in zip(api_results, signer_tokens)
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            sorted(Signatario.objects.filter(status='signed').values_list('token', flat=True)),
+            sorted(signer_tokens)
+        )
+
+    @patch.object(AppConfig, 'ZAPSIGN_WEBHOOK_SECRET', 'segredo')
+    def test_secret_is_required_when_configured(self):
+        """Testa a validação do header X-Webhook-Secret"""
+        event = {'token': 'doc_0', 'status': 'signed'}
+
+        denied = self.client.post(self.url, event, format='json', HTTP_X_WEBHOOK_SECRET='errado')
+        accepted = self.client.post(self.url, event, format='json', HTTP_X_WEBHOOK_SECRET='segredo')
+
+        self.assertEqual(denied.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(accepted.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_buffer_keeps_prevailing_event_per_token(self):
+        """Testa que o buffer colapsa eventos e só aplica no flush"""
+        apply = Mock(return_value={})
+        buffer = StatusUpdateBuffer(batch_size=500, flush_interval=60, apply=apply)
+        buffer._ensure_thread = Mock()
+        older, newer = timezone.now() - timedelta(seconds=5), timezone.now()
+
+        buffer.add([('doc_0', 'pending', newer), ('doc_0', 'signed', older), ('doc_1', 'pending', older)], [])
+        buffer.add([('doc_1', 'cancelled', newer)], [('sig_0', 'pending', older)])
+
+        self.assertEqual(len(buffer), 5)
+        apply.assert_not_called()
+        buffer.flush()
+        apply.assert_called_once_with(
+            {'doc_0': 'signed', 'doc_1': 'cancelled'}, {'sig_0': 'pending'},
+            {'doc_0': older, 'doc_1': newer}, {'sig_0': older},
+        )
+        self.assertEqual(len(buffer), 0)
+
+    def test_older_event_in_later_chunk_is_discarded(self):
+        """Testa que um evento mais antigo, retirado em outro bloco, não sobrescreve um status mais recente"""
+        buffer = StatusUpdateBuffer(batch_size=1, flush_interval=60)
+        buffer._ensure_thread = Mock()
+        older, newer = timezone.now() - timedelta(seconds=5), timezone.now()
+        # Status intermediário qualquer: o bloco de um evento não enxerga o do outro
+        buffer.add([('doc_0', 'in_progress', newer)], [])
+        buffer.add([('doc_0', 'pending', older)], [])
+
+        result = buffer.flush()
+
+        self.assertEqual(result['documents_updated'], 1)
+        documento = Documento.objects.get(token="doc_0")
+        self.assertEqual(documento.status, 'in_progress')
+        self.assertEqual(documento.status_event_at, newer)
+        self.assertEqual(len(buffer), 0)
+
+    def test_accepted_events_survive_process_loss(self):
+        """Testa que eventos confirmados com 202 ficam gravados e são aplicados por outro processo"""
+        self.buffer.flush_interval = 60
+        self.buffer._ensure_thread = Mock()
+
+        response = self.client.post(self.url, {
+            'token': 'doc_0', 'status': 'signed', 'signers': [{'token': 'sig_0', 'status': 'signed'}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(WebhookStatusUpdate.objects.count(), 2)
+        # Novo buffer, como o de um processo reiniciado, aplica o que ficou pendente
+        result = StatusUpdateBuffer(batch_size=1, flush_interval=None).flush()
+        self.assertEqual((result['documents_updated'], result['signers_updated']), (1, 1))
+        self.assertEqual(Documento.objects.get(token='doc_0').status, 'signed')
+        self.assertFalse(WebhookStatusUpdate.objects.exists())
+
+    def test_failed_flush_keeps_pending_events(self):
+        """Testa que uma falha ao aplicar o lote mantém os eventos na fila"""
+        buffer = StatusUpdateBuffer(batch_size=500, flush_interval=60,
+                                    apply=Mock(side_effect=RuntimeError('falha')))
+        buffer._ensure_thread = Mock()
+        buffer.add([('doc_0', 'signed', timezone.now())], [])
+
+        with self.assertRaises(RuntimeError):
+            buffer.flush()
+
+        self.assertEqual(len(buffer), 1)
+
+    def test_malformed_event_date_is_ignored(self):
+        """Testa que uma data inexistente no evento não derruba a requisição"""
+        response = self.client.post(self.url, {
+            'token': 'doc_0', 'status': 'signed', 'last_update_at': '2026-13-45T10:00:00Z',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Documento.objects.get(token='doc_0').status, 'signed')
+
+
+class SyncDocumentStatusCommandTest(TestCase):
+    """Testes para o comando sync_document_status"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.documentos = [
+            Documento.objects.create(
+                openID=i, token=f"doc_{i}", name=f"Documento {i}",
+                status="signed" if i == 0 else "pending",
+                created_by="test@test.com", company_id=empresa,
+            )
+            for i in range(6)
+        ]
+        checkpoint_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(checkpoint_dir.cleanup)
+        self.checkpoint = os.path.join(checkpoint_dir.name, 'checkpoint.json')
+
+    @staticmethod
+    def _remote_document(token):
+        return {'token': token, 'status': 'signed' if token in ('doc_2', 'doc_4') else 'pending'}
+
+    def _call(self, **options):
+        call_command('sync_document_status', checkpoint=self.checkpoint, batch_size=2,
+                     rate=1000, stdout=StringIO(), **options)
+
+    @patch('api.services.ZapSignService.get_document')
+    def test_sync_updates_only_changed_rows(self, mock_get_document):
+        """Testa que apenas documentos não finais são consultados e só mudanças são gravadas"""
+        mock_get_document.side_effect = self._remote_document
+
+        with CaptureQueriesContext(connection) as queries:
+            self._call()
+
+        self.assertEqual(mock_get_document.call_count, 5)
+        self.assertEqual(
+            list(Documento.objects.filter(status='signed').order_by('pk').values_list('token', flat=True)),
+            ['doc_0', 'doc_2', 'doc_4']
+        )
+        updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    @patch('api.services.ZapSignService.get_document')
+    def test_sync_resumes_from_checkpoint(self, mock_get_document):
+        """Testa a retomada a partir do checkpoint após uma interrupção"""
+        mock_get_document.side_effect = [
+            self._remote_document('doc_1'), self._remote_document('doc_2'),
+            ZapSignUnavailableException(30),
+        ]
+
+        with self.assertRaises(CommandError):
+            self._call(concurrency=1)
+        with open(self.checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)['last_id'], self.documentos[2].pk)
+
+        mock_get_document.reset_mock(side_effect=True)
+        mock_get_document.side_effect = self._remote_document
+        self._call()
+
+        fetched = [call.args[0] for call in mock_get_document.call_args_list]
+        self.assertEqual(sorted(fetched), ['doc_3', 'doc_4', 'doc_5'])
+        self.assertEqual(Documento.objects.get(token='doc_4').status, 'signed')
+
+    @patch('api.services.ZapSignService.get_document')
+    @patch('api.services.ZapSignService.create_document')
+    def test_sync_updates_signers_by_their_own_token(self, mock_create_document, mock_get_document):
+        """Testa que a sincronização atualiza signatários cujo token difere do token do documento"""
+        api_result = FakeZapSignHandler._route('POST', None, None, {'name': 'Contrato'})
+        mock_create_document.return_value = api_result
+        DocumentoService().create_document({
+            'name': 'Contrato', 'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva', 'email_signatario': 'joao@test.com',
+            'company_id': self.documentos[0].company_id_id,
+        })
+        signer_token = api_result['signers'][0]['token']
+        Documento.objects.exclude(token=api_result['token']).update(status='signed')
+        mock_get_document.return_value = {
+            'token': api_result['token'], 'status': 'pending',
+            'signers': [{'token': signer_token, 'status': 'signed'}],
+        }
+
+        self._call()
+
+        mock_get_document.assert_called_once_with(api_result['token'])
+        self.assertNotEqual(signer_token, api_result['token'])
+        self.assertEqual(Signatario.objects.get(token=signer_token).status, 'signed')
+
+    def test_rate_limiter_spaces_calls(self):
+        """Testa que o token bucket espera quando as fichas acabam"""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+
+class ReadCoalescingTest(TransactionTestCase):
+    """Testes para a coalescência de leituras idênticas simultâneas"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        for i in range(3):
+            Documento.objects.create(openID=i, token=f"doc_{i}", name=f"Documento {i}", company_id=empresa)
+        single_flight.reset()
+        cache.clear()
+
+    def _get_concurrently(self, url, count, headers=None):
+        """Dispara count GETs; os seguintes só começam com a primeira execução em andamento"""
+        started = threading.Event()
+        original = BaseViewMixin.list_and_respond
+
+        def slow_list_and_respond(*args, **kwargs):
+            started.set()
+            time.sleep(0.3)
+            return original(*args, **kwargs)
+
+        def get(index):
+            try:
+                return self.client.get(url, headers=(headers or {}).get(index, {}))
+            finally:
+                connection.close()
+
+        with patch('api.views.BaseViewMixin.list_and_respond', side_effect=slow_list_and_respond) as mock_list:
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                first = executor.submit(get, 0)
+                started.wait(5)
+                followers = list(executor.map(get, range(1, count)))
+                responses = [first.result()] + followers
+        return responses, mock_list.call_count
+
+    def test_identical_requests_share_one_execution(self):
+        """Testa que GETs idênticos simultâneos executam a listagem uma única vez"""
+        responses, executions = self._get_concurrently(reverse('get_documentos'), 5)
+
+        self.assertEqual(executions, 1)
+        self.assertEqual([r.status_code for r in responses], [status.HTTP_200_OK] * 5)
+        self.assertEqual(len({r.content for r in responses}), 1)
+        self.assertEqual(len(responses[-1].json()['results']), 3)
+
+        stats = self.client.get(reverse('get_coalescing_stats')).json()['data']
+        self.assertEqual(stats['by_endpoint']['get_documentos']['coalesced'], 4)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertTrue(stats['enabled'])
+
+    def test_other_clients_are_not_coalesced(self):
+        """Testa que clientes diferentes (Authorization) não compartilham a resposta"""
+        headers = {index: {'Authorization': f'Bearer cliente-{index}'} for index in range(3)}
+        _, executions = self._get_concurrently(reverse('get_documentos'), 3, headers)
+        self.assertEqual(executions, 3)
+
+    def test_disabled(self):
+        """Testa COALESCE_READS_ENABLED=0"""
+        with patch.object(AppConfig, 'COALESCE_READS_ENABLED', False):
+            _, executions = self._get_concurrently(reverse('get_documentos'), 3)
+        self.assertEqual(executions, 3)
+
+    def test_flight_key(self):
+        """Testa os componentes da chave: caminho, query, cliente e versão dos dados"""
+        factory = AsyncRequestFactory()
+        base = _flight_key('get_documentos', factory.get('/api/documento?status=signed'), 'v1')
+        self.assertEqual(base, _flight_key('get_documentos', factory.get('/api/documento?status=signed'), 'v1'))
+        self.assertNotEqual(base, _flight_key('get_documentos', factory.get('/api/documento?status=pending'), 'v1'))
+        self.assertNotEqual(base, _flight_key('get_documentos', factory.get('/api/documento?status=signed'), 'v2'))
+        self.assertNotEqual(base, _flight_key(
+            'get_documentos', factory.get('/api/documento?status=signed', headers={'Authorization': 'x'}), 'v1'
+        ))
+
+    def test_followers_get_snapshot_of_view_response(self):
+        """Testa que quem aguardava recebe a resposta da view, sem os headers acrescentados depois pelo líder"""
+        started, release = threading.Event(), threading.Event()
+
+        @coalesced('teste', version=lambda request: 'v1')
+        def view(request):
+            started.set()
+            release.wait(5)
+            return Response({'ok': True}, headers={'X-View': '1'})
+
+        def leader():
+            response = view(Request(RequestFactory().get('/teste')))
+            # Como os decoradores e o finalize_response do líder, depois da execução
+            response['X-Leader'] = '1'
+            return response
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(leader)
+            started.wait(5)
+            second = executor.submit(view, Request(RequestFactory().get('/teste')))
+            time.sleep(0.2)
+            release.set()
+            leader_response, follower_response = first.result(), second.result()
+
+        self.assertIsNot(follower_response, leader_response)
+        self.assertEqual(follower_response['X-View'], '1')
+        self.assertFalse(follower_response.has_header('X-Leader'))
+        self.assertEqual(single_flight.snapshot()['by_endpoint']['teste']['coalesced'], 1)
+
+    def test_errors_are_shared(self):
+        """Testa que a exceção da execução é repassada a quem aguardava"""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("falha")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(flight.do, 'teste', 'chave', failing)
+            started.wait(5)
+            second = executor.submit(flight.do, 'teste', 'chave', failing)
+            for future in (first, second):
+                with self.assertRaises(ValueError):
+                    future.result()
+
+        self.assertEqual(flight.snapshot()['by_endpoint']['teste'],
+                         {'executed': 1, 'coalesced': 1, 'errors': 1, 'timeouts': 0})
+        self.assertEqual(flight.snapshot()['in_flight'], 0)
+
+
+class IdempotencyKeyTest(TransactionTestCase):
+    """Testes para o header Idempotency-Key na criação de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        self.url = reverse('create_documento')
+        self.data = {
+            'name': 'Novo Documento',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva',
+            'email_signatario': 'joao@test.com',
+            'company_id': self.empresa.id
+        }
+        self.calls = 0
+
+    def _create_document(self, data):
+        self.calls += 1
+        return {'open_id': self.calls, 'token': f'token_{self.calls}', 'status': 'pending',
+                'created_by': {'email': 'test@test.com'}}
+
+    def _post(self, key, data=None):
+        return self.client.post(self.url, data or self.data, content_type='application/json',
+                                headers={'Idempotency-Key': key})
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_retry_replays_stored_response(self, mock_create_document):
+        """Testa que a repetição devolve a resposta gravada sem nova chamada ao ZapSign"""
+        mock_create_document.side_effect = self._create_document
+
+        first = self._post('chave-1')
+        second = self._post('chave-1')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(mock_create_document.call_count, 1)
+        self.assertEqual(Documento.objects.count(), 1)
+
+        # Outra chave (ou nenhuma) cria outro documento
+        self.assertEqual(self._post('chave-2').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Documento.objects.count(), 2)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_key_reused_with_other_body(self, mock_create_document):
+        """Testa que a mesma chave com outro corpo é rejeitada"""
+        mock_create_document.side_effect = self._create_document
+        self._post('chave-1')
+
+        response = self._post('chave-1', {**self.data, 'name': 'Outro'})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json()['error_code'], 'IDEMP_422')
+        self.assertEqual(mock_create_document.call_count, 1)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_validation_error_releases_key(self, mock_create_document):
+        """Testa que um erro de validação, antes da chamada ao ZapSign, libera a chave"""
+        mock_create_document.side_effect = self._create_document
+        invalid = {**self.data, 'name': ''}
+
+        self.assertEqual(self._post('chave-1', invalid).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        mock_create_document.assert_not_called()
+
+    @patch('api.services.requests.Session.request')
+    def test_error_after_remote_call_is_replayed(self, mock_request):
+        """Testa que um timeout após o envio ao ZapSign mantém a chave e não cria outro documento"""
+        get_circuit_breaker().reset()
+        self.addCleanup(get_circuit_breaker().reset)
+        mock_request.side_effect = requests.ReadTimeout('timeout de leitura')
+
+        first = self._post('chave-1')
+        retry = self._post('chave-1')
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(IdempotencyKey.objects.get().status, IDEMPOTENCY_STATUS['FAILED'])
+
+    @patch('api.services.requests.Session.request')
+    def test_open_circuit_releases_key(self, mock_request):
+        """Testa que a recusa pelo circuito aberto (nada enviado ao ZapSign) libera a chave"""
+        breaker = get_circuit_breaker()
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+        for _ in range(breaker.minimum_calls):
+            breaker.record_failure()
+
+        response = self._post('chave-1')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        mock_request.assert_not_called()
+
+    def test_batch_processing_timeout_covers_worst_case(self):
+        """Testa que a chave de um lote em andamento não é assumida antes do pior caso do lote"""
+        timeout = idempotency.processing_timeout(idempotency.batch_sequential_calls())
+        self.assertGreater(timeout, AppConfig.IDEMPOTENCY_PROCESSING_TIMEOUT)
+        IdempotencyKey.objects.create(
+            scope='create_documentos_batch', key='chave-1', status=IDEMPOTENCY_STATUS['PROCESSING'],
+            request_hash='0' * 64, expires_at=timezone.now() + timedelta(hours=1),
+        )
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(seconds=AppConfig.IDEMPOTENCY_PROCESSING_TIMEOUT + 1)
+        )
+
+        claimed, record = idempotency.claim('create_documentos_batch', 'chave-1', '0' * 64, timeout)
+        self.assertFalse(claimed)
+        claimed, _ = idempotency.claim('create_documentos_batch', 'chave-1', '0' * 64)
+        self.assertTrue(claimed)
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_expired_key_is_reused(self, mock_create_document):
+        """Testa que a chave expirada executa a requisição de novo e que o purge a remove"""
+        mock_create_document.side_effect = self._create_document
+        self._post('chave-1')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self._post('chave-1')
+
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(mock_create_document.call_count, 2)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn('Chaves removidas: 1', out.getvalue())
+
+    def test_invalid_key(self):
+        """Testa a validação do tamanho da chave"""
+        response = self._post('x' * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['error_code'], 'VAL_001')
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_concurrent_duplicates_wait_for_first(self, mock_create_document):
+        """Testa que repetições simultâneas recebem a resposta da primeira requisição"""
+        started = threading.Event()
+
+        def slow_create_document(data):
+            started.set()
+            time.sleep(0.3)
+            return self._create_document(data)
+
+        mock_create_document.side_effect = slow_create_document
+
+        def post(_):
+            try:
+                return self._post('chave-1')
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(post, 0)
+            started.wait(5)
+            followers = list(executor.map(post, range(3)))
+            responses = [first.result()] + followers
+
+        self.assertEqual([r.status_code for r in responses], [status.HTTP_201_CREATED] * 4)
+        self.assertEqual(len({r.content for r in responses}), 1)
+        self.assertEqual(mock_create_document.call_count, 1)
+        self.assertEqual(Documento.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.get().status, IDEMPOTENCY_STATUS['COMPLETED'])
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_in_progress_after_wait_timeout(self, mock_create_document):
+        """Testa o 409 quando a primeira requisição não termina dentro da espera"""
+        IdempotencyKey.objects.create(
+            scope='create_documento', key='chave-1', status=IDEMPOTENCY_STATUS['PROCESSING'],
+            request_hash='0' * 64,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        with patch.object(AppConfig, 'IDEMPOTENCY_WAIT_TIMEOUT', 0):
+            with patch('api.idempotency._request_hash', return_value='0' * 64):
+                response = self._post('chave-1')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Retry-After'], '1')
+        mock_create_document.assert_not_called()
+
+
+class DocumentoOutboxTest(TransactionTestCase):
+    """Testes para o fluxo de criação com outbox (sem transação durante a chamada externa)"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.empresa = Empresa.objects.create(
+            name="Empresa Teste",
+            apiToken="token_teste"
+        )
+        self.data = {
+            'name': 'Novo Documento',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva',
+            'email_signatario': 'joao@test.com',
+            'company_id': self.empresa.id
+        }
+        self.api_result = {
+            'open_id': 456,
+            'token': 'new_token',
+            'status': 'pending',
+            'created_by': {'email': 'test@test.com'},
+        }
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_remote_call_runs_outside_transaction(self, mock_create_document):
+        """Testa que a chamada ao ZapSign ocorre sem transação aberta e após registrar a intenção"""
+        observed = {}
+
+        def create_document(data):
+            observed['in_atomic_block'] = connection.in_atomic_block
+            observed['outbox_status'] = list(DocumentoOutbox.objects.values_list('status', flat=True))
+            return self.api_result
+
+        mock_create_document.side_effect = create_document
+
+        response = self.client.post(reverse('create_documento'), self.data, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(observed['in_atomic_block'])
+        self.assertEqual(observed['outbox_status'], [OUTBOX_STATUS['PENDING']])
+        outbox = DocumentoOutbox.objects.get()
+        self.assertEqual(outbox.status, OUTBOX_STATUS['COMPLETED'])
+        self.assertEqual(outbox.documentID.token, 'new_token')
+
+    @patch('api.services.ZapSignService.create_document')
+    def test_remote_failure_marks_outbox_failed(self, mock_create_document):
+        """Testa que erro no ZapSign marca a intenção como falha sem gravar documento"""
+        mock_create_document.side_effect = ZapSignAPIException("Falha", status_code=500)
+
+        response = self.client.post(reverse('create_documento'), self.data, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(DocumentoOutbox.objects.get().status, OUTBOX_STATUS['FAILED'])
+        self.assertFalse(Documento.objects.exists())
+
+    def test_reconcile_outbox(self):
+        """Testa a reconciliação de intenções interrompidas"""
+        sent = DocumentoOutbox.objects.create(
+            status=OUTBOX_STATUS['SENT'], payload=self.data, api_result=self.api_result
+        )
+        pending = DocumentoOutbox.objects.create(status=OUTBOX_STATUS['PENDING'], payload=self.data)
+        DocumentoOutbox.objects.update(
+            created_at=sent.created_at - timedelta(hours=1),
+            last_updated_at=sent.created_at - timedelta(hours=1)
+        )
+
+        call_command('reconcile_document_outbox', '--older-than=60', stdout=StringIO())
+
+        sent.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(sent.status, OUTBOX_STATUS['COMPLETED'])
+        self.assertTrue(Documento.objects.filter(token='new_token').exists())
+        self.assertEqual(pending.status, OUTBOX_STATUS['FAILED'])
+
+        # Reexecutar não cria o documento novamente
+        self.assertEqual(DocumentoService().complete_creation(sent)[0]['token'], 'new_token')
+        self.assertEqual(Documento.objects.count(), 1)
+
+
+class MetricsTest(APITestCase):
+    """Testes das métricas por requisição, do /metrics e do header Server-Timing"""
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token123")
+        Documento.objects.create(openID=1, token="doc-1", name="Documento", company_id=self.empresa)
+
+    def test_request_metrics(self):
+        """Testa os histogramas por view exportados em /metrics"""
+        response = self.client.get(reverse('get_documentos'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(metrics.REQUEST_DURATION.count('get_documentos', 'GET', '200'), 1)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE api_request_duration_seconds histogram', body)
+        self.assertIn(
+            'api_request_duration_seconds_count{view="get_documentos",method="GET",status="200"} 1', body
+        )
+        self.assertIn('api_request_db_queries_bucket{view="get_documentos",le="+Inf"} 1', body)
+        self.assertEqual(self.client.post('/metrics').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_query_count(self):
+        """Testa que as consultas SQL da requisição são contadas"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('get_documentos'))
+        lines = [line for line in metrics.registry.render().splitlines()
+                 if line.startswith('api_request_db_queries_sum{view="get_documentos"}')]
+        self.assertEqual(lines, [f'api_request_db_queries_sum{{view="get_documentos"}} {len(queries)}'])
+
+    def test_server_timing_header(self):
+        """Testa o header Server-Timing e a opção de desligá-lo"""
+        response = self.client.get(reverse('get_documentos'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", zapsign;dur=')
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertEqual(response['Timing-Allow-Origin'], '*')
+
+        with patch.object(AppConfig, 'SERVER_TIMING_ENABLED', False):
+            response = self.client.get(reverse('get_documentos'))
+        self.assertNotIn('Server-Timing', response)
+
+        with patch.object(AppConfig, 'METRICS_ENABLED', False):
+            self.client.get(reverse('get_documentos'))
+        self.assertEqual(metrics.REQUEST_DURATION.count('get_documentos', 'GET', '200'), 2)
+
+    def test_middleware_sync_path(self):
+        """Testa que, com get_response síncrono, o middleware é chamado como função síncrona"""
+        middleware = MetricsMiddleware(lambda request: HttpResponse(status=204))
+
+        response = middleware(RequestFactory().get('/sem-rota'))
+
+        self.assertFalse(iscoroutinefunction(middleware))
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(metrics.REQUEST_DURATION.count('unmatched', 'GET', '204'), 1)
+
+    async def test_middleware_async_path(self):
+        """Testa que, sob ASGI, o middleware roda no event loop sem adaptador de thread"""
+        async def get_response(request):
+            return HttpResponse(status=204)
+
+        middleware = MetricsMiddleware(get_response)
+        response = await middleware(AsyncRequestFactory().get('/sem-rota'))
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(metrics.REQUEST_DURATION.count('unmatched', 'GET', '204'), 1)
+
+    def test_zapsign_calls(self):
+        """Testa a contagem das chamadas ao ZapSign por endpoint e resultado"""
+        with FakeZapSignServer() as server:
+            service = ZapSignService(session=build_http_session(2), circuit_breaker=CircuitBreaker())
+            service.base_url = server.base_url
+            service.get_document('doc-1')
+            service.get_document('doc-2')
+            service._request('GET', '/desconhecida/')
+        self.assertEqual(metrics.ZAPSIGN_REQUESTS.value('GET', '/docs/{token}/', '200'), 2)
+        self.assertEqual(metrics.ZAPSIGN_REQUESTS.value('GET', '/desconhecida/', '404'), 1)
+        self.assertEqual(metrics.ZAPSIGN_DURATION.count('GET', '/docs/{token}/'), 2)
+
+    @patch.object(AppConfig, 'BATCH_MAX_CONCURRENCY', 8)
+    def test_fanned_out_zapsign_calls_report_wall_clock(self):
+        """Testa os totais das chamadas paralelas do lote: contagem sob lock e tempo de relógio no Server-Timing"""
+        def call(_):
+            for _ in range(100):
+                metrics.record_zapsign_call('GET', '/docs/x/', 200, 0.0)
+            time.sleep(0.1)
+            metrics.record_zapsign_call('GET', '/docs/x/', 200, 0.1)
+
+        stats, token = metrics.start_request()
+        try:
+            DocumentoService._fan_out(call, list(range(8)))
+        finally:
+            metrics.finish_request(token)
+
+        self.assertEqual(stats.zapsign_calls, 808)
+        # 8 chamadas simultâneas de ~100 ms: ~100 ms de relógio, não a soma de 800 ms
+        self.assertLess(stats.zapsign_seconds, 0.4)
+        self.assertGreaterEqual(stats.zapsign_seconds, 0.1)
+        self.assertIn('zapsign;dur=', stats.server_timing(time.perf_counter() - stats.started))
+
+    def test_histogram_rendering(self):
+        """Testa os buckets cumulativos e o escape de rótulos"""
+        histogram = metrics.Histogram('teste_seconds', 'Teste', ('view',), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, 'a"b')
+        self.assertEqual(histogram.samples(), [
+            'teste_seconds_bucket{view="a\\"b",le="0.1"} 1',
+            'teste_seconds_bucket{view="a\\"b",le="1"} 2',
+            'teste_seconds_bucket{view="a\\"b",le="+Inf"} 3',
+            'teste_seconds_sum{view="a\\"b"} 5.55',
+            'teste_seconds_count{view="a\\"b"} 3',
+        ])
+
+
+class FakeZapSignFaultsTest(TestCase):
+    """Testes do ZapSignService contra o servidor ZapSign falso com injeção de falhas"""
+
+    def _service(self, server, read_timeout=5):
+        service = ZapSignService(session=build_http_session(2), circuit_breaker=CircuitBreaker(
+            failure_rate_threshold=1.0, minimum_calls=100, window_size=100, open_seconds=30
+        ))
+        service.base_url = server.base_url
+        service.timeout = (1, read_timeout)
+        return service
+
+    def test_routes(self):
+        """Testa as rotas do ZapSignService no servidor falso"""
+        with FakeZapSignServer() as server:
+            service = self._service(server)
+            document = service.create_document({'name': 'Contrato'})
+            self.assertEqual(document['name'], 'Contrato')
+            self.assertIn(service.get_document(document['token'])['status'], ('signed', 'pending'))
+            self.assertEqual(service.update_document(document['token'], {'name': 'Novo'})['name'], 'Novo')
+            self.assertEqual(service.add_signer(document['token'], {'name': 'Ana'})['status'], 'new')
+            service.delete_document(document['token'])
+            with self.assertRaises(ZapSignAPIException) as context:
+                service._handle_response(service._request('GET', '/desconhecida/'))
+            self.assertEqual(context.exception.status_code, 404)
+            self.assertEqual(server.stats['ok'], 5)
+
+    @patch.object(ZapSignService, '_backoff', return_value=0)
+    def test_server_errors_are_retried(self, mock_backoff):
+        """Testa que GET é repetido em erros 5xx e POST não"""
+        with FakeZapSignServer(error_rate=1.0, error_status=503) as server:
+            service = self._service(server)
+            with self.assertRaises(ZapSignAPIException) as context:
+                service.get_document('doc')
+            self.assertEqual(context.exception.status_code, 503)
+            self.assertEqual(server.stats['error'], 1 + AppConfig.ZAPSIGN_MAX_RETRIES)
+            server.faults.reset_stats()
+            with self.assertRaises(ZapSignAPIException):
+                service.create_document({'name': 'Contrato'})
+            self.assertEqual(server.stats['error'], 1)
+
+    @patch.object(ZapSignService, '_backoff', return_value=0)
+    def test_rate_limit(self, mock_backoff):
+        """Testa respostas 429 com Retry-After quando o limite de requisições é excedido"""
+        with FakeZapSignServer(rate_limit=1) as server:
+            service = self._service(server)
+            service.get_document('doc')
+            response = service._request('GET', '/docs/doc/')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], '1')
+            self.assertGreaterEqual(server.stats['rate_limited'], 1)
+
+    @patch.object(ZapSignService, '_backoff', return_value=0)
+    def test_truncated_and_slow_responses(self, mock_backoff):
+        """Testa respostas truncadas e lentas como falhas de comunicação"""
+        with FakeZapSignServer(truncate_rate=1.0) as server:
+            with self.assertRaises(ZapSignAPIException) as context:
+                self._service(server).get_document('doc')
+            self.assertIn('Falha de comunicação', context.exception.message)
+            self.assertEqual(server.stats['truncated'], 1 + AppConfig.ZAPSIGN_MAX_RETRIES)
+        with FakeZapSignServer(slow_rate=1.0, slow_latency=0.3) as server:
+            with self.assertRaises(ZapSignAPIException) as context:
+                self._service(server, read_timeout=0.05).create_document({'name': 'Contrato'})
+            self.assertIn('Falha de comunicação', context.exception.message)
+
+    def test_latency_distributions(self):
+        """Testa a interpretação e a amostragem das distribuições de latência"""
+        import random
+        rng = random.Random(1)
+        self.assertEqual(LatencyDistribution.parse(0.05).sample(rng), 0.05)
+        self.assertEqual(LatencyDistribution.parse('fixed:0.1').sample(rng), 0.1)
+        for spec in ('uniform:0.01,0.02', 'normal:0.05,0.01', 'exponential:0.05', 'lognormal:0.05,0.5'):
+            samples = [LatencyDistribution.parse(spec).sample(rng) for _ in range(200)]
+            self.assertTrue(all(sample >= 0 for sample in samples), spec)
+        self.assertTrue(all(0.01 <= LatencyDistribution.parse('uniform:0.01,0.02').sample(rng) <= 0.02
+                            for _ in range(50)))
+        for invalid in ('gamma:1', 'uniform:0.1', 'normal:a,b', 'fixed:-1'):
+            with self.assertRaises(ValueError):
+                LatencyDistribution.parse(invalid)
+
+
+class ZapSignServiceTest(TestCase):
+    """Testes para o service ZapSign"""
+    
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.service = ZapSignService()
+    
+    @patch('api.services.requests.Session.request')
+    def test_create_document_success(self, mock_request):
+        """Testa a criação de documento na API ZapSign"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'open_id': 123,
+            'token': 'test_token',
+            'status': 'pending'
+        }
+        mock_request.return_value = mock_response
+        
+        document_data = {
+            'name': 'Test Document',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'Test User',
+            'email_signatario': 'test@example.com'
+        }
+        
+        result = self.service.create_document(document_data)
+        
+        self.assertEqual(result['token'], 'test_token')
+        mock_request.assert_called_once()
+    
+    @patch('api.services.requests.Session.request')
+    def test_create_document_api_error(self, mock_request):
+        """Testa erro na API ZapSign durante criação"""
+        mock_response = Mock()
+        mock_response.status_code = 400
+        mock_response.text = 'Bad Request'
+        mock_response.content = b'{"error": "Invalid data"}'
+        mock_request.return_value = mock_response
+        
+        document_data = {
+            'name': 'Test Document',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'Test User',
+            'email_signatario': 'test@example.com'
+        }
+        
+        with self.assertRaises(ZapSignAPIException):
+            self.service.create_document(document_data)
+
+    def test_service_reuses_shared_session(self):
+        """Testa que os services compartilham a mesma sessão com pool de conexões"""
+        self.assertIs(self.service.session, get_http_session())
+        self.assertIs(ZapSignService().session, self.service.session)
+        self.assertIs(get_zapsign_service(), get_zapsign_service())
+
+    @patch('api.services.requests.Session.request')
+    def test_request_uses_connect_and_read_timeouts(self, mock_request):
+        """Testa que as chamadas usam timeouts separados de conexão e leitura"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'token': 'test_token'}
+        mock_request.return_value = mock_response
+
+        self.service.update_document('test_token', {'name': 'Novo nome'})
+
+        _, kwargs = mock_request.call_args
+        config_data = AppConfig.get_zapsign_config()
+        self.assertEqual(
+            kwargs['timeout'],
+            (config_data['connect_timeout'], config_data['read_timeout'])
+        )
+
+
+class AsyncDocumentoViewsTest(TestCase):
+    """Testes para as views assíncronas de documentos"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.factory = AsyncRequestFactory()
+        self.empresa = Empresa.objects.create(
+            name="Empresa Teste",
+            apiToken="token_teste"
+        )
+        self.documento = Documento.objects.create(
+            openID=123,
+            token="token_doc_teste",
+            name="Documento Teste",
+            status="pending",
+            created_by="test@test.com",
+            company_id=self.empresa,
+        )
+
+    @patch('api.services.AsyncZapSignService.create_document', new_callable=AsyncMock)
+    async def test_create_documento_success(self, mock_create_document):
+        """Testa a criação assíncrona de documento com sucesso"""
+        mock_create_document.return_value = {
+            'open_id': 456,
+            'token': 'new_token',
+            'status': 'pending',
+            'created_by': {'email': 'test@test.com'},
+        }
+        data = {
+            'name': 'Novo Documento',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva',
+            'email_signatario': 'joao@test.com',
+            'company_id': self.empresa.id
+        }
+        request = self.factory.post('/api/documento/create', data, content_type='application/json')
+
+        response = await views_async.create_documento(request)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_create_document.assert_awaited_once_with(data)
+        self.assertTrue(await Signatario.objects.filter(token='new_token').aexists())
+
+    @patch('api.services.AsyncZapSignService.create_document', new_callable=AsyncMock)
+    async def test_create_documento_idempotency_key(self, mock_create_document):
+        """Testa a repetição com Idempotency-Key na view assíncrona"""
+        mock_create_document.return_value = {
+            'open_id': 456,
+            'token': 'new_token',
+            'status': 'pending',
+            'created_by': {'email': 'test@test.com'},
+        }
+        data = {
+            'name': 'Novo Documento',
+            'url_documento': 'http://example.com/doc.pdf',
+            'nome_signatario': 'João Silva',
+            'email_signatario': 'joao@test.com',
+            'company_id': self.empresa.id
+        }
+
+        responses = []
+        for _ in range(2):
+            request = self.factory.post('/api/documento/create', data, content_type='application/json',
+                                        headers={'Idempotency-Key': 'chave-async'})
+            responses.append(await views_async.create_documento(request))
+
+        self.assertEqual([r.status_code for r in responses], [status.HTTP_201_CREATED] * 2)
+        self.assertEqual(responses[1].content, responses[0].content)
+        self.assertEqual(responses[1]['Idempotent-Replayed'], 'true')
+        mock_create_document.assert_awaited_once_with(data)
+
+    @patch('api.services.AsyncZapSignService.update_document', new_callable=AsyncMock)
+    async def test_update_documento_success(self, mock_update_document):
+        """Testa a atualização assíncrona de documento"""
+        request = self.factory.put(
+            f'/api/documento/update/{self.documento.pk}',
+            {'name': 'Documento Atualizado'},
+            content_type='application/json'
+        )
+
+        response = await views_async.update_documento(request, self.documento.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {'name': 'Documento Atualizado'})
+        mock_update_document.assert_awaited_once_with(self.documento.token, {'name': 'Documento Atualizado'})
+
+    @patch('api.services.AsyncZapSignService.delete_document', new_callable=AsyncMock)
+    async def test_delete_documento_api_error(self, mock_delete_document):
+        """Testa que erro na API ZapSign não remove o documento local"""
+        mock_delete_document.side_effect = ZapSignAPIException("Falha", status_code=500)
+        request = self.factory.delete(f'/api/documento/delete/{self.documento.pk}')
+
+        response = await views_async.delete_documento(request, self.documento.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(await Documento.objects.filter(pk=self.documento.pk).aexists())
+
+    async def test_get_documento_not_found(self):
+        """Testa a busca assíncrona de um documento inexistente"""
+        request = self.factory.get('/api/documento/99999')
+
+        response = await views_async.get_documento(request, 99999)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncZapSignServiceTest(TestCase):
+    """Testes para o service assíncrono ZapSign"""
+
+    async def test_create_document_success(self):
+        """Testa a criação de documento pelo cliente assíncrono"""
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json={'token': 'test_token', 'name': payload['name']})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = AsyncZapSignService(client=client)
+
+        result = await service.create_document({'name': 'Test Document'})
+
+        self.assertEqual(result, {'token': 'test_token', 'name': 'Test Document'})
+        await client.aclose()
+
+    async def test_create_document_api_error(self):
+        """Testa erro na API ZapSign pelo cliente assíncrono"""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(400, json={'error': 'x'}))
+        )
+        service = AsyncZapSignService(client=client)
+
+        with self.assertRaises(ZapSignAPIException):
+            await service.create_document({'name': 'Test Document'})
+        await client.aclose()
+
+
+class CircuitBreakerTest(TestCase):
+    """Testes para o circuit breaker"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=0.5, minimum_calls=4, window_size=10,
+            open_seconds=30, clock=lambda: self.now
+        )
+
+    def _fail(self, times):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_when_failure_rate_crosses_threshold(self):
+        """Testa a abertura do circuito ao atingir a taxa de erro"""
+        self.breaker.record_success()
+        self.breaker.record_success()
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['CLOSED'])
+
+        self._fail(1)
+
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['OPEN'])
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_trial_closes_or_reopens(self):
+        """Testa a transição semiaberta: sucesso fecha, falha reabre"""
+        self._fail(4)
+        self.now += 30
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['HALF_OPEN'])
+
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['OPEN'])
+
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['CLOSED'])
+
+    async def test_cancelled_probe_releases_half_open_slot(self):
+        """Testa que a chamada de teste cancelada (cliente desconectou) devolve a vaga do semiaberto"""
+        self._fail(4)
+        self.now += 30
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(10)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = AsyncZapSignService(client=client, circuit_breaker=self.breaker)
+        task = asyncio.ensure_future(service.get_document('t'))
+        await started.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        await client.aclose()
+
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['HALF_OPEN'])
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CIRCUIT_STATE['CLOSED'])
+
+    @patch('api.services.requests.Session.request', side_effect=RuntimeError('inesperado'))
+    def test_unexpected_error_releases_half_open_slot(self, mock_request):
+        """Testa que um erro inesperado na chamada de teste não prende o circuito semiaberto"""
+        self._fail(4)
+        self.now += 30
+        service = ZapSignService(circuit_breaker=self.breaker)
+
+        with self.assertRaises(RuntimeError):
+            service.get_document('t')
+
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+
+class ZapSignResilienceTest(APITestCase):
+    """Testes para retry com backoff e fail-fast do ZapSignService"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        get_circuit_breaker().reset()
+        self.addCleanup(get_circuit_breaker().reset)
+        self.service = ZapSignService()
+
+    @staticmethod
+    def _response(status_code, data=None):
+        response = Mock()
+        response.status_code = status_code
+        response.text = str(data)
+        response.content = b'{}'
+        response.json.return_value = data or {}
+        return response
+
+    @patch('api.services.time.sleep')
+    @patch('api.services.requests.Session.request')
+    def test_idempotent_call_is_retried(self, mock_request, mock_sleep):
+        """Testa que PUT é repetido com backoff após falha do servidor"""
+        mock_request.side_effect = [self._response(503), self._response(200, {'token': 't'})]
+
+        result = self.service.update_document('t', {'name': 'Novo nome'})
+
+        self.assertEqual(result, {'token': 't'})
+        self.assertEqual(mock_request.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('api.services.time.sleep')
+    @patch('api.services.requests.Session.request')
+    def test_create_is_not_retried(self, mock_request, mock_sleep):
+        """Testa que POST não é repetido, evitando documentos duplicados"""
+        mock_request.return_value = self._response(503)
+
+        with self.assertRaises(ZapSignAPIException):
+            self.service.create_document({'name': 'Documento'})
+
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch('api.services.requests.Session.request')
+    def test_open_circuit_fails_fast_with_503(self, mock_request):
+        """Testa que as views respondem 503 rápido com o circuito aberto"""
+        breaker = get_circuit_breaker()
+        for _ in range(breaker.minimum_calls):
+            breaker.record_failure()
+        empresa = Empresa.objects.create(name="Empresa Teste", apiToken="token_teste")
+        documento = Documento.objects.create(
+            openID=1, token="token_doc", name="Documento", status="pending",
+            created_by="test@test.com", company_id=empresa,
+        )
+
+        response = self.client.put(
+            reverse('update_documento', kwargs={'pk': documento.pk}), {'name': 'Novo'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+        mock_request.assert_not_called()
+        with self.assertRaises(ZapSignUnavailableException):
+            self.service.delete_document('token_doc')
+
+        circuit = self.client.get(reverse('get_zapsign_circuit')).data['data']
+        self.assertEqual(circuit['state'], CIRCUIT_STATE['OPEN'])
@@ -1,13 +1,24 @@
 from django.urls import path
 
-from . import views
+from . import views, views_async
+from .config import AppConfig
+
+# Em deploys ASGI, USE_ASYNC_VIEWS=1 troca as rotas de documentos pelas views assíncronas
+documento_views = views_async if AppConfig.USE_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('documento', views.get_documentos, name='get_documentos'),
-    path('documento/<int:pk>', views.get_documento, name='get_documento'),
-    path('documento/create', views.create_documento, name='create_documento'),
+    path('documento', documento_views.get_documentos, name='get_documentos'),
+    path('documento/<int:pk>', documento_views.get_documento, name='get_documento'),
+    path('documento/create', documento_views.create_documento, name='create_documento'),
+    path('documento/batch/create', views.create_documentos_batch, name='create_documentos_batch'),
+    path('documento/batch/update', views.update_documentos_batch, name='update_documentos_batch'),
+    path('documento/batch/delete', views.delete_documentos_batch, name='delete_documentos_batch'),
     path('documento/update/<int:pk>',
-         views.update_documento, name='update_documento'),
+         documento_views.update_documento, name='update_documento'),
     path('documento/delete/<int:pk>',
-         views.delete_documento, name='delete_documento'),
+         documento_views.delete_documento, name='delete_documento'),
+    path('webhooks/zapsign', views.zapsign_webhook, name='zapsign_webhook'),
+    path('cache/stats', views.get_cache_stats, name='get_cache_stats'),
+    path('coalescing/stats', views.get_coalescing_stats, name='get_coalescing_stats'),
+    path('zapsign/circuit', views.get_zapsign_circuit, name='get_zapsign_circuit'),
 ]
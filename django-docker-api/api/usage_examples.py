@@ -20,10 +20,11 @@ urlpatterns = [
 ]
 
 # 3. Para usar apenas o service layer (recomendado para lógica de negócio complexa):
-from api.services import ZapSignService, DocumentoService, ZapSignAPIException
+from api.services import get_zapsign_service, DocumentoService, ZapSignAPIException
 
 def my_custom_logic():
-    zapsign_service = ZapSignService()
+    # Instância compartilhada: reutiliza o pool de conexões keep-alive do processo
+    zapsign_service = get_zapsign_service()
     documento_service = DocumentoService()
     
     # Exemplo de uso
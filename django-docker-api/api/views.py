@@ -1,59 +1,106 @@
-from rest_framework.decorators import api_view
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import transaction
 
 from .models import Documento, Signatario
-from .serializers import (
-    DocumentoSerializer, 
-    DocumentoWithSignersSerializer, 
-    DocumentoUpdateSerializer, 
-    SignatarioSerializer
-)
-from .services import ZapSignService, DocumentoService, ZapSignAPIException
+from .serializers import DocumentoUpdateSerializer
+from .services import get_circuit_breaker, get_zapsign_service, DocumentoService, ZapSignAPIException
 from .mixins import BaseViewMixin, APIResponseHandler
-from .constants import HTTP_METHODS, MESSAGES, ERROR_CODES
+from .renderers import LIST_RENDERER_CLASSES
+from .conditional import documento_condition, documento_etag, documentos_condition, documentos_etag
+from .coalescing import coalesced
+from .filters import DocumentoListFilters, InvalidFilterException
+from .fieldsets import DocumentoFieldset, InvalidFieldsetException
+from .idempotency import batch_sequential_calls, idempotent
+from . import cache as documento_cache
+from . import coalescing
+from . import metrics
+from .config import AppConfig
+from .webhooks import get_webhook_buffer, parse_events
+from .constants import DOCUMENT_CREATE_REQUIRED_FIELDS, HTTP_METHODS, MESSAGES, ERROR_CODES
 
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 @api_view([HTTP_METHODS['GET']])
+@renderer_classes(LIST_RENDERER_CLASSES)
+@documentos_condition
+@coalesced('get_documentos', version=documentos_etag)
 def get_documentos(request):
-    """Retorna lista de todos os documentos"""
+    """Retorna lista paginada por cursor (ou em streaming) dos documentos, com filtros e campos opcionais"""
     method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['GET'])
     if method_error:
         return method_error
 
     try:
-        documentos = Documento.objects.all()
-        return BaseViewMixin.serialize_and_respond(
-            documentos, 
-            DocumentoWithSignersSerializer, 
-            many=True
+        filters = DocumentoListFilters.from_query_params(request.query_params)
+        fieldset = DocumentoFieldset.from_query_params(request.query_params)
+    except (InvalidFilterException, InvalidFieldsetException) as e:
+        return APIResponseHandler.error_response(
+            error_message=e.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+
+    try:
+        cached_data = documento_cache.get_documentos(request)
+        if cached_data is not None:
+            return Response(cached_data)
+
+        documentos = fieldset.apply_values(filters.apply(Documento.objects.all()))
+        response = BaseViewMixin.list_and_respond(
+            request,
+            documentos,
+            fieldset.list_serializer_class
         )
+        documento_cache.set_documentos(request, response)
+        return response
     except Exception as e:
         return BaseViewMixin.handle_exception(e, "busca de documentos")
 
 
 @api_view([HTTP_METHODS['GET']])
+@documento_condition
+@coalesced('get_documento', version=documento_etag)
 def get_documento(request, pk):
     """Retorna um documento específico por ID"""
     method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['GET'])
     if method_error:
         return method_error
 
-    documento, error_response = BaseViewMixin.get_object_or_404_response(Documento, pk)
+    try:
+        fieldset = DocumentoFieldset.from_query_params(request.query_params)
+    except InvalidFieldsetException as e:
+        return APIResponseHandler.error_response(
+            error_message=e.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+
+    cached_data = documento_cache.get_documento(request, pk, fieldset.cache_variant)
+    if cached_data is not None:
+        return Response(cached_data)
+
+    documento, error_response = BaseViewMixin.get_object_or_404_response(
+        Documento, pk, queryset=fieldset.apply(Documento.objects.all())
+    )
     if error_response:
         return error_response
 
     try:
-        return BaseViewMixin.serialize_and_respond(documento, DocumentoWithSignersSerializer)
+        response = BaseViewMixin.serialize_and_respond(documento, fieldset.serializer_class)
+        documento_cache.set_documento(request, pk, response.data, fieldset.cache_variant)
+        return response
     except Exception as e:
         return BaseViewMixin.handle_exception(e, "busca de documento")
 
 
+@idempotent('create_documento')
 @api_view([HTTP_METHODS['POST']])
 def create_documento(request):
     """Cria um novo documento"""
@@ -62,58 +109,111 @@ def create_documento(request):
         return method_error
 
     # Validar campos obrigatórios
-    required_fields = ['name', 'url_documento', 'nome_signatario', 'email_signatario']
-    validation_error = BaseViewMixin.validate_required_fields(request.data, required_fields)
+    validation_error = BaseViewMixin.validate_required_fields(
+        request.data, DOCUMENT_CREATE_REQUIRED_FIELDS
+    )
     if validation_error:
         return validation_error
 
     try:
-        with transaction.atomic():
-            # Usar services para interação com API externa
-            zapsign_service = ZapSignService()
-            documento_service = DocumentoService()
-            
-            # Criar documento na API ZapSign
-            api_result = zapsign_service.create_document(request.data)
-            
-            # Preparar dados para salvar no banco
-            document_data = documento_service.prepare_document_data(api_result, request.data)
-            
-            # Salvar documento no banco
-            serializer = DocumentoSerializer(data=document_data)
-            if not serializer.is_valid():
-                logger.error(f"Erro de validação do documento: {serializer.errors}")
-                return APIResponseHandler.validation_error_response(serializer)
-            
-            documento_criado = serializer.save()
-            
-            # Preparar e salvar signatário
-            signer_data = documento_service.prepare_signer_data(
-                api_result, request.data, documento_criado.id
-            )
-            
-            signatario_serializer = SignatarioSerializer(data=signer_data)
-            if signatario_serializer.is_valid():
-                signatario_serializer.save()
-                logger.info(f"Signatário cadastrado: {request.data.get('nome_signatario')}")
-            else:
-                logger.error(f"Erro ao cadastrar signatário: {signatario_serializer.errors}")
-
-            return APIResponseHandler.success_response(
-                data=serializer.data,
-                message=MESSAGES['DOCUMENT_CREATED'],
-                status_code=status.HTTP_201_CREATED
-            )
+        # Sem transação aberta durante a chamada ao ZapSign: a intenção é registrada,
+        # a API é chamada e o resultado é gravado em uma transação curta (outbox)
+        documento_service = DocumentoService()
+        document_data, errors = documento_service.create_document(request.data)
+        if errors:
+            return APIResponseHandler.validation_error_response(errors)
+
+        return APIResponseHandler.success_response(
+            data=document_data,
+            message=MESSAGES['DOCUMENT_CREATED'],
+            status_code=status.HTTP_201_CREATED
+        )
 
     except ZapSignAPIException as e:
         logger.error(f"Erro na API ZapSign: {e.message}")
-        return APIResponseHandler.error_response(
-            error_message=e.message,
+        return APIResponseHandler.zapsign_error_response(e)
+    except Exception as e:
+        return BaseViewMixin.handle_exception(e, "criação de documento")
+
+
+def _batch_items(request, key: str):
+    """Lista do lote em request.data[key]; retorna (itens, resposta de erro)"""
+    items = request.data.get(key) if isinstance(request.data, dict) else None
+    max_size = AppConfig.get_batch_config()['max_size']
+    if not isinstance(items, list) or not items or len(items) > max_size:
+        return None, APIResponseHandler.error_response(
+            error_message=f"'{key}' deve ser uma lista com 1 a {max_size} itens",
             status_code=status.HTTP_400_BAD_REQUEST,
-            error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+    return items, None
+
+
+@idempotent('create_documentos_batch', sequential_calls=batch_sequential_calls())
+@api_view([HTTP_METHODS['POST']])
+def create_documentos_batch(request):
+    """Cria vários documentos em lote, com resultado por item"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['POST'])
+    if method_error:
+        return method_error
+
+    items, error_response = _batch_items(request, 'documents')
+    if error_response:
+        return error_response
+
+    try:
+        results = DocumentoService().create_documents_batch(items)
+        created = sum(1 for result in results if result['success'])
+        return APIResponseHandler.success_response(
+            data={'created': created, 'failed': len(results) - created, 'results': results},
+            message=MESSAGES['BATCH_PROCESSED']
         )
     except Exception as e:
-        return BaseViewMixin.handle_exception(e, "criação de documento")
+        return BaseViewMixin.handle_exception(e, "criação de documentos em lote")
+
+
+@api_view([HTTP_METHODS['PUT']])
+def update_documentos_batch(request):
+    """Atualiza vários documentos em lote, com resultado por item"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['PUT'])
+    if method_error:
+        return method_error
+
+    items, error_response = _batch_items(request, 'documents')
+    if error_response:
+        return error_response
+
+    try:
+        results = DocumentoService().update_documents_batch(items)
+        updated = sum(1 for result in results if result['success'])
+        return APIResponseHandler.success_response(
+            data={'updated': updated, 'failed': len(results) - updated, 'results': results},
+            message=MESSAGES['BATCH_PROCESSED']
+        )
+    except Exception as e:
+        return BaseViewMixin.handle_exception(e, "atualização de documentos em lote")
+
+
+@api_view([HTTP_METHODS['DELETE']])
+def delete_documentos_batch(request):
+    """Exclui vários documentos em lote, com resultado por id"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['DELETE'])
+    if method_error:
+        return method_error
+
+    ids, error_response = _batch_items(request, 'ids')
+    if error_response:
+        return error_response
+
+    try:
+        results = DocumentoService().delete_documents_batch(ids)
+        deleted = sum(1 for result in results if result['success'])
+        return APIResponseHandler.success_response(
+            data={'deleted': deleted, 'failed': len(results) - deleted, 'results': results},
+            message=MESSAGES['BATCH_PROCESSED']
+        )
+    except Exception as e:
+        return BaseViewMixin.handle_exception(e, "exclusão de documentos em lote")
 
 
 @api_view([HTTP_METHODS['PUT']])
@@ -134,7 +234,7 @@ def update_documento(request, pk):
 
     try:
         # Usar service para interação com API externa
-        zapsign_service = ZapSignService()
+        zapsign_service = get_zapsign_service()
         
         # Atualizar documento na API ZapSign
         zapsign_service.update_document(documento.token, request.data)
@@ -151,11 +251,7 @@ def update_documento(request, pk):
 
     except ZapSignAPIException as e:
         logger.error(f"Erro na API ZapSign: {e.message}")
-        return APIResponseHandler.error_response(
-            error_message=e.message,
-            status_code=status.HTTP_400_BAD_REQUEST,
-            error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
-        )
+        return APIResponseHandler.zapsign_error_response(e)
     except Exception as e:
         return BaseViewMixin.handle_exception(e, "atualização de documento")
 
@@ -173,7 +269,7 @@ def delete_documento(request, pk):
 
     try:
         # Usar service para interação com API externa
-        zapsign_service = ZapSignService()
+        zapsign_service = get_zapsign_service()
         
         # Deletar documento na API ZapSign
         zapsign_service.delete_document(documento.token)
@@ -185,10 +281,70 @@ def delete_documento(request, pk):
 
     except ZapSignAPIException as e:
         logger.error(f"Erro na API ZapSign: {e.message}")
+        return APIResponseHandler.zapsign_error_response(e)
+    except Exception as e:
+        return BaseViewMixin.handle_exception(e, "exclusão de documento")
+
+
+@api_view([HTTP_METHODS['GET']])
+def get_zapsign_circuit(request):
+    """Retorna o estado do circuit breaker das chamadas ao ZapSign"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['GET'])
+    if method_error:
+        return method_error
+
+    return APIResponseHandler.success_response(data=get_circuit_breaker().snapshot())
+
+
+@api_view([HTTP_METHODS['GET']])
+def get_cache_stats(request):
+    """Retorna acertos, faltas e configuração do cache das leituras de documentos"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['GET'])
+    if method_error:
+        return method_error
+
+    return APIResponseHandler.success_response(data=documento_cache.get_cache_stats())
+
+
+@api_view([HTTP_METHODS['GET']])
+def get_coalescing_stats(request):
+    """Retorna quantas leituras foram executadas e quantas aproveitaram uma execução simultânea"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['GET'])
+    if method_error:
+        return method_error
+
+    return APIResponseHandler.success_response(data=coalescing.get_coalescing_stats())
+
+
+@api_view([HTTP_METHODS['POST']])
+def zapsign_webhook(request):
+    """Recebe eventos de status do ZapSign e os enfileira para aplicação em lote"""
+    method_error = BaseViewMixin.validate_method(request, HTTP_METHODS['POST'])
+    if method_error:
+        return method_error
+
+    secret = AppConfig.get_webhook_config()['secret']
+    if secret and not hmac.compare_digest(request.headers.get('X-Webhook-Secret', ''), secret):
         return APIResponseHandler.error_response(
-            error_message=e.message,
-            status_code=status.HTTP_400_BAD_REQUEST,
-            error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
+            error_message="Segredo do webhook inválido",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            error_code=ERROR_CODES['WEBHOOK_UNAUTHORIZED']
         )
+
+    try:
+        documents, signers, ignored = parse_events(request.data)
+        get_webhook_buffer().add(documents, signers)
     except Exception as e:
-        return BaseViewMixin.handle_exception(e, "exclusão de documento")
+        return BaseViewMixin.handle_exception(e, "recebimento de webhook")
+
+    return APIResponseHandler.success_response(
+        data={'documents': len(documents), 'signers': len(signers), 'ignored': ignored},
+        message=MESSAGES['WEBHOOK_ACCEPTED'],
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@require_GET
+def get_metrics(request):
+    """Exporta as métricas do processo no formato texto do Prometheus"""
+    return HttpResponse(metrics.registry.render(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,204 @@
+"""
+Views assíncronas de documentos para deploys ASGI (core/asgi.py)
+
+As chamadas ao ZapSign são aguardadas no event loop com AsyncZapSignService, então
+um único worker ASGI mantém centenas de chamadas externas em andamento sem prender
+uma thread por requisição. As leituras reaproveitam as views síncronas, que fazem
+apenas trabalho rápido de banco. Ative com USE_ASYNC_VIEWS=1; deploys WSGI
+continuam usando api/views.py.
+"""
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import views
+from .constants import DOCUMENT_CREATE_REQUIRED_FIELDS, ERROR_CODES, HTTP_METHODS, MESSAGES
+from .idempotency import idempotent
+from .models import Documento
+from .serializers import DocumentoUpdateSerializer
+from .services import (
+    DocumentoService,
+    ZapSignAPIException,
+    ZapSignUnavailableException,
+    get_async_zapsign_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _json_response(data, status_code=status.HTTP_200_OK) -> JsonResponse:
+    return JsonResponse(data, status=status_code, encoder=JSONEncoder, safe=False)
+
+
+def _success_response(data=None, message=MESSAGES['OPERATION_SUCCESS'],
+                      status_code=status.HTTP_200_OK) -> JsonResponse:
+    """Equivalente assíncrono de APIResponseHandler.success_response"""
+    response_data = {"success": True, "message": message}
+    if data is not None:
+        response_data["data"] = data
+    return _json_response(response_data, status_code)
+
+
+def _error_response(error_message, status_code=status.HTTP_400_BAD_REQUEST,
+                    error_code=None) -> JsonResponse:
+    """Equivalente assíncrono de APIResponseHandler.error_response"""
+    response_data = {"success": False, "error": error_message}
+    if error_code:
+        response_data["error_code"] = error_code
+    return _json_response(response_data, status_code)
+
+
+def _zapsign_error_response(e: ZapSignAPIException) -> JsonResponse:
+    """Equivalente assíncrono de APIResponseHandler.zapsign_error_response"""
+    logger.error(f"Erro na API ZapSign: {e.message}")
+    if isinstance(e, ZapSignUnavailableException):
+        response = _error_response(
+            error_message=e.message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code=ERROR_CODES['ZAPSIGN_UNAVAILABLE']
+        )
+        response['Retry-After'] = str(max(1, round(e.retry_after)))
+        return response
+    return _error_response(
+        error_message=e.message,
+        status_code=status.HTTP_400_BAD_REQUEST,
+        error_code=ERROR_CODES['ZAPSIGN_API_ERROR']
+    )
+
+
+def _parse_body(request):
+    """Decodifica o corpo JSON da requisição; retorna (dados, resposta de erro)"""
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None, _error_response("JSON inválido", error_code=ERROR_CODES['VALIDATION_ERROR'])
+    if not isinstance(data, dict):
+        return None, _error_response("JSON inválido", error_code=ERROR_CODES['VALIDATION_ERROR'])
+    return data, None
+
+
+def _missing_fields_response(data, required_fields: list):
+    missing_fields = [field for field in required_fields if field not in data or not data[field]]
+    if missing_fields:
+        return _error_response(
+            f"Campos obrigatórios ausentes: {', '.join(missing_fields)}",
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+    return None
+
+
+async def _get_documento_or_404(pk):
+    try:
+        return await Documento.objects.aget(pk=pk), None
+    except Documento.DoesNotExist:
+        return None, _json_response({'error': 'Documento não encontrado'}, status.HTTP_404_NOT_FOUND)
+
+
+async def get_documentos(request):
+    """Retorna lista paginada por cursor (ou em streaming) de todos os documentos"""
+    return await sync_to_async(views.get_documentos)(request)
+
+
+async def get_documento(request, pk):
+    """Retorna um documento específico por ID"""
+    return await sync_to_async(views.get_documento)(request, pk)
+
+
+@idempotent('create_documento')
+@csrf_exempt
+async def create_documento(request):
+    """Cria um novo documento"""
+    if request.method != HTTP_METHODS['POST']:
+        return HttpResponse(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    data, error_response = _parse_body(request)
+    if error_response:
+        return error_response
+
+    validation_error = _missing_fields_response(data, DOCUMENT_CREATE_REQUIRED_FIELDS)
+    if validation_error:
+        return validation_error
+
+    documento_service = DocumentoService()
+    try:
+        outbox = await sync_to_async(documento_service.register_creation)(data)
+        try:
+            api_result = await get_async_zapsign_service().create_document(data)
+        except ZapSignAPIException as e:
+            await sync_to_async(documento_service.record_remote_failure)(outbox, e.message)
+            raise
+        await sync_to_async(documento_service.record_remote_result)(outbox, api_result)
+        document_data, errors = await sync_to_async(documento_service.complete_creation)(outbox)
+    except ZapSignAPIException as e:
+        return _zapsign_error_response(e)
+    except Exception as e:
+        logger.error(f"Erro durante criação de documento: {str(e)}")
+        return _json_response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    if errors:
+        return _error_response("Dados inválidos")
+
+    return _success_response(
+        data=document_data,
+        message=MESSAGES['DOCUMENT_CREATED'],
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@csrf_exempt
+async def update_documento(request, pk):
+    """Atualiza um documento existente"""
+    if request.method != HTTP_METHODS['PUT']:
+        return HttpResponse(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    documento, error_response = await _get_documento_or_404(pk)
+    if error_response:
+        return error_response
+
+    data, error_response = _parse_body(request)
+    if error_response:
+        return error_response
+
+    validation_error = _missing_fields_response(data, ['name'])
+    if validation_error:
+        return validation_error
+
+    try:
+        await get_async_zapsign_service().update_document(documento.token, data)
+
+        documento.name = data.get("name")
+        await documento.asave()
+    except ZapSignAPIException as e:
+        return _zapsign_error_response(e)
+    except Exception as e:
+        logger.error(f"Erro durante atualização de documento: {str(e)}")
+        return _json_response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    return _json_response(DocumentoUpdateSerializer(documento).data)
+
+
+@csrf_exempt
+async def delete_documento(request, pk):
+    """Deleta um documento existente"""
+    if request.method != HTTP_METHODS['DELETE']:
+        return HttpResponse(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    documento, error_response = await _get_documento_or_404(pk)
+    if error_response:
+        return error_response
+
+    try:
+        await get_async_zapsign_service().delete_document(documento.token)
+        await documento.adelete()
+    except ZapSignAPIException as e:
+        return _zapsign_error_response(e)
+    except Exception as e:
+        logger.error(f"Erro durante exclusão de documento: {str(e)}")
+        return _json_response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
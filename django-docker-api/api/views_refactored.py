@@ -1,21 +1,20 @@
 """
 Views refatoradas com padrões de projeto e DRY aplicados
 """
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import transaction
 
 from .models import Documento, Signatario
-from .serializers import (
-    DocumentoSerializer, 
-    DocumentoWithSignersSerializer, 
-    DocumentoUpdateSerializer, 
-    SignatarioSerializer
-)
-from .services import ZapSignService, DocumentoService
+from .serializers import DocumentoUpdateSerializer
+from .services import get_zapsign_service, DocumentoService
 from .mixins import BaseViewMixin, APIResponseHandler
-from .constants import HTTP_METHODS, MESSAGES
+from .renderers import LIST_RENDERER_CLASSES
+from .conditional import documento_condition, documentos_condition
+from .filters import DocumentoListFilters, InvalidFilterException
+from .fieldsets import DocumentoFieldset, InvalidFieldsetException
+from . import cache as documento_cache
+from .constants import DOCUMENT_CREATE_REQUIRED_FIELDS, ERROR_CODES, HTTP_METHODS, MESSAGES
 from .decorators import handle_zapsign_exceptions, validate_http_method, require_fields
 
 import logging
@@ -24,72 +23,84 @@ logger = logging.getLogger(__name__)
 
 
 @api_view([HTTP_METHODS['GET']])
+@renderer_classes(LIST_RENDERER_CLASSES)
+@documentos_condition
 @validate_http_method(HTTP_METHODS['GET'])
 @handle_zapsign_exceptions("busca de documentos")
 def get_documentos(request):
-    """Retorna lista de todos os documentos"""
-    documentos = Documento.objects.all()
-    return BaseViewMixin.serialize_and_respond(
-        documentos, 
-        DocumentoWithSignersSerializer, 
-        many=True
+    """Retorna lista paginada por cursor (ou em streaming) dos documentos, com filtros e campos opcionais"""
+    try:
+        filters = DocumentoListFilters.from_query_params(request.query_params)
+        fieldset = DocumentoFieldset.from_query_params(request.query_params)
+    except (InvalidFilterException, InvalidFieldsetException) as e:
+        return APIResponseHandler.error_response(
+            error_message=e.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+
+    cached_data = documento_cache.get_documentos(request)
+    if cached_data is not None:
+        return Response(cached_data)
+
+    documentos = fieldset.apply_values(filters.apply(Documento.objects.all()))
+    response = BaseViewMixin.list_and_respond(
+        request,
+        documentos,
+        fieldset.list_serializer_class
     )
+    documento_cache.set_documentos(request, response)
+    return response
 
 
 @api_view([HTTP_METHODS['GET']])
+@documento_condition
 @validate_http_method(HTTP_METHODS['GET'])
 @handle_zapsign_exceptions("busca de documento")
 def get_documento(request, pk):
     """Retorna um documento específico por ID"""
-    documento, error_response = BaseViewMixin.get_object_or_404_response(Documento, pk)
+    try:
+        fieldset = DocumentoFieldset.from_query_params(request.query_params)
+    except InvalidFieldsetException as e:
+        return APIResponseHandler.error_response(
+            error_message=e.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code=ERROR_CODES['VALIDATION_ERROR']
+        )
+
+    cached_data = documento_cache.get_documento(request, pk, fieldset.cache_variant)
+    if cached_data is not None:
+        return Response(cached_data)
+
+    documento, error_response = BaseViewMixin.get_object_or_404_response(
+        Documento, pk, queryset=fieldset.apply(Documento.objects.all())
+    )
     if error_response:
         return error_response
 
-    return BaseViewMixin.serialize_and_respond(documento, DocumentoWithSignersSerializer)
+    response = BaseViewMixin.serialize_and_respond(documento, fieldset.serializer_class)
+    documento_cache.set_documento(request, pk, response.data, fieldset.cache_variant)
+    return response
 
 
 @api_view([HTTP_METHODS['POST']])
 @validate_http_method(HTTP_METHODS['POST'])
-@require_fields(['name', 'url_documento', 'nome_signatario', 'email_signatario'])
+@require_fields(DOCUMENT_CREATE_REQUIRED_FIELDS)
 @handle_zapsign_exceptions("criação de documento")
 def create_documento(request):
     """Cria um novo documento"""
-    with transaction.atomic():
-        # Usar services para interação com API externa
-        zapsign_service = ZapSignService()
-        documento_service = DocumentoService()
-        
-        # Criar documento na API ZapSign
-        api_result = zapsign_service.create_document(request.data)
-        
-        # Preparar dados para salvar no banco
-        document_data = documento_service.prepare_document_data(api_result, request.data)
-        
-        # Salvar documento no banco
-        serializer = DocumentoSerializer(data=document_data)
-        if not serializer.is_valid():
-            logger.error(f"Erro de validação do documento: {serializer.errors}")
-            return APIResponseHandler.validation_error_response(serializer)
-        
-        documento_criado = serializer.save()
-        
-        # Preparar e salvar signatário
-        signer_data = documento_service.prepare_signer_data(
-            api_result, request.data, documento_criado.id
-        )
-        
-        signatario_serializer = SignatarioSerializer(data=signer_data)
-        if signatario_serializer.is_valid():
-            signatario_serializer.save()
-            logger.info(f"Signatário cadastrado: {request.data.get('nome_signatario')}")
-        else:
-            logger.error(f"Erro ao cadastrar signatário: {signatario_serializer.errors}")
-
-        return APIResponseHandler.success_response(
-            data=serializer.data,
-            message=MESSAGES['DOCUMENT_CREATED'],
-            status_code=status.HTTP_201_CREATED
-        )
+    # Sem transação aberta durante a chamada ao ZapSign: a intenção é registrada,
+    # a API é chamada e o resultado é gravado em uma transação curta (outbox)
+    documento_service = DocumentoService()
+    document_data, errors = documento_service.create_document(request.data)
+    if errors:
+        return APIResponseHandler.validation_error_response(errors)
+
+    return APIResponseHandler.success_response(
+        data=document_data,
+        message=MESSAGES['DOCUMENT_CREATED'],
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @api_view([HTTP_METHODS['PUT']])
@@ -103,7 +114,7 @@ def update_documento(request, pk):
         return error_response
 
     # Usar service para interação com API externa
-    zapsign_service = ZapSignService()
+    zapsign_service = get_zapsign_service()
     
     # Atualizar documento na API ZapSign
     zapsign_service.update_document(documento.token, request.data)
@@ -129,7 +140,7 @@ def delete_documento(request, pk):
         return error_response
 
     # Usar service para interação com API externa
-    zapsign_service = ZapSignService()
+    zapsign_service = get_zapsign_service()
     
     # Deletar documento na API ZapSign
     zapsign_service.delete_document(documento.token)
@@ -0,0 +1,228 @@
+"""
+Recebimento de webhooks do ZapSign com aplicação de status em lote
+
+A view extrai (token, status) dos eventos e os grava na tabela
+webhook_status_update com um único INSERT antes de responder 202: um evento
+confirmado ao ZapSign não se perde se o processo cair. Uma thread em segundo plano
+aplica os pendentes em lote com DocumentoService.apply_status_updates, colapsando
+eventos repetidos ou fora de ordem por token, quando o processo acumula
+WEBHOOK_BATCH_SIZE eventos ou a cada WEBHOOK_FLUSH_INTERVAL segundos (com
+WEBHOOK_FLUSH_INTERVAL=0 o lote é aplicado na própria requisição). Linhas deixadas
+por um processo interrompido são aplicadas no próximo flush de qualquer processo.
+"""
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .config import AppConfig
+from .constants import (
+    DOCUMENT_FINAL_STATUSES, DOCUMENT_STATUS, SIGNER_FINAL_STATUSES, SIGNER_STATUS, WEBHOOK_UPDATE_KIND
+)
+from .models import WebhookStatusUpdate
+
+logger = logging.getLogger(__name__)
+
+# Campos de data dos eventos do ZapSign, do mais para o menos específico
+_EVENT_TIME_FIELDS = ('last_update_at', 'updated_at', 'signed_at', 'created_at')
+
+
+def _event_time(*sources: Dict[str, Any]):
+    for source in sources:
+        for field in _EVENT_TIME_FIELDS:
+            value = source.get(field)
+            try:
+                parsed = parse_datetime(value) if isinstance(value, str) else None
+            except ValueError:
+                # Formato válido com data inexistente (ex.: mês 13): trata como ausente
+                parsed = None
+            if parsed is not None:
+                return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+    return timezone.now()
+
+
+def parse_events(payload) -> Tuple[List[tuple], List[tuple], int]:
+    """
+    Extrai atualizações de status do corpo do webhook (um evento ou lista de eventos).
+
+    Retorna (documentos, signatários, ignorados), onde documentos e signatários
+    são listas de (token, status, momento do evento). Status fora de
+    DOCUMENT_STATUS/SIGNER_STATUS são ignorados.
+    """
+    events = payload if isinstance(payload, list) else [payload]
+    documents, signers, ignored = [], [], 0
+    document_statuses = set(DOCUMENT_STATUS.values())
+    signer_statuses = set(SIGNER_STATUS.values())
+
+    for event in events:
+        if not isinstance(event, dict):
+            ignored += 1
+            continue
+        event_time = _event_time(event)
+        token, event_status = event.get('token'), event.get('status')
+        if token and event_status in document_statuses:
+            documents.append((token, event_status, event_time))
+        elif token or event_status:
+            ignored += 1
+
+        signer_events = list(event.get('signers') or [])
+        if isinstance(event.get('signer_who_signed'), dict):
+            signer_events.append(event['signer_who_signed'])
+        for signer in signer_events:
+            if not isinstance(signer, dict):
+                ignored += 1
+                continue
+            signer_token, signer_status = signer.get('token'), signer.get('status')
+            if signer_token and signer_status in signer_statuses:
+                signers.append((signer_token, signer_status, _event_time(signer, event)))
+            else:
+                ignored += 1
+    return documents, signers, ignored
+
+
+class StatusUpdateBuffer:
+    """
+    Fila de atualizações de status por token, persistida na tabela webhook_status_update.
+
+    add() grava os eventos antes da resposta 202. flush() retira as linhas pendentes
+    (de qualquer processo) em blocos de batch_size, mantém para cada token apenas o
+    evento prevalente — status finais vencem status intermediários e, entre eles,
+    vence o evento mais recente — e aplica o bloco na mesma transação: se a aplicação
+    falhar, as linhas continuam na tabela para o próximo flush. Entre blocos (ou
+    flushes concorrentes), a ordem é garantida por apply_status_updates, que compara
+    cada evento com o último aplicado na linha (status_event_at).
+    """
+
+    def __init__(self, batch_size: int, flush_interval: Optional[float], apply=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._apply = apply
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._added = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _collapse(pending: Dict[str, tuple], updates: Iterable[tuple], final_statuses) -> None:
+        for token, new_status, event_time in updates:
+            key = (new_status in final_statuses, event_time)
+            current = pending.get(token)
+            if current is None or key >= current[0]:
+                pending[token] = (key, new_status)
+
+    def __len__(self) -> int:
+        return WebhookStatusUpdate.objects.count()
+
+    def add(self, documents: Iterable[tuple], signers: Iterable[tuple]) -> None:
+        rows = [
+            WebhookStatusUpdate(kind=kind, token=token, status=new_status, event_at=event_time)
+            for kind, updates in ((WEBHOOK_UPDATE_KIND['DOCUMENT'], documents),
+                                  (WEBHOOK_UPDATE_KIND['SIGNER'], signers))
+            for token, new_status, event_time in updates
+        ]
+        if not rows:
+            return
+        WebhookStatusUpdate.objects.bulk_create(rows)
+        if self.flush_interval is None:
+            # Sem thread em segundo plano: aplica na própria requisição
+            self.flush()
+            return
+        with self._lock:
+            self._added += len(rows)
+            full = self._added >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> Dict[str, int]:
+        """Aplica as atualizações pendentes no banco; retorna os totais de apply_status_updates"""
+        totals: Dict[str, int] = {}
+        with self._flush_lock:
+            with self._lock:
+                self._added = 0
+            while True:
+                result, claimed = self._flush_chunk()
+                for name, value in result.items():
+                    totals[name] = totals.get(name, 0) + value
+                if claimed < self.batch_size:
+                    return totals
+
+    def _flush_chunk(self) -> Tuple[Dict[str, int], int]:
+        with transaction.atomic():
+            # SKIP LOCKED: processos que fazem flush ao mesmo tempo pegam blocos diferentes
+            rows = list(
+                WebhookStatusUpdate.objects.select_for_update(skip_locked=True).order_by('pk')
+                .values_list('pk', 'kind', 'token', 'status', 'event_at')[:self.batch_size]
+            )
+            if not rows:
+                return {}, 0
+            updates = {kind: [] for kind in WEBHOOK_UPDATE_KIND.values()}
+            for _, kind, token, new_status, event_time in rows:
+                updates[kind].append((token, new_status, event_time))
+            documents, signers = {}, {}
+            self._collapse(documents, updates[WEBHOOK_UPDATE_KIND['DOCUMENT']], DOCUMENT_FINAL_STATUSES)
+            self._collapse(signers, updates[WEBHOOK_UPDATE_KIND['SIGNER']], SIGNER_FINAL_STATUSES)
+            result = self._get_apply()(
+                {token: status for token, (_, status) in documents.items()},
+                {token: status for token, (_, status) in signers.items()},
+                {token: event_time for token, ((_, event_time), _) in documents.items()},
+                {token: event_time for token, ((_, event_time), _) in signers.items()},
+            )
+            WebhookStatusUpdate.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        return result or {}, len(rows)
+
+    def _get_apply(self):
+        if self._apply is None:
+            from .services import DocumentoService
+            return DocumentoService().apply_status_updates
+        return self._apply
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='zapsign-webhook-flusher', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self._flush_quietly)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush_quietly()
+
+    def _flush_quietly(self) -> None:
+        try:
+            result = self.flush()
+            if result:
+                logger.info(f"Status de webhooks aplicados: {result}")
+        except Exception as e:
+            logger.error(f"Erro ao aplicar status de webhooks: {str(e)}")
+        finally:
+            close_old_connections()
+
+
+_webhook_buffer: Optional[StatusUpdateBuffer] = None
+_webhook_buffer_lock = threading.Lock()
+
+
+def get_webhook_buffer() -> StatusUpdateBuffer:
+    """Retorna o buffer de webhooks compartilhado pelo processo"""
+    global _webhook_buffer
+    if _webhook_buffer is None:
+        with _webhook_buffer_lock:
+            if _webhook_buffer is None:
+                webhook_config = AppConfig.get_webhook_config()
+                _webhook_buffer = StatusUpdateBuffer(
+                    batch_size=webhook_config['batch_size'],
+                    flush_interval=webhook_config['flush_interval'] or None,
+                )
+    return _webhook_buffer
@@ -0,0 +1,259 @@
+"""
+Benchmark: carga e latência dos endpoints de documentos
+
+Cria um banco de testes temporário com --companies empresas, --documents
+documentos e --signers signatários por documento e dispara --requests
+requisições por cenário, em --concurrency threads, pela pilha completa do Django
+(django.test.Client, sem socket HTTP). As chamadas ao ZapSign vão para o
+servidor falso local (benchmarks/fake_zapsign.py), então tudo roda offline.
+
+Para cada cenário informa p50/p95/p99, vazão, erros e consultas SQL por
+requisição; --output grava o resultado em JSON e --compare mostra a variação em
+relação a um resultado anterior.
+
+Uso:
+    python -m benchmarks.bench_api --documents 10000 --requests 500 --concurrency 8 \\
+        --output resultado.json --compare anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from api.config import AppConfig  # noqa: E402
+from api.models import Documento, Empresa, Signatario  # noqa: E402
+from api.services import get_zapsign_service  # noqa: E402
+from benchmarks.common import latency_summary  # noqa: E402
+from benchmarks.fake_zapsign import FakeZapSignServer  # noqa: E402
+
+SEED_BATCH_SIZE = 2000
+
+
+def seed(companies, documents, signers):
+    """Popula empresas, documentos e signatários; retorna (ids de empresa, ids de documento)"""
+    empresas = Empresa.objects.bulk_create(
+        Empresa(name=f'Empresa {i}', apiToken=f'token-{i}') for i in range(companies)
+    )
+    statuses = ['pending', 'signed', 'cancelled']
+    documentos = Documento.objects.bulk_create(
+        (
+            Documento(
+                openID=i, token=f'doc-{i}', name=f'Documento {i}', status=statuses[i % 3],
+                created_by='bench@example.com', company_id=empresas[i % companies],
+            )
+            for i in range(documents)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    Signatario.objects.bulk_create(
+        (
+            Signatario(
+                token=f'sig-{documento.openID}-{j}', status='new', name=f'Signatário {j}',
+                email=f'signer{documento.openID}.{j}@example.com', documentID=documento,
+            )
+            for documento in documentos
+            for j in range(signers)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE company, document, signers')
+    return [empresa.id for empresa in empresas], [documento.id for documento in documentos]
+
+
+def build_scenarios(company_ids, document_ids, deletable_ids):
+    """Cenários: nome -> função (client, rng) que executa uma requisição"""
+    deletable = list(deletable_ids)
+    deletable_lock = threading.Lock()
+
+    def next_deletable():
+        with deletable_lock:
+            return deletable.pop()
+
+    def create(client, rng):
+        return client.post('/api/documento/create', {
+            'name': 'Benchmark',
+            'url_documento': 'https://example.com/doc.pdf',
+            'nome_signatario': 'Bench',
+            'email_signatario': 'bench@example.com',
+            'company_id': rng.choice(company_ids),
+        }, content_type='application/json')
+
+    return {
+        'list': lambda client, rng: client.get('/api/documento'),
+        'list_sparse': lambda client, rng: client.get('/api/documento', {'fields': 'id,name,status'}),
+        'list_filtered': lambda client, rng: client.get('/api/documento', {
+            'status': 'signed', 'company': rng.choice(company_ids),
+        }),
+        'list_search': lambda client, rng: client.get('/api/documento', {
+            'search': str(rng.randint(100, 999)),
+        }),
+        'detail': lambda client, rng: client.get(f'/api/documento/{rng.choice(document_ids)}'),
+        'create': create,
+        'update': lambda client, rng: client.put(
+            f'/api/documento/update/{rng.choice(document_ids)}',
+            {'name': f'Atualizado {rng.randint(0, 10 ** 6)}'}, content_type='application/json',
+        ),
+        'delete': lambda client, rng: client.delete(f'/api/documento/delete/{next_deletable()}'),
+    }
+
+
+def run_scenario(request, total, concurrency, seed):
+    """Executa total requisições em concurrency threads; retorna as métricas do cenário"""
+
+    def worker(index, count):
+        client = Client()
+        rng = random.Random(seed * 1000 + index)
+        samples = []
+        try:
+            for _ in range(count):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = request(client, rng)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                samples.append((elapsed_ms, response.status_code, len(queries.captured_queries)))
+        finally:
+            connection.close()
+        return samples
+
+    counts = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, range(concurrency), counts))
+    elapsed = time.perf_counter() - started
+
+    samples = [sample for result in results for sample in result]
+    queries = [sample[2] for sample in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[1] >= 400),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'latency_ms': latency_summary([sample[0] for sample in samples]),
+        'queries': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else 0,
+            'max': max(queries, default=0),
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"{'cenário':<15}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'consultas':>11}{'erros':>7}")
+    for name, result in results.items():
+        latency = result['latency_ms']
+        print(f"{name:<15}{result['throughput_rps']:>9.1f}{latency['p50']:>9.2f}"
+              f"{latency['p95']:>9.2f}{latency['p99']:>9.2f}{result['queries']['mean']:>11.1f}"
+              f"{result['errors']:>7}")
+
+
+def print_comparison(previous, results):
+    """Variação percentual em relação a um resultado anterior (negativo = mais rápido)"""
+    print(f"\ncomparação com {previous['meta'].get('git_commit') or 'resultado anterior'}")
+    print(f"{'cenário':<15}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'consultas':>11}")
+
+    def delta(old, new):
+        return f'{(new - old) / old * 100:+.0f}%' if old else '-'
+
+    for name, result in results.items():
+        old = previous['scenarios'].get(name)
+        if old is None:
+            continue
+        print(f"{name:<15}{delta(old['throughput_rps'], result['throughput_rps']):>9}"
+              + ''.join(f"{delta(old['latency_ms'][p], result['latency_ms'][p]):>9}"
+                        for p in ('p50', 'p95', 'p99'))
+              + f"{delta(old['queries']['mean'], result['queries']['mean']):>11}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--signers', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=500, help="Requisições por cenário")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', default='',
+                        help="Cenários separados por vírgula (padrão: todos)")
+    parser.add_argument('--zapsign-latency', type=float, default=0.0,
+                        help="Latência simulada do ZapSign por chamada, em segundos")
+    parser.add_argument('--cache', action='store_true',
+                        help="Mantém o cache de leituras ligado (padrão: desligado)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Arquivo JSON de resultado")
+    parser.add_argument('--compare', help="Resultado JSON anterior para comparação")
+    args = parser.parse_args(argv)
+
+    AppConfig.DOCUMENT_CACHE_ENABLED = args.cache
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with FakeZapSignServer(latency=args.zapsign_latency) as server:
+            get_zapsign_service().base_url = server.base_url
+            print(f'Populando {args.documents} documentos...')
+            company_ids, document_ids = seed(args.companies, args.documents, args.signers)
+            # Documentos reservados ao cenário de exclusão
+            deletable_ids = document_ids[:args.requests]
+            document_ids = document_ids[args.requests:] or document_ids
+            scenarios = build_scenarios(company_ids, document_ids, deletable_ids)
+            selected = [name for name in args.scenarios.split(',') if name] or list(scenarios)
+            unknown = sorted(set(selected) - set(scenarios))
+            if unknown:
+                parser.error(f"cenários desconhecidos: {', '.join(unknown)}")
+
+            results = {}
+            for name in selected:
+                results[name] = run_scenario(scenarios[name], args.requests, args.concurrency, args.seed)
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print_results(results)
+    output = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'args': vars(args),
+        },
+        'scenarios': results,
+    }
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous_file:
+            print_comparison(json.load(previous_file), results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(output, output_file, indent=2, ensure_ascii=False)
+        print(f'\nresultado gravado em {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
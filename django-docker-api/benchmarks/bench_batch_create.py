@@ -0,0 +1,79 @@
+"""
+Benchmark: criação de documentos em lote x laço serial de criações unitárias
+
+Cria um banco de testes temporário, aponta o ZapSignService para um servidor
+ZapSign falso local (com latência configurável) e compara o tempo total do laço
+serial (um create_document por vez) com DocumentoService.create_documents_batch.
+
+Uso:
+    python -m benchmarks.bench_batch_create --documents 1000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.models import Empresa  # noqa: E402
+from api.services import DocumentoService, get_zapsign_service  # noqa: E402
+from benchmarks.fake_zapsign import FakeZapSignServer  # noqa: E402
+
+
+def build_items(count, company_id, prefix):
+    return [
+        {
+            'name': f'{prefix} {i}',
+            'url_documento': 'https://example.com/doc.pdf',
+            'nome_signatario': f'Signatário {i}',
+            'email_signatario': f'signer{i}@example.com',
+            'company_id': company_id,
+        }
+        for i in range(count)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--documents', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="Latência simulada do ZapSign por chamada, em segundos")
+    args = parser.parse_args(argv)
+
+    test_db = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with FakeZapSignServer(latency=args.latency) as server:
+            get_zapsign_service().base_url = server.base_url
+            empresa = Empresa.objects.create(name='Benchmark', apiToken='benchmark')
+            service = DocumentoService()
+
+            started = time.perf_counter()
+            for item in build_items(args.documents, empresa.id, 'Serial'):
+                service.create_document(item)
+            serial = time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = service.create_documents_batch(build_items(args.documents, empresa.id, 'Lote'))
+            batch = time.perf_counter() - started
+            assert all(result['success'] for result in results)
+    finally:
+        connection.creation.destroy_test_db(test_db, verbosity=0)
+
+    print(f"{args.documents} documentos, latência simulada {args.latency * 1000:.0f} ms")
+    print(f"{'modo':<10}{'tempo s':>10}{'docs/s':>10}")
+    print(f"{'serial':<10}{serial:>10.2f}{args.documents / serial:>10.0f}")
+    print(f"{'lote':<10}{batch:>10.2f}{args.documents / batch:>10.0f}")
+    print(f"ganho: {serial / batch:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
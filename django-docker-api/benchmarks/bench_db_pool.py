@@ -0,0 +1,137 @@
+"""
+Benchmark: tempo de conexão ao Postgres no caminho da requisição
+
+Compara três configurações do banco, cada uma em um processo próprio (as
+configurações vêm das variáveis de ambiente lidas em core/settings.py):
+
+- sem reuso: DB_POOL=0 e DB_CONN_MAX_AGE=0, nova conexão a cada requisição;
+- persistente: DB_POOL=0 e DB_CONN_MAX_AGE=60, uma conexão por thread;
+- pool: DB_POOL=1, pool do psycopg 3 com --concurrency conexões.
+
+Cada requisição simulada dispara os sinais request_started/request_finished (o
+mesmo ciclo do handler do Django), obtém a conexão e executa uma consulta curta.
+Informa o tempo até a conexão ficar disponível, a latência total, a vazão e
+quantas conexões distintas o servidor atendeu.
+
+Uso:
+    python -m benchmarks.bench_db_pool --requests 2000 --concurrency 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+MODES = {
+    'sem reuso': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '0'},
+    'persistente': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '60'},
+    'pool': {'DB_POOL': '1'},
+}
+
+
+def run_worker(requests, concurrency, warmup):
+    """Executa as requisições simuladas no processo atual e retorna as métricas"""
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    from benchmarks.common import latency_summary
+
+    def simulate_request():
+        request_started.send(sender=None)
+        try:
+            started = time.perf_counter()
+            connection.ensure_connection()
+            connected = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                pid = cursor.fetchone()[0]
+            finished = time.perf_counter()
+        finally:
+            request_finished.send(sender=None)
+        return (connected - started) * 1000, (finished - started) * 1000, pid
+
+    def worker(count):
+        try:
+            return [simulate_request() for _ in range(count)]
+        finally:
+            connection.close()
+
+    counts = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Aquecimento: abre o pool (ou as conexões persistentes) antes da medição
+        list(executor.map(worker, [warmup] * concurrency))
+        started = time.perf_counter()
+        samples = [sample for result in executor.map(worker, counts) for sample in result]
+        elapsed = time.perf_counter() - started
+
+    return {
+        'pool': bool(settings.DATABASES['default'].get('OPTIONS', {}).get('pool')),
+        'connect_ms': latency_summary([sample[0] for sample in samples]),
+        'request_ms': latency_summary([sample[1] for sample in samples]),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'connections': len({sample[2] for sample in samples}),
+    }
+
+
+def run_mode(name, args):
+    env = {
+        **os.environ,
+        **MODES[name],
+        'DB_POOL_MIN_SIZE': str(args.concurrency),
+        'DB_POOL_MAX_SIZE': str(args.concurrency),
+    }
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_db_pool', '--worker',
+         '--requests', str(args.requests), '--concurrency', str(args.concurrency),
+         '--warmup', str(args.warmup)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=5, help="Requisições de aquecimento por thread")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.concurrency, args.warmup)))
+        return 0
+
+    results = {}
+    for name in MODES:
+        result = run_mode(name, args)
+        if name == 'pool' and not result['pool']:
+            print('pool indisponível (instale psycopg[pool]); modo ignorado')
+            continue
+        results[name] = result
+
+    print(f"{args.requests} requisições, {args.concurrency} threads")
+    print(f"{'modo':<13}{'conexão p50':>13}{'conexão p95':>13}{'req p50 ms':>12}"
+          f"{'req p95 ms':>12}{'req/s':>9}{'conexões':>10}")
+    for name, result in results.items():
+        connect, request = result['connect_ms'], result['request_ms']
+        print(f"{name:<13}{connect['p50']:>13.3f}{connect['p95']:>13.3f}{request['p50']:>12.3f}"
+              f"{request['p95']:>12.3f}{result['throughput_rps']:>9.0f}{result['connections']:>10}")
+    if 'pool' in results:
+        saved = results['sem reuso']['request_ms']['mean'] - results['pool']['request_ms']['mean']
+        print(f"latência média economizada por requisição (pool x sem reuso): {saved:.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark: planos de execução e latência das consultas de document/signers com e sem índices
+
+Cria um banco de testes temporário, desfaz a migração de índices
+(0004_document_signers_indexes), popula as tabelas com --rows documentos (e um
+signatário por documento) via generate_series e mede cada consulta; em seguida
+aplica a migração (CREATE INDEX CONCURRENTLY) e repete as medições.
+
+Uso:
+    python -m benchmarks.bench_indexes --rows 1000000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from api.models import Documento, Signatario  # noqa: E402
+
+INDEX_MIGRATION = '0004_document_signers_indexes'
+PREVIOUS_MIGRATION = '0003_document_last_updated_index'
+STATUSES = ['pending', 'signed', 'refused']
+COMPANIES = 50
+
+
+def seed(rows):
+    """Popula empresas, documentos e signatários diretamente no banco"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO company (name, api_token, created_at, last_updated_at)
+            SELECT 'Empresa ' || i, 'token-' || i, now(), now()
+            FROM generate_series(1, %s) AS i
+            """,
+            [COMPANIES],
+        )
+        cursor.execute('SELECT min(id) FROM company')
+        first_company = cursor.fetchone()[0]
+        cursor.execute(
+            """
+            INSERT INTO document
+                ("openID", token, name, status, created_at, last_updated_at, created_by, company_id)
+            SELECT i, 'doc-' || i, 'Documento ' || i, (%s::text[])[1 + i %% 3],
+                   now() - i * interval '1 second', now() - i * interval '1 second',
+                   'bench@example.com', %s + i %% %s
+            FROM generate_series(1, %s) AS i
+            """,
+            [STATUSES, first_company, COMPANIES, rows],
+        )
+        cursor.execute(
+            """
+            INSERT INTO signers (token, status, name, email, "documentID")
+            SELECT 'sig-' || d."openID", 'new', 'Signatário ' || d."openID",
+                   'signer' || d."openID" || '@example.com', d.id
+            FROM document d
+            """
+        )
+        cursor.execute('ANALYZE company, document, signers')
+        return first_company
+
+
+def build_queries(rows, company_id):
+    """Consultas reproduzindo os padrões de acesso reais da API"""
+    middle = rows // 2
+    return {
+        'documento por token (callback ZapSign)': lambda: Documento.objects.filter(token=f'doc-{middle}'),
+        'listagem (cursor created_at, id)': lambda: Documento.objects.order_by('-created_at', '-id')[:51],
+        'status + empresa ordenado': lambda: (
+            Documento.objects.filter(status='signed', company_id=company_id)
+            .order_by('-created_at', '-id')[:51]
+        ),
+        'status ordenado': lambda: (
+            Documento.objects.filter(status='refused').order_by('-created_at', '-id')[:51]
+        ),
+        'signatário por e-mail': lambda: Signatario.objects.filter(email=f'signer{middle}@example.com'),
+        'signatário por token': lambda: Signatario.objects.filter(token=f'sig-{middle}'),
+    }
+
+
+def measure(queries, repeat):
+    results = {}
+    for name, build in queries.items():
+        plan = build().explain(analyze=True)
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(build())
+            latencies.append((time.perf_counter() - started) * 1000)
+        results[name] = {'plan': plan, 'p50_ms': statistics.median(latencies)}
+    return results
+
+
+def print_plans(title, results):
+    print(f'\n=== {title} ===')
+    for name, result in results.items():
+        print(f'\n-- {name} (p50 {result["p50_ms"]:.2f} ms)')
+        print(result['plan'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        call_command('migrate', 'api', PREVIOUS_MIGRATION, verbosity=0)
+        print(f'Populando {args.rows} documentos e signatários...')
+        company_id = seed(args.rows)
+        queries = build_queries(args.rows, company_id)
+        before = measure(queries, args.repeat)
+
+        started = time.perf_counter()
+        call_command('migrate', 'api', INDEX_MIGRATION, verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE document, signers')
+        migration_seconds = time.perf_counter() - started
+        after = measure(queries, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print_plans('sem índices', before)
+    print_plans('com índices', after)
+    print(f'\nmigração de índices (concorrente): {migration_seconds:.1f} s')
+    print(f"\n{'consulta':<42}{'antes ms':>10}{'depois ms':>11}{'ganho':>9}")
+    for name in queries:
+        before_ms, after_ms = before[name]['p50_ms'], after[name]['p50_ms']
+        print(f'{name:<42}{before_ms:>10.2f}{after_ms:>11.2f}{before_ms / after_ms:>8.0f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
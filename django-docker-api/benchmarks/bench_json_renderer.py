@@ -0,0 +1,93 @@
+"""
+Benchmark: JSONRenderer do DRF (stdlib) x FastJSONRenderer (orjson) na listagem
+
+Monta uma página da listagem de documentos no formato da API (--documents itens,
+--signers signatários cada) e mede a renderização de cada renderer, conferindo
+antes que os bytes gerados são idênticos. Não usa banco de dados.
+
+Uso:
+    python -m benchmarks.bench_json_renderer --documents 5000 --signers 2 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.renderers import FastJSONRenderer, use_orjson  # noqa: E402
+
+
+def build_page(documents, signers):
+    return {
+        'next': 'http://localhost:8001/api/documento?cursor=eyJjIjoiMjAyNS0wMS0wMSJ9',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'signers': [
+                    {
+                        'id': i * signers + j, 'token': f'sig-{i}-{j}', 'status': 'new',
+                        'name': f'Signatário {j}', 'email': f'signer{i}.{j}@example.com',
+                        'externalID': None, 'documentID': i,
+                    }
+                    for j in range(signers)
+                ],
+                'openID': i, 'token': f'doc-{i}', 'name': f'Procuração nº {i}',
+                'status': 'pending', 'created_at': '2025-01-02T03:04:05.678901-03:00',
+                'last_updated_at': '2025-01-02T03:04:05.678901-03:00',
+                'created_by': 'bench@example.com', 'externalID': None, 'company_id': 1,
+            }
+            for i in range(documents)
+        ],
+    }
+
+
+def measure(renderer, data, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        renderer.render(data)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--signers', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not use_orjson():
+        print('orjson indisponível (ou JSON_BACKEND=json): FastJSONRenderer usará a stdlib')
+
+    data = build_page(args.documents, args.signers)
+    rendered = JSONRenderer().render(data)
+    if FastJSONRenderer().render(data) != rendered:
+        print('ERRO: saídas diferentes entre os renderers')
+        return 1
+
+    stdlib_seconds = measure(JSONRenderer(), data, args.repeat)
+    fast_seconds = measure(FastJSONRenderer(), data, args.repeat)
+
+    print(f'{args.documents} documentos, {args.signers} signatários cada, '
+          f'{len(rendered) / 1024 / 1024:.1f} MiB')
+    print(f"{'renderer':<20}{'mediana ms':>12}{'MiB/s':>10}")
+    for name, seconds in (('JSONRenderer', stdlib_seconds), ('FastJSONRenderer', fast_seconds)):
+        print(f'{name:<20}{seconds * 1000:>12.2f}{len(rendered) / 1024 / 1024 / seconds:>10.0f}')
+    print(f'ganho: {stdlib_seconds / fast_seconds:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark: DocumentoWithSignersSerializer x DocumentoValuesSerializer na listagem
+
+Cria um banco de testes temporário com --documents documentos (e --signers
+signatários por documento) e mede, em páginas de --page-size itens, a consulta
+mais a serialização de cada caminho: ModelSerializer sobre instâncias com
+prefetch_related e o serializador rápido sobre linhas de values().
+
+Uso:
+    python -m benchmarks.bench_serializers --documents 5000 --signers 2 --page-size 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.models import Documento, Empresa, Signatario  # noqa: E402
+from api.serializers import DocumentoValuesSerializer, DocumentoWithSignersSerializer  # noqa: E402
+
+
+def seed(documents, signers):
+    empresa = Empresa.objects.create(name='Benchmark', apiToken='benchmark')
+    created = Documento.objects.bulk_create(
+        Documento(
+            openID=i, token=f'doc-{i}', name=f'Documento {i}', status='pending',
+            created_by='bench@example.com', company_id=empresa,
+        )
+        for i in range(documents)
+    )
+    Signatario.objects.bulk_create(
+        Signatario(
+            token=f'sig-{documento.openID}-{j}', status='new', name=f'Signatário {j}',
+            email=f'signer{documento.openID}.{j}@example.com', documentID=documento,
+        )
+        for documento in created
+        for j in range(signers)
+    )
+
+
+def model_serializer_pages(page_size):
+    queryset = Documento.objects.with_signers().order_by('-created_at', '-id')
+    for start in range(0, queryset.count(), page_size):
+        DocumentoWithSignersSerializer(queryset[start:start + page_size], many=True).data
+
+
+def values_serializer_pages(page_size):
+    queryset = Documento.objects.order_by('-created_at', '-id').values(
+        *DocumentoValuesSerializer.values_fields()
+    )
+    for start in range(0, queryset.count(), page_size):
+        DocumentoValuesSerializer(queryset[start:start + page_size], many=True).data
+
+
+def measure(run, page_size, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(page_size)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--signers', type=int, default=2)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        seed(args.documents, args.signers)
+        model_seconds = measure(model_serializer_pages, args.page_size, args.repeat)
+        values_seconds = measure(values_serializer_pages, args.page_size, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f'{args.documents} documentos, {args.signers} signatários cada, páginas de {args.page_size}')
+    print(f"{'serializador':<30}{'mediana s':>11}{'linhas/s':>12}")
+    for name, seconds in (('DocumentoWithSignersSerializer', model_seconds),
+                          ('DocumentoValuesSerializer', values_seconds)):
+        print(f'{name:<30}{seconds:>11.3f}{args.documents / seconds:>12.0f}')
+    print(f'ganho: {model_seconds / values_seconds:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
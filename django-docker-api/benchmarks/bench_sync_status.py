@@ -0,0 +1,75 @@
+"""
+Benchmark: sincronização de status (sync_document_status) contra um ZapSign falso
+
+Cria um banco de testes temporário com --documents documentos pendentes, executa
+o comando com a concorrência e a taxa informadas contra um servidor ZapSign falso
+com latência configurável e compara o tempo com a estimativa do laço serial
+(uma chamada por vez).
+
+Uso:
+    python -m benchmarks.bench_sync_status --documents 10000 --latency 0.1 --concurrency 50 --rate 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import StringIO
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from api.config import AppConfig  # noqa: E402
+from api.models import Documento, Empresa  # noqa: E402
+from benchmarks.fake_zapsign import FakeZapSignServer  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.1,
+                        help="Latência simulada do ZapSign por chamada, em segundos")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=1000.0)
+    args = parser.parse_args(argv)
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        empresa = Empresa.objects.create(name='Benchmark', apiToken='benchmark')
+        Documento.objects.bulk_create(
+            Documento(openID=i, token=f'bench-{i}', name=f'Documento {i}', status='pending',
+                      created_by='bench@example.com', company_id=empresa)
+            for i in range(args.documents)
+        )
+        with FakeZapSignServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+            AppConfig.ZAPSIGN_API_BASE_URL = server.base_url
+            started = time.perf_counter()
+            call_command(
+                'sync_document_status', concurrency=args.concurrency, rate=args.rate,
+                checkpoint=os.path.join(tmp, 'checkpoint.json'), stdout=StringIO()
+            )
+            elapsed = time.perf_counter() - started
+        signed = Documento.objects.filter(status='signed').count()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    serial = args.documents * args.latency
+    print(f"{args.documents} documentos, latência {args.latency * 1000:.0f} ms, "
+          f"concorrência {args.concurrency}, taxa {args.rate:.0f}/s")
+    print(f"sincronização: {elapsed:.1f} s ({args.documents / elapsed:.0f} documentos/s), "
+          f"{signed} alterados")
+    print(f"laço serial estimado: {serial:.1f} s ({serial / elapsed:.1f}x mais lento)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Benchmark: latência por chamada do ZapSignService com e sem pool de conexões
+
+Compara o comportamento antigo (requests.post/put/delete do módulo, uma nova
+conexão por chamada) com a sessão compartilhada keep-alive, contra um servidor
+ZapSign falso local.
+
+Uso:
+    python -m benchmarks.bench_zapsign_pool --calls 500 --threads 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('ZAPSIGN_API_TOKEN', 'benchmark-token')
+os.environ.setdefault('ZAPSIGN_API_BASE_URL', 'http://127.0.0.1:9/api/v1')
+
+import django  # noqa: E402
+
+django.setup()
+
+import requests  # noqa: E402
+
+from api.services import ZapSignService, get_http_session  # noqa: E402
+from benchmarks.fake_zapsign import FakeZapSignServer  # noqa: E402
+
+
+class UnpooledZapSignService(ZapSignService):
+    """Reproduz o comportamento anterior: nova conexão a cada chamada"""
+
+    def _request(self, method, path, payload=None):
+        return requests.request(
+            method,
+            f'{self.base_url}{path}',
+            json=payload,
+            headers=self.headers,
+            timeout=self.timeout
+        )
+
+
+DOCUMENT = {
+    'name': 'Benchmark',
+    'url_documento': 'https://example.com/doc.pdf',
+    'nome_signatario': 'Bench',
+    'email_signatario': 'bench@example.com',
+}
+
+
+def run(service, calls, threads):
+    def one_call(_):
+        start = time.perf_counter()
+        service.create_document(DOCUMENT)
+        return (time.perf_counter() - start) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(one_call, range(calls)))
+    elapsed = time.perf_counter() - started
+    return {
+        'mean_ms': statistics.fmean(latencies),
+        'p50_ms': latencies[len(latencies) // 2],
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1],
+        'calls_per_s': calls / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with FakeZapSignServer() as server:
+        unpooled = UnpooledZapSignService()
+        pooled = ZapSignService(session=get_http_session())
+        for service in (unpooled, pooled):
+            service.base_url = server.base_url
+            run(service, min(args.calls, 20), args.threads)  # aquecimento
+
+        results = {
+            'sem pool (requests.post)': run(unpooled, args.calls, args.threads),
+            'sessão com pool': run(pooled, args.calls, args.threads),
+        }
+
+    print(f"{args.calls} chamadas create_document, {args.threads} threads")
+    print(f"{'modo':<26}{'média ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'chamadas/s':>12}")
+    for name, result in results.items():
+        print(f"{name:<26}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['calls_per_s']:>12.0f}")
+    saved = results['sem pool (requests.post)']['mean_ms'] - results['sessão com pool']['mean_ms']
+    print(f"latência economizada por chamada: {saved:.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
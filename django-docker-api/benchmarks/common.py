@@ -0,0 +1,26 @@
+"""
+Utilitários compartilhados pelos benchmarks
+"""
+import math
+import statistics
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores já ordenados)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    """Média, p50, p95, p99 e máximo das latências, em milissegundos"""
+    ordered = sorted(latencies_ms)
+    return {
+        'mean': round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        'p50': round(percentile(ordered, 50), 3),
+        'p95': round(percentile(ordered, 95), 3),
+        'p99': round(percentile(ordered, 99), 3),
+        'max': round(ordered[-1], 3) if ordered else 0.0,
+    }
@@ -0,0 +1,348 @@
+"""
+Servidor local que simula a API ZapSign para benchmarks e testes
+
+Implementa as rotas usadas pelo ZapSignService (POST /docs/, GET/PUT/DELETE
+/docs/{token}/ e POST /docs/{token}/add-signer/) com injeção de falhas:
+distribuição de latência, taxa de erros, limite de requisições (429 com
+Retry-After), respostas lentas e respostas truncadas (Content-Length maior que
+o corpo enviado, seguido do fechamento da conexão).
+
+Em processo (testes e benchmarks):
+
+    with FakeZapSignServer(latency='normal:0.05,0.01', error_rate=0.02) as server:
+        service.base_url = server.base_url
+
+Standalone (testes de carga), a partir da pasta django-docker-api:
+
+    python -m benchmarks.fake_zapsign --port 8765 --latency lognormal:0.08,0.5 \\
+        --error-rate 0.01 --rate-limit 100 --slow-rate 0.01 --truncate-rate 0.005
+
+Depende apenas da biblioteca padrão.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import signal
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Union
+
+ROUTE = re.compile(r'^(?:/api/v1)?/docs/(?:(?P<token>[^/?]+)/(?P<action>add-signer/)?)?(?:\?.*)?$')
+
+
+class LatencyDistribution:
+    """
+    Latência por requisição, em segundos, a partir de uma especificação textual:
+
+        0.05 ou fixed:0.05       constante
+        uniform:0.01,0.2         uniforme entre mínimo e máximo
+        normal:0.05,0.01         normal (média, desvio), truncada em zero
+        exponential:0.05         exponencial com a média informada
+        lognormal:0.05,0.5       log-normal com a mediana e o sigma informados
+    """
+    KINDS = ('fixed', 'uniform', 'normal', 'exponential', 'lognormal')
+    ARITY = {'fixed': 1, 'uniform': 2, 'normal': 2, 'exponential': 1, 'lognormal': 2}
+
+    def __init__(self, kind: str = 'fixed', *params: float):
+        if kind not in self.KINDS:
+            raise ValueError(f"Distribuição desconhecida: {kind}. Use uma de: {', '.join(self.KINDS)}")
+        if len(params) != self.ARITY[kind]:
+            raise ValueError(f"A distribuição {kind} recebe {self.ARITY[kind]} parâmetro(s)")
+        if any(param < 0 for param in params):
+            raise ValueError("Parâmetros de latência não podem ser negativos")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: Union[str, float, int, None, 'LatencyDistribution']) -> 'LatencyDistribution':
+        if isinstance(spec, cls):
+            return spec
+        if spec is None or spec == '':
+            return cls('fixed', 0.0)
+        if isinstance(spec, (int, float)):
+            return cls('fixed', float(spec))
+        kind, _, values = spec.partition(':')
+        if not values:
+            kind, values = 'fixed', kind
+        try:
+            params = [float(value) for value in values.split(',')]
+        except ValueError:
+            raise ValueError(f"Latência inválida: {spec}")
+        return cls(kind.strip().lower(), *params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return rng.uniform(*self.params)
+        if self.kind == 'normal':
+            return max(0.0, rng.gauss(*self.params))
+        if self.kind == 'exponential':
+            return rng.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma) if median else 0.0
+
+    def __repr__(self) -> str:
+        return f"{self.kind}:{','.join(str(param) for param in self.params)}"
+
+
+class FaultInjector:
+    """Decide, por requisição, a latência e a falha simulada; conta os resultados"""
+
+    OUTCOMES = ('ok', 'error', 'rate_limited', 'slow', 'truncated', 'not_found', 'unauthorized')
+
+    def __init__(self, latency=0.0, error_rate: float = 0.0, error_status: int = 500,
+                 rate_limit: Optional[float] = None, retry_after: int = 1,
+                 slow_rate: float = 0.0, slow_latency: float = 5.0,
+                 truncate_rate: float = 0.0, seed: Optional[int] = None):
+        for name, rate in (('error_rate', error_rate), ('slow_rate', slow_rate),
+                           ('truncate_rate', truncate_rate)):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} deve estar entre 0 e 1")
+        self.latency = LatencyDistribution.parse(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.truncate_rate = truncate_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit or 0)
+        self._refilled_at = time.monotonic()
+        self._counters: Dict[str, int] = {}
+        self.reset_stats()
+
+    def _chance(self, rate: float) -> bool:
+        return rate > 0 and self._rng.random() < rate
+
+    def allow_request(self) -> bool:
+        """Token bucket de rate_limit requisições/s (capacidade de 1 s)"""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def plan(self) -> Dict[str, object]:
+        """Sorteia latência e falhas de uma requisição (RNG compartilhado, sob lock)"""
+        with self._lock:
+            slow = self._chance(self.slow_rate)
+            return {
+                'delay': self.latency.sample(self._rng) + (self.slow_latency if slow else 0.0),
+                'slow': slow,
+                'error': self._chance(self.error_rate),
+                'truncate': self._chance(self.truncate_rate),
+            }
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters[outcome] += 1
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters = {'requests': 0, **{outcome: 0 for outcome in self.OUTCOMES}}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+class FakeZapSignHandler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) com as rotas usadas pelo ZapSignService"""
+    protocol_version = 'HTTP/1.1'
+    # Headers e corpo saem em writes separados; sem TCP_NODELAY o keep-alive
+    # esbarra no delayed ACK e a medição fica distorcida
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def faults(self) -> FaultInjector:
+        return self.server.faults
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send_json(self, data, status_code=200, headers=None, truncate=False):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            if truncate:
+                # Corpo incompleto e conexão encerrada: o cliente vê uma leitura interrompida
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente desistiu (ex.: timeout de leitura durante uma resposta lenta)
+            self.close_connection = True
+
+    def _handle(self, method):
+        # O corpo é sempre consumido para não corromper a conexão keep-alive
+        payload = self._read_json() if method in ('POST', 'PUT') else {}
+        match = ROUTE.match(self.path)
+        token = match and match.group('token')
+        action = match and match.group('action')
+        if (match is None or (method == 'POST') == bool(token and not action)
+                or (action and method != 'POST')):
+            self.faults.record('not_found')
+            self._send_json({'detail': 'Not found.'}, 404)
+            return
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self.faults.record('unauthorized')
+            self._send_json({'detail': 'Authentication credentials were not provided.'}, 401)
+            return
+        if not self.faults.allow_request():
+            self.faults.record('rate_limited')
+            self._send_json(
+                {'detail': 'Request was throttled.'}, 429,
+                headers={'Retry-After': str(self.faults.retry_after)}
+            )
+            return
+
+        plan = self.faults.plan()
+        if plan['delay']:
+            time.sleep(plan['delay'])
+        if plan['error']:
+            self.faults.record('error')
+            self._send_json({'detail': 'Simulated server error.'}, self.faults.error_status)
+            return
+
+        self.faults.record('truncated' if plan['truncate'] else 'slow' if plan['slow'] else 'ok')
+        self._send_json(self._route(method, token, action, payload), truncate=plan['truncate'])
+
+    @staticmethod
+    def _route(method, token, action, payload):
+        if method == 'POST' and action:
+            return {'token': str(uuid.uuid4()), 'status': 'new', **payload}
+        if method == 'POST':
+            return {
+                'open_id': 1,
+                'token': str(uuid.uuid4()),
+                'status': 'pending',
+                'name': payload.get('name'),
+                'created_by': {'email': 'fake@zapsign.local'},
+                'signers': [{'token': str(uuid.uuid4()), 'status': 'new'}],
+            }
+        if method == 'GET':
+            # Status determinístico por token: metade dos documentos aparece assinada
+            signed = zlib.crc32(token.encode()) % 2 == 0
+            return {'token': token, 'status': 'signed' if signed else 'pending', 'signers': []}
+        if method == 'PUT':
+            return {'token': token, **payload}
+        return {}
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class FakeZapSignServer:
+    """Executa o servidor falso em uma thread de fundo (parâmetros em FaultInjector)"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, **faults):
+        self.httpd = ThreadingHTTPServer((host, port), FakeZapSignHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.faults = FaultInjector(latency=latency, **faults)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/api/v1'
+
+    @property
+    def faults(self) -> FaultInjector:
+        return self.httpd.faults
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return self.faults.stats
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='0', help="Ex.: 0.05, uniform:0.01,0.2, lognormal:0.08,0.5")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--rate-limit', type=float, default=None, help="Requisições por segundo")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    parser.add_argument('--slow-latency', type=float, default=5.0)
+    parser.add_argument('--truncate-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = FakeZapSignServer(
+        host=args.host, port=args.port, latency=args.latency, error_rate=args.error_rate,
+        error_status=args.error_status, rate_limit=args.rate_limit, retry_after=args.retry_after,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+        truncate_rate=args.truncate_rate, seed=args.seed,
+    )
+    print(f'ZapSign falso em {server.base_url} (latência {server.faults.latency}); '
+          f'use ZAPSIGN_API_BASE_URL={server.base_url}. Ctrl+C para encerrar.')
+    # SIGTERM (docker stop, timeout) também encerra imprimindo os contadores
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
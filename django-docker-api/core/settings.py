@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista: mede a requisição inteira (api/metrics.py, /metrics)
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -88,6 +92,79 @@ DATABASES = {
     }
 }
 
+# Pool de conexões do psycopg 3 (Django >= 5.1): as conexões são abertas fora do
+# caminho da requisição e reaproveitadas entre requisições e threads do processo
+# (workers com threads ou ASGI). DB_POOL_MAX_SIZE deve cobrir as threads do worker.
+# Sem psycopg 3 + psycopg_pool, ou com DB_POOL=0, usa conexões persistentes por
+# thread (CONN_MAX_AGE). Nos dois casos, CONN_HEALTH_CHECKS testa a conexão antes
+# do reuso e descarta as quebradas: com o pool, o Django (>= 5.2) repassa
+# check=ConnectionPool.check_connection ao psycopg_pool, por isso 'check' não pode
+# entrar nas opções abaixo (o argumento seria duplicado).
+try:
+    import psycopg_pool
+except ImportError:
+    psycopg_pool = None
+
+DB_POOL = psycopg_pool is not None and bool(int(os.getenv('DB_POOL', '1')))
+
+DATABASES['default']['CONN_HEALTH_CHECKS'] = bool(int(os.getenv('DB_CONN_HEALTH_CHECKS', '1')))
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Memória local (por processo) ou arquivo (compartilhado entre workers); sem Redis.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            '/tmp/django-docker-api-cache' if CACHE_BACKEND == 'file' else 'django-docker-api'
+        ),
+        'TIMEOUT': int(os.getenv('CACHE_TTL', '300')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '1000')),
+            # Fração removida ao atingir MAX_ENTRIES: 1/CULL_FREQUENCY das entradas
+            'CULL_FREQUENCY': int(os.getenv('CACHE_CULL_FREQUENCY', '3')),
+        },
+    }
+}
+
+
+# Django REST Framework: JSON com orjson quando instalado (api/renderers.py e
+# api/parsers.py); JSON_BACKEND=json força a stdlib sem trocar as classes
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'orjson')
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -148,3 +225,7 @@ CORS_ALLOWED_ORIGINS = [
     "http://angular-frontend:4200",
     "http://django-api:8000",
 ]
+
+# Idempotency-Key: repetições do POST de criação devolvem a resposta gravada (api/idempotency.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']